@@ -46,6 +46,7 @@ import sys
 import pytest
 from flake8.main.application import Application
 
+from ice_validator.tests import requirements_store
 from update_reqs import get_requirements
 
 THIS_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -153,6 +154,20 @@ def check_requirements_up_to_date():
         print(msg)
 
 
+def check_requirements_index_up_to_date():
+    """
+    Checks if the index of heat_requirements.json was regenerated after the
+    file was last updated.
+    """
+    source_sha256 = requirements_store.hash_source(CURRENT_NEEDS_PATH)
+    if requirements_store.read_index(requirements_store.INDEX_FILE, source_sha256):
+        return []
+    return [
+        "heat_requirements.index.json is out-of-date. "
+        "Run python update_reqs.py --index-only to update."
+    ]
+
+
 def check_app_tests_pass():
     return run_pytest(
         "tests",
@@ -206,6 +221,7 @@ if __name__ == "__main__":
 
     checks = [
         check_self_test_pass,
+        check_requirements_index_up_to_date,
         check_non_testable_requirements_are_not_mapped,
         check_flake8_passes,
         check_bandit_passes,
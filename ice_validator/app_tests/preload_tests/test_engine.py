@@ -0,0 +1,155 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import os
+import subprocess  # nosec
+import sys
+from pathlib import Path
+
+from preload import engine
+from preload.engine import PluginManager, PluginManifest
+from tests import cached_yaml
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+
+
+def write_plugins(directory, *names):
+    for name in names:
+        directory.join(name + ".py").write("")
+
+
+def test_manifest_finds_plugin_modules(tmpdir):
+    write_plugins(tmpdir, "preload_b", "preload_a", "preloader", "other")
+    tmpdir.mkdir("preload").join("__init__.py").write("")
+    manifest = PluginManifest()
+    assert manifest.find_modules([str(tmpdir)]) == [
+        "preload",
+        "preload_a",
+        "preload_b",
+    ]
+
+
+def test_manifest_first_entry_wins(tmpdir):
+    write_plugins(tmpdir.mkdir("one"), "preload_a")
+    write_plugins(tmpdir.mkdir("two"), "preload_a", "preload_b")
+    path = [str(tmpdir.join("one")), str(tmpdir.join("two")), str(tmpdir.join("x"))]
+    assert PluginManifest().find_modules(path) == ["preload_a", "preload_b"]
+
+
+def test_manifest_is_persisted(tmpdir, monkeypatch):
+    plugins = tmpdir.mkdir("plugins")
+    write_plugins(plugins, "preload_a")
+    manifest_path = str(tmpdir.join("manifest.json"))
+    assert PluginManifest(manifest_path).find_modules([str(plugins)]) == ["preload_a"]
+
+    def fail(entry):
+        raise AssertionError("directory scanned again")
+
+    monkeypatch.setattr(engine, "scan_path_entry", fail)
+    assert PluginManifest(manifest_path).find_modules([str(plugins)]) == ["preload_a"]
+
+
+def test_manifest_stored_in_cache_dir(tmpdir, monkeypatch):
+    monkeypatch.setattr(cached_yaml, "_cache_dir", None)
+    assert engine.default_manifest_path() is None
+    monkeypatch.setattr(cached_yaml, "_cache_dir", str(tmpdir))
+    assert engine.default_manifest_path() == str(tmpdir.join("preload_plugins.json"))
+
+
+def test_manifest_rescans_modified_directory(tmpdir):
+    plugins = tmpdir.mkdir("plugins")
+    write_plugins(plugins, "preload_a")
+    manifest_path = str(tmpdir.join("manifest.json"))
+    assert PluginManifest(manifest_path).find_modules([str(plugins)]) == ["preload_a"]
+    write_plugins(plugins, "preload_b")
+    stat = os.stat(str(plugins))
+    os.utime(str(plugins), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    assert PluginManifest(manifest_path).find_modules([str(plugins)]) == [
+        "preload_a",
+        "preload_b",
+    ]
+
+
+def test_plugins_discovered_lazily():
+    manifest = PluginManifest()
+    plugins = PluginManager(manifest)
+    assert manifest.directories is None
+    assert [g.format_name() for g in plugins.preload_generators] == [
+        "GR-API",
+        "VNF-API",
+    ]
+    assert plugins.get_source_for_id("envfiles").get_name() == "Environment Files"
+
+
+def test_shared_plugin_manager():
+    assert isinstance(engine.PLUGIN_MGR, PluginManager)
+    assert engine.PLUGIN_MGR.preload_generators is engine.PLUGIN_MGR.preload_generators
+
+
+def run_validation(template_dir, cache_dir):
+    command = [
+        sys.executable,
+        "-m",
+        "pytest",
+        "tests",
+        "-q",
+        "-p",
+        "no:cacheprovider",
+        "--assert=plain",
+        "--template-directory={}".format(template_dir),
+        "--output-directory={}".format(template_dir.dirpath("output")),
+        "--category=environment_file",
+        "--yaml-cache-dir={}".format(cache_dir),
+    ]
+    subprocess.run(  # nosec
+        command,
+        cwd=str(ROOT_DIR),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def test_manifest_reused_by_next_session(tmpdir):
+    templates = tmpdir.mkdir("templates")
+    templates.join("base.yaml").write("heat_template_version: 2015-04-30\n")
+    cache_dir = tmpdir.join("cache")
+    manifest = cache_dir.join("preload_plugins.json")
+    run_validation(templates, cache_dir)
+    assert manifest.check()
+    modified = os.stat(str(manifest)).st_mtime_ns
+    run_validation(templates, cache_dir)
+    # the manifest is only written again when a directory was scanned
+    assert os.stat(str(manifest)).st_mtime_ns == modified
@@ -0,0 +1,122 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+from pathlib import Path
+
+import pytest
+
+from preload.model import Vnf, get_heat_templates
+
+THIS_DIR = Path(__file__).parent
+SAMPLE_HEAT_DIR = THIS_DIR / "sample_heat"
+
+
+@pytest.fixture(scope="module")
+def templates(pytestconfig):
+    def fake_getoption(opt, default=None):
+        return [SAMPLE_HEAT_DIR.as_posix()] if opt == "template_dir" else None
+
+    pytestconfig.getoption = fake_getoption
+    return get_heat_templates(pytestconfig)
+
+
+def snapshot(vnf):
+    """Returns the parts of the model changed by filter_base_outputs"""
+    result = {}
+    for mod in vnf.modules:
+        result[mod.label] = {
+            "parameters": dict(mod.parameters),
+            "outputs_filtered": mod.outputs_filtered,
+            "networks": [
+                (
+                    n.network_role,
+                    n.name_param,
+                    sorted(s.param_name for s in n.subnet_params),
+                )
+                for n in mod.networks
+            ],
+            "vms": [
+                (
+                    vm.vm_type,
+                    list(vm.names),
+                    [
+                        (
+                            p.network.network_role,
+                            [ip.param for ip in p.fixed_ips],
+                            sorted(ip.param for ip in p.floating_ips),
+                        )
+                        for p in vm.ports
+                    ],
+                )
+                for vm in mod.virtual_machine_types
+            ],
+        }
+    return result
+
+
+def test_clone_is_equal(templates):
+    vnf = Vnf(templates)
+    assert snapshot(vnf.clone()) == snapshot(vnf)
+
+
+def test_clone_filters_independently(templates):
+    vnf = Vnf(templates)
+    before = snapshot(vnf)
+    clone = vnf.clone()
+    clone.filter_base_outputs()
+    assert snapshot(vnf) == before
+
+    filtered = Vnf(templates)
+    filtered.filter_base_outputs()
+    assert snapshot(clone) == snapshot(filtered)
+    assert snapshot(clone) != before
+
+
+def test_clone_links(templates):
+    vnf = Vnf(templates)
+    clone = vnf.clone()
+    assert clone.base_module in clone.modules
+    assert clone.base_module is not vnf.base_module
+    assert all(m in clone.modules for m in clone.incremental_modules)
+    for original, mod in zip(vnf.modules, clone.modules):
+        assert mod is not original
+        assert mod.vnf is clone
+        assert mod.heat is original.heat
+        for vm in mod.virtual_machine_types:
+            assert vm.vnf_module is mod
+            for port in vm.ports:
+                assert port.vm is vm
+                assert any(port.network is n for n in mod.networks)
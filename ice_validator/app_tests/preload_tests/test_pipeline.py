@@ -0,0 +1,132 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import re
+import shutil
+from pathlib import Path
+
+import pytest
+
+from preload.engine import PLUGIN_MGR
+from preload.environment import EnvironmentFileDataSource
+from preload.model import Vnf, get_heat_templates
+from preload.pipeline import PreloadTask, is_supported, remove_overwritten, run_plan
+
+THIS_DIR = Path(__file__).parent
+SAMPLE_HEAT_DIR = THIS_DIR / "sample_heat"
+PRELOAD_ENVS = THIS_DIR / "preload_envs"
+
+
+@pytest.fixture(scope="module")
+def templates(pytestconfig):
+    def fake_getoption(opt, default=None):
+        return [SAMPLE_HEAT_DIR.as_posix()] if opt == "template_dir" else None
+
+    pytestconfig.getoption = fake_getoption
+    return get_heat_templates(pytestconfig)
+
+
+def create_plan(templates, base_dir):
+    """Returns the plan of every format for a copy of the sample environments"""
+    env_dir = base_dir / "envs"
+    shutil.copytree(str(PRELOAD_ENVS), str(env_dir))
+    vnf = Vnf(templates)
+    plan = []
+    for generator_class in PLUGIN_MGR.preload_generators:
+        source = EnvironmentFileDataSource(env_dir)
+        generator = generator_class(vnf.clone(), base_dir / "blank", source)
+        plan.extend(generator.plan())
+    return plan
+
+
+def read_files(base_dir):
+    """Returns the text of the created files by path"""
+    files = {}
+    for path in base_dir.glob("**/*"):
+        name = path.relative_to(base_dir)
+        if path.is_file() and ("preloads" in name.parts or name.parts[0] == "blank"):
+            files[name.as_posix()] = path.read_text()
+    return files
+
+
+def progress(text):
+    """Removes the timings and paths of the progress messages"""
+    text = re.sub(r" \(\d+\.\d ms\)", "", text)
+    text = re.sub(r" in \d+\.\d+ seconds", "", text)
+    return re.sub(r" to \S+", "", text)
+
+
+class FakeTask(PreloadTask):
+    def __init__(self, key, message=""):
+        super().__init__(None, None, None, message=message)
+        self._key = key
+
+    @property
+    def key(self):
+        return self._key
+
+
+def test_remove_overwritten():
+    first, second, third = FakeTask("a"), FakeTask("b"), FakeTask("a")
+    plan = ["start", first, second, "middle", third]
+    assert remove_overwritten(plan) == ["start", second, "middle", third]
+
+
+def test_env_templates_written_once(templates, tmpdir):
+    plan = remove_overwritten(create_plan(templates, Path(str(tmpdir))))
+    tasks = [t for t in plan if isinstance(t, PreloadTask)]
+    env_tasks = [t for t in tasks if t.output_dir is None]
+    assert len(env_tasks) == 2  # base and incremental of the last format
+    assert {t.generator.format_name() for t in env_tasks} == {"VNF-API"}
+    assert len({t.key for t in tasks}) == len(tasks)
+
+
+@pytest.mark.skipif(not is_supported(), reason="requires fork")
+def test_parallel_same_as_serial(templates, tmpdir, capsys):
+    serial_dir = Path(str(tmpdir.mkdir("serial")))
+    parallel_dir = Path(str(tmpdir.mkdir("parallel")))
+
+    count = run_plan(create_plan(templates, serial_dir))
+    serial_out = capsys.readouterr().out
+    assert run_plan(create_plan(templates, parallel_dir), workers=3) == count
+    parallel_out = capsys.readouterr().out
+
+    assert count == 18
+    assert read_files(parallel_dir) == read_files(serial_dir)
+    assert len(read_files(serial_dir)) == 19
+    assert progress(parallel_out) == progress(serial_out)
+    assert "Generating GR-API preloads" in serial_out
+    assert "Generated 18 preloads and templates" in serial_out
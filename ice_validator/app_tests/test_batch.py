@@ -0,0 +1,170 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import csv
+import json
+import os
+import zipfile
+
+import pytest
+
+import batch
+import service
+from tests import cached_yaml
+
+
+@pytest.fixture
+def packages(tmpdir):
+    tmpdir.mkdir("vnf_a").join("base.yaml").write("")
+    tmpdir.mkdir("vnf_b").join("base.yaml").write("")
+    with zipfile.ZipFile(str(tmpdir.join("vnf_a.zip")), "w") as archive:
+        archive.writestr("base.yaml", "")
+    tmpdir.join("notes.txt").write("not a package")
+    return tmpdir
+
+
+def test_expand_inputs_glob(packages):
+    result = batch.expand_inputs([str(packages.join("*"))])
+    assert [os.path.basename(p) for p in result] == ["vnf_a", "vnf_a.zip", "vnf_b"]
+
+
+def test_expand_inputs_removes_duplicates(packages):
+    vnf_b = str(packages.join("vnf_b"))
+    result = batch.expand_inputs([vnf_b, str(packages.join("vnf_*")), vnf_b])
+    assert [os.path.basename(p) for p in result] == ["vnf_b", "vnf_a", "vnf_a.zip"]
+
+
+@pytest.mark.parametrize("pattern", ["notes.txt", "missing", "*.yaml"])
+def test_expand_inputs_invalid(packages, pattern):
+    with pytest.raises(ValueError):
+        batch.expand_inputs([str(packages.join(pattern))])
+
+
+def test_output_dirs_are_unique(packages):
+    paths = [str(packages.join(p)) for p in ("vnf_a", "vnf_a.zip", "vnf_b")]
+    result = batch.output_dirs(paths, "/out")
+    assert result == ["/out/vnf_a", "/out/vnf_a-2", "/out/vnf_b"]
+
+
+def test_get_outcome(tmpdir):
+    assert batch.get_outcome(str(tmpdir)) == "ERROR"
+    tmpdir.join("report.json").write(json.dumps({"outcome": "FAIL"}))
+    assert batch.get_outcome(str(tmpdir)) == "FAIL"
+
+
+def test_validate_package_zip_in_place(packages, monkeypatch):
+    jobs = []
+
+    def run_job(job):
+        jobs.append(job)
+        with open(os.path.join(job["output_dir"], "report.json"), "w") as f:
+            json.dump({"outcome": "PASS"}, f)
+        return {"error": None, "log": "done"}
+
+    monkeypatch.setattr(batch, "run_job", run_job)
+    package = str(packages.join("vnf_a.zip"))
+    output_dir = str(packages.join("out", "vnf_a"))
+    summary = batch.validate_package((package, output_dir, {"report_format": "csv"}))
+    assert summary["outcome"] == "PASS"
+    assert summary["error"] == ""
+    assert jobs[0]["template_dir"] == package
+    assert jobs[0]["template_source"] == package
+    assert jobs[0]["report_format"] == "csv"
+    assert packages.join("out", "vnf_a", "log.txt").read() == "done"
+
+
+def test_validate_package_error(packages, monkeypatch):
+    def run_job(job):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(batch, "run_job", run_job)
+    output_dir = str(packages.join("out", "vnf_b"))
+    summary = batch.validate_package((str(packages.join("vnf_b")), output_dir, {}))
+    assert summary["outcome"] == "ERROR"
+    assert "boom" in summary["error"]
+
+
+def test_yaml_cache_dir_forwarded(packages, monkeypatch):
+    args = batch.parse_args(["vnf_*", "--yaml-cache-dir", "cache"])
+    assert args.yaml_cache_dir == os.path.abspath("cache")
+    pytest_args = []
+    monkeypatch.setattr(
+        batch,
+        "run_job",
+        lambda job: pytest_args.extend(service.pytest_args(**job)) or {"log": ""},
+    )
+    options = {"yaml_cache_dir": args.yaml_cache_dir}
+    batch.validate_package((str(packages.join("vnf_a")), str(packages), options))
+    assert "--yaml-cache-dir={}".format(args.yaml_cache_dir) in pytest_args
+
+
+def test_second_package_reuses_parsed_templates(packages, monkeypatch):
+    template = "description: shared\nresources: {}\n"
+    packages.join("vnf_a", "base.yaml").write(template)
+    packages.join("vnf_b", "base.yaml").write(template)
+    monkeypatch.setattr(cached_yaml, "YAML_CACHE", {})
+    key = b"k" * cached_yaml.KEY_SIZE
+    cached_yaml.configure(str(packages.join("cache")), key=key)
+    try:
+        cached_yaml.load_path(str(packages.join("vnf_a", "base.yaml")))
+        cached_yaml.YAML_CACHE.clear()  # as done when the next package starts
+
+        def parse(*args, **kwargs):
+            raise AssertionError("template parsed again")
+
+        monkeypatch.setattr(cached_yaml, "parse", parse)
+        yml = cached_yaml.load_path(str(packages.join("vnf_b", "base.yaml")))
+        assert yml == {"description": "shared", "resources": {}}
+    finally:
+        cached_yaml.configure()
+
+
+def test_write_summary(tmpdir):
+    summaries = [
+        {
+            "package": "vnf_a",
+            "outcome": "PASS",
+            "duration": 1.5,
+            "output_dir": "/out/vnf_a",
+            "error": "",
+        }
+    ]
+    batch.write_summary(str(tmpdir), summaries)
+    assert json.loads(tmpdir.join("summary.json").read()) == summaries
+    with open(str(tmpdir.join("summary.csv"))) as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["package"] == "vnf_a"
+    assert rows[0]["outcome"] == "PASS"
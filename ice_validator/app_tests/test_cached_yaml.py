@@ -0,0 +1,227 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import copy
+import pickle  # nosec
+from pathlib import Path
+
+import pytest
+import yaml
+
+from tests import cached_yaml
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures"
+
+KEY = b"k" * cached_yaml.KEY_SIZE
+
+TEMPLATE = """
+heat_template_version: 2015-04-30
+resources:
+  server:
+    type: OS::Nova::Server
+"""
+
+
+@pytest.fixture
+def yaml_cache(tmpdir):
+    cache_dir = tmpdir.join("cache")
+    cached_yaml.configure(cache_dir=str(cache_dir), key=KEY)
+    cached_yaml.YAML_CACHE.clear()
+    yield cache_dir
+    cached_yaml.configure(enabled=False)
+    cached_yaml.YAML_CACHE.clear()
+
+
+def write_template(tmpdir, name, contents=TEMPLATE):
+    path = tmpdir.join(name)
+    path.write(contents)
+    return str(path)
+
+
+def load(path):
+    with open(path) as f:
+        return cached_yaml.load(f)
+
+
+def test_load_populates_persistent_cache(yaml_cache, tmpdir):
+    data = load(write_template(tmpdir, "base.yaml"))
+    assert data["resources"]["server"]["type"] == "OS::Nova::Server"
+    assert len(yaml_cache.listdir()) == 1
+
+
+def test_warm_load_skips_parsing(yaml_cache, tmpdir, monkeypatch):
+    path = write_template(tmpdir, "base.yaml")
+    expected = load(path)
+    cached_yaml.YAML_CACHE.clear()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("YAML should not be parsed on a warm run")
+
+    monkeypatch.setattr(cached_yaml, "parse", fail)
+    assert load(path) == expected
+
+
+def test_parse_error_names_file(yaml_cache, tmpdir):
+    path = write_template(tmpdir, "broken.yaml", "a:\n  b: 1\n c: [\n")
+    with pytest.raises(cached_yaml.YAMLError, match="broken.yaml"):
+        load(path)
+
+
+def test_cache_is_content_addressed(yaml_cache, tmpdir):
+    load(write_template(tmpdir, "one.yaml"))
+    load(write_template(tmpdir, "two.yaml"))
+    assert len(yaml_cache.listdir()) == 1
+
+
+def test_corrupt_entry_is_reparsed(yaml_cache, tmpdir):
+    path = write_template(tmpdir, "base.yaml")
+    expected = load(path)
+    yaml_cache.listdir()[0].write_binary(b"not a pickle")
+    cached_yaml.YAML_CACHE.clear()
+    assert load(path) == expected
+
+
+def test_evict_removes_least_recently_used(yaml_cache, tmpdir):
+    old_text = TEMPLATE + "description: old\n"
+    new_text = TEMPLATE + "description: new\n"
+    load(write_template(tmpdir, "old.yaml", old_text))
+    load(write_template(tmpdir, "new.yaml", new_text))
+    old_entry = yaml_cache.join(cached_yaml.cache_key(old_text) + ".pickle")
+    new_entry = yaml_cache.join(cached_yaml.cache_key(new_text) + ".pickle")
+    old_entry.setmtime(new_entry.mtime() - 60)
+    cached_yaml.evict(max_size=new_entry.size())
+    assert yaml_cache.listdir() == [new_entry]
+
+
+def test_entry_signed_with_another_key_is_not_unpickled(
+    yaml_cache, tmpdir, monkeypatch
+):
+    path = write_template(tmpdir, "base.yaml")
+    expected = load(path)
+    entry = yaml_cache.listdir()[0]
+    payload = pickle.dumps({"resources": "forged"})
+    entry.write_binary(b"x" * cached_yaml.DIGEST_SIZE + payload)
+    cached_yaml.YAML_CACHE.clear()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unsigned entries must not be unpickled")
+
+    monkeypatch.setattr(cached_yaml.pickle, "loads", fail)
+    assert load(path) == expected
+
+
+def test_cache_is_opt_in():
+    cached_yaml.configure()
+    assert cached_yaml.cache_dir() is None
+
+
+def test_signing_key_is_private(tmpdir):
+    path = str(tmpdir.join("config", cached_yaml.KEY_FILE))
+    key = cached_yaml.signing_key(path)
+    assert len(key) == cached_yaml.KEY_SIZE
+    assert cached_yaml.signing_key(path) == key
+    assert tmpdir.join("config", cached_yaml.KEY_FILE).stat().mode & 0o077 == 0
+
+
+def test_disabled_cache_writes_nothing(tmpdir):
+    cached_yaml.configure(enabled=False)
+    cached_yaml.YAML_CACHE.clear()
+    load(write_template(tmpdir, "base.yaml"))
+    assert cached_yaml.cache_dir() is None
+    assert tmpdir.listdir() == [tmpdir.join("base.yaml")]
+
+
+def fixture_files():
+    for path in sorted(FIXTURES_DIR.rglob("*")):
+        if path.suffix in (".yaml", ".yml", ".env"):
+            yield path
+
+
+def parse_or_error(contents, backend):
+    try:
+        return cached_yaml.parse(contents, backend=backend)
+    except cached_yaml.YAMLError as e:
+        return type(e)
+
+
+@pytest.mark.skipif(
+    "libyaml" not in cached_yaml.available_backends(), reason="libyaml not available"
+)
+def test_backends_produce_identical_structures():
+    mismatches = []
+    for path in fixture_files():
+        contents = path.read_text(encoding="utf8")
+        c_result = parse_or_error(contents, "libyaml")
+        py_result = parse_or_error(contents, "python")
+        if c_result != py_result:
+            mismatches.append(str(path.relative_to(FIXTURES_DIR)))
+    assert not mismatches, "Backends differ for: {}".format(", ".join(mismatches))
+
+
+def test_select_unknown_backend():
+    with pytest.raises(ValueError, match="not available"):
+        cached_yaml.select_loader("rust")
+    assert cached_yaml.backend_name() in cached_yaml.available_backends()
+
+
+def test_loaded_data_is_read_only(yaml_cache, tmpdir):
+    data = load(write_template(tmpdir, "base.yaml"))
+    with pytest.raises(TypeError, match="read-only"):
+        data["resources"]["server"]["__count__"] = 1
+    with pytest.raises(TypeError, match="read-only"):
+        del data["resources"]
+
+
+def test_every_caller_shares_one_parse(yaml_cache, tmpdir):
+    path = write_template(tmpdir, "base.yaml")
+    assert load(path) is load(path)
+
+
+def test_frozen_copies_are_mutable():
+    data = cached_yaml.freeze({"a": [1, {"b": 2}]})
+    shallow = data.copy()
+    shallow["c"] = 3
+    deep = copy.deepcopy(data)
+    deep["a"][1]["b"] = 4
+    assert data == {"a": [1, {"b": 2}]}
+    assert type(deep["a"]) is list
+
+
+def test_frozen_data_round_trips():
+    data = cached_yaml.freeze({"a": [1, {"b": 2}]})
+    restored = pickle.loads(pickle.dumps(data))  # nosec
+    assert isinstance(restored["a"][1], cached_yaml.FrozenDict)
+    assert yaml.safe_load(yaml.dump(data)) == data
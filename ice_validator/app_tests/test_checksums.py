@@ -0,0 +1,106 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import zipfile
+
+from tests import checksums
+from tests.utils import template_source
+
+
+def make_dir(tmpdir, count=3):
+    for i in range(count):
+        tmpdir.join("file{}.yaml".format(i)).write("contents {}".format(i))
+    tmpdir.mkdir("sub").join("user.data").write("#!/bin/bash")
+    return str(tmpdir)
+
+
+def test_digest_directory(tmpdir):
+    checksums.clear()
+    path = make_dir(tmpdir)
+    digest = checksums.digest_directory(path)
+    assert list(digest.files) == [
+        "file0.yaml",
+        "file1.yaml",
+        "file2.yaml",
+        "sub/user.data",
+    ]
+    assert digest.files["file0.yaml"] == checksums.file_digest(
+        str(tmpdir.join("file0.yaml"))
+    )
+    assert len(digest.checksum) == 32
+
+
+def test_digest_directory_is_computed_once(tmpdir):
+    checksums.clear()
+    path = make_dir(tmpdir)
+    digest = checksums.digest_directory(path)
+    tmpdir.join("file0.yaml").write("changed")
+    assert checksums.digest_directory(path) is digest
+    checksums.clear()
+    assert checksums.digest_directory(path).checksum != digest.checksum
+
+
+def test_parallel_digest_matches_serial(tmpdir, monkeypatch):
+    path = make_dir(tmpdir, count=40)
+    checksums.clear()
+    monkeypatch.setattr(checksums, "PARALLEL_THRESHOLD", 10 ** 6)
+    serial = checksums.digest_directory(path)
+    checksums.clear()
+    monkeypatch.setattr(checksums, "PARALLEL_THRESHOLD", 1)
+    monkeypatch.setattr(checksums, "MAX_THREADS", 4)
+    parallel = checksums.digest_directory(path)
+    assert parallel.files == serial.files
+    assert parallel.checksum == serial.checksum
+
+
+def test_archive_checksum_matches_directory(tmpdir):
+    checksums.clear()
+    path = make_dir(tmpdir.mkdir("templates"))
+    archive = str(tmpdir.join("templates.zip"))
+    with zipfile.ZipFile(archive, "w") as zf:
+        for name in ("file0.yaml", "file1.yaml", "file2.yaml", "sub/user.data"):
+            zf.write(str(tmpdir.join("templates", name)), name)
+    try:
+        assert (
+            checksums.digest_directory(archive).checksum
+            == checksums.digest_directory(path).checksum
+        )
+    finally:
+        template_source.close_archives()
+
+
+def test_missing_file():
+    assert checksums.file_digest("/does/not/exist.yaml") is None
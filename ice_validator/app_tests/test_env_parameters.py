@@ -0,0 +1,144 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import pytest
+
+from tests.test_environment_file_parameters import ENV_PARAMETER_SPEC
+from tests.utils.env_parameters import (
+    EnvParameterTable,
+    get_env_parameter_table,
+    is_enumerated,
+)
+
+TEMPLATE = """
+heat_template_version: 2015-04-30
+resources:
+  fw_server_0:
+    type: OS::Nova::Server
+    properties:
+      name: {get_param: [fw_names, 0]}
+      image: {get_param: fw_image_name}
+      flavor: fw_flavor
+  fw_0_oam_port_0:
+    type: OS::Neutron::Port
+    properties:
+      fixed_ips:
+        - ip_address: {get_param: [fw_oam_ips, 0]}
+        - ip_address: {get_param: [fw_int_ctl_ips, 0]}
+"""
+
+BROKEN_RESOURCE = """
+  broken:
+    type: OS::Neutron::Port
+    properties: [not, a, dict]
+"""
+
+
+def write_template(tmpdir, contents):
+    path = tmpdir.join("base.yaml")
+    path.write(contents)
+    return str(path)
+
+
+def find_spec(table, *args, **kwargs):
+    rule = table.find_rule(*args, **kwargs)
+    return None if rule is None else table.rules[rule][1]
+
+
+def test_find_rule():
+    table = get_env_parameter_table([ENV_PARAMETER_SPEC])
+    spec = find_spec(table, "OS::Neutron::Port", ("fixed_ips", "ip_address"))
+    assert spec["network_type"] == "external"
+    spec = find_spec(
+        table, "OS::Neutron::Port", ("fixed_ips", "ip_address"), network_type="internal"
+    )
+    assert spec["persistent"]
+    # the spec of the subnet does not have a network type
+    assert (
+        find_spec(
+            table, "OS::Neutron::Port", ("fixed_ips", "subnet"), network_type="internal"
+        )
+        is None
+    )
+    assert find_spec(table, "OS::Nova::Server", ("missing",)) is None
+
+
+def test_table_compiled_once():
+    table = get_env_parameter_table([ENV_PARAMETER_SPEC])
+    assert get_env_parameter_table([ENV_PARAMETER_SPEC]) is table
+
+
+def test_collect(tmpdir):
+    template = write_template(tmpdir, TEMPLATE)
+    table = get_env_parameter_table([ENV_PARAMETER_SPEC])
+    parameters = table.collect(template)
+    assert table.collect(template) is parameters
+
+    def params(resource_type, *prop, **kwargs):
+        rule = table.find_rule(resource_type, prop, **kwargs)
+        return [p["param"] for p in parameters.for_rule(rule)]
+
+    assert params("OS::Nova::Server", "image") == ["fw_image_name"]
+    assert params("OS::Nova::Server", "flavor") == []
+    assert params("ALL", "name") == ["fw_names"]
+    assert params(
+        "OS::Neutron::Port", "fixed_ips", "ip_address", network_type="external"
+    ) == ["fw_oam_ips"]
+
+
+def test_collect_errors_only_affect_their_rules(tmpdir):
+    template = write_template(tmpdir, TEMPLATE + BROKEN_RESOURCE)
+    table = get_env_parameter_table([ENV_PARAMETER_SPEC])
+    parameters = table.collect(template)
+    for resource_type, prop in (("OS::Neutron::Port", "network"), ("ALL", "name")):
+        rule = table.find_rule(resource_type, (prop,))
+        with pytest.raises(AttributeError):
+            parameters.for_rule(rule)
+    rule = table.find_rule("OS::Nova::Server", ("image",))
+    assert parameters.for_rule(rule)
+
+
+def test_multiple_specs():
+    extra = {"OS::Nova::Server": [{"property": ("key_name",), "persistent": True}]}
+    table = EnvParameterTable([ENV_PARAMETER_SPEC, extra])
+    assert find_spec(table, "OS::Nova::Server", ("key_name",))["persistent"]
+    assert [s["property"] for s in table.rules_of_type("ALL")] == [("name",)]
+
+
+def test_is_enumerated():
+    assert is_enumerated("fw_image_name", {"fw_image_name": "x"})
+    assert is_enumerated(r"^(.+?)_net_fqdn$", {"oam_net_fqdn": "x"})
+    assert not is_enumerated("fw_image_name", {"fw_flavor_name": "x"})
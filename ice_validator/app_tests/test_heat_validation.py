@@ -0,0 +1,113 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import time
+from pathlib import Path
+
+import pytest
+
+from tests import cached_yaml
+from tests import heat_validation
+from tests.heat_validation import HeatValidationPool, HOTValidator
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures" / "test_valid_heat"
+TEMPLATES = [
+    str(FIXTURES_DIR / "pass" / "pass.yaml"),
+    str(FIXTURES_DIR / "fail" / "fail.yaml"),
+    str(FIXTURES_DIR / "fail" / "nestedbad.yaml"),
+]
+
+
+def load(path):
+    with open(path) as f:
+        return cached_yaml.load(f)
+
+
+@pytest.fixture
+def pool():
+    heat_pool = HeatValidationPool()
+    heat_pool.configure(2, timeout=1)
+    yield heat_pool
+    heat_pool.close()
+
+
+def test_pool_matches_in_process(pool):
+    validator = HOTValidator()
+    for path in TEMPLATES:
+        pool.submit(path, load(path))
+    for path in TEMPLATES:
+        expected = validator.validate_file(path, load(path))
+        expected = str(expected) if expected else None
+        assert pool.validate_file(path, load(path)) == expected
+
+
+def slow_job(job):
+    time.sleep(job[0])
+    return "done"
+
+
+@pytest.fixture
+def slow_pool(pool, monkeypatch):
+    monkeypatch.setattr(heat_validation, "get_validator", lambda: None)
+    monkeypatch.setattr(heat_validation, "_run_job", slow_job)
+    monkeypatch.setattr(heat_validation, "create_job", lambda f, y: (y, {}, {}))
+    pool.configure(1, timeout=1)
+    return pool
+
+
+def test_pool_timeout_restarts(slow_pool):
+    pool = slow_pool
+    pool.submit("hung.yaml", 60)
+    pool.submit("quick.yaml", 0)
+    assert "did not complete within 1 seconds" in pool.validate_file("hung.yaml", 60)
+    assert pool.validate_file("quick.yaml", 0) == "done"
+
+
+def test_pool_timeout_starts_with_job(slow_pool):
+    pool = slow_pool
+    pool.submit("first.yaml", 0.7)
+    pool.submit("queued.yaml", 0.7)
+    assert pool.validate_file("queued.yaml", 0.7) == "done"
+    assert pool.validate_file("first.yaml", 0.7) == "done"
+
+
+def test_pool_timeout_not_extended_by_late_request(slow_pool):
+    pool = slow_pool
+    pool.submit("hung.yaml", 60)
+    time.sleep(1.5)
+    start = time.monotonic()
+    assert "did not complete" in pool.validate_file("hung.yaml", 60)
+    assert time.monotonic() - start < 0.5
@@ -38,7 +38,7 @@ from pathlib import Path
 
 import pytest
 
-from tests.helpers import check, first, unzip, remove
+from tests.helpers import check, find_environment_file, first, unzip, remove
 
 THIS_DIR = Path(__file__).parent
 
@@ -86,3 +86,26 @@ def test_remove_with_no_key():
 
 def test_remove_with_key():
     assert remove(["a", "b", "c", "d"], ["A"], lambda s: s.upper()) == ["b", "c", "d"]
+
+
+def test_find_environment_file_of_nested_template(tmpdir):
+    tmpdir.join("base.yaml").write("resources:\n  mid:\n    type: mid.yaml\n")
+    tmpdir.join("base.env").write("parameters:\n  count: 1\n")
+    tmpdir.join("mid.yaml").write(
+        "resources:\n"
+        "  group:\n"
+        "    type: OS::Heat::ResourceGroup\n"
+        "    properties:\n"
+        "      resource_def:\n"
+        "        type: leaf.yaml\n"
+    )
+    tmpdir.join("leaf.yaml").write("resources: {}\n")
+    tmpdir.join("other.yaml").write("resources: {}\n")
+    leaf = "{}/leaf.yaml".format(tmpdir)
+    pair = find_environment_file(leaf)
+    assert pair["name"] == "base"
+    assert pair["eyml"] == {"parameters": {"count": 1}}
+    assert find_environment_file(leaf) is pair
+    with pytest.raises(TypeError):
+        pair["name"] = "other"
+    assert find_environment_file("{}/other.yaml".format(tmpdir)) is None
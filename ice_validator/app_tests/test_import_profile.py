@@ -0,0 +1,89 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import pytest
+
+from tests import import_profile
+from tests.import_profile import ImportTime
+
+PROFILE = """\
+import time: self [us] | cumulative | imported package
+import time:       245 |        245 |   _io
+import time:      1000 |       1245 | site
+import time:        20 |         20 |     yaml.error
+import time:       300 |        320 |   yaml
+import time:       100 |        420 | tests.cached_yaml
+"""
+
+
+def test_parse():
+    assert import_profile.parse(PROFILE) == [
+        ImportTime("_io", 245, 245, 1),
+        ImportTime("site", 1000, 1245, 0),
+        ImportTime("yaml.error", 20, 20, 2),
+        ImportTime("yaml", 300, 320, 1),
+        ImportTime("tests.cached_yaml", 100, 420, 0),
+    ]
+
+
+def test_summarize():
+    profile = import_profile.summarize(import_profile.parse(PROFILE))
+    assert profile["total_us"] == 1665
+    assert profile["deferred_imported"] == []
+    assert profile["modules"][1] == {
+        "module": "site",
+        "self_us": 1000,
+        "cumulative_us": 1245,
+        "depth": 0,
+    }
+
+
+def test_summarize_deferred_imported():
+    text = PROFILE + "import time:       100 |     100000 | jinja2\n"
+    profile = import_profile.summarize(import_profile.parse(text))
+    assert profile["deferred_imported"] == ["jinja2"]
+
+
+def test_profile_import_error():
+    with pytest.raises(RuntimeError, match="ModuleNotFoundError"):
+        import_profile.profile_imports(["tests.no_such_module"])
+
+
+def test_startup_does_not_import_deferred_modules():
+    text = import_profile.profile_imports(["tests.conftest"])
+    records = import_profile.parse(text)
+    assert "tests.conftest" in {r.module for r in records}
+    assert import_profile.summarize(records)["deferred_imported"] == []
@@ -0,0 +1,258 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import json
+import os
+from types import SimpleNamespace
+
+from _pytest.runner import TestReport as Report
+
+from tests import cached_yaml, checksums, incremental
+from tests.incremental import RunManifest, related_files
+from tests.utils import template_index
+
+BASE = """
+heat_template_version: 2015-04-30
+resources:
+  server:
+    type: nested.yaml
+"""
+
+EMPTY = """
+heat_template_version: 2015-04-30
+resources: {}
+"""
+
+
+def make_dir(tmpdir):
+    for name, contents in (
+        ("base.yaml", BASE),
+        ("base.env", "parameters: {}"),
+        ("nested.yaml", EMPTY),
+        ("standalone.yaml", EMPTY),
+        ("standalone.env", "parameters: {}"),
+        ("standalone_volume.yaml", EMPTY),
+        ("user.data", "#!/bin/bash"),
+    ):
+        tmpdir.join(name).write(contents)
+    return str(tmpdir)
+
+
+def make_item(nodeid, **params):
+    return SimpleNamespace(nodeid=nodeid, callspec=SimpleNamespace(params=params))
+
+
+def make_report(nodeid, outcome="passed", longrepr=None):
+    return Report(nodeid, ("test.py", 1, nodeid), {}, outcome, longrepr, "call")
+
+
+def test_related_files_includes_environment_of_nesting_template(tmpdir):
+    path = make_dir(tmpdir)
+    related = related_files(os.path.join(path, "nested.yaml"))
+    names = {os.path.basename(f) for f in related}
+    assert names == {"base.yaml", "base.env", "nested.yaml", "user.data"}
+
+
+def test_related_files_includes_volume_module(tmpdir):
+    path = make_dir(tmpdir)
+    related = related_files(os.path.join(path, "standalone.env"))
+    names = {os.path.basename(f) for f in related}
+    assert names == {
+        "standalone.yaml",
+        "standalone.env",
+        "standalone_volume.yaml",
+        "user.data",
+    }
+
+
+def run(path, items, reuse, outcome="passed"):
+    checksums.clear()  # as done when a session starts
+    manifest = RunManifest()
+    manifest.configure(
+        os.path.join(path, "..", incremental.MANIFEST_FILENAME),
+        "fingerprint",
+        [path],
+        reuse=reuse,
+    )
+    reused = manifest.plan(items)
+    for item in items:
+        if not manifest.is_reused(item):
+            manifest.add_report(make_report(item.nodeid, outcome))
+        else:
+            for report in manifest.previous_reports(item):
+                manifest.add_report(report)
+    manifest.save(items)
+    return manifest, reused
+
+
+def test_unchanged_inputs_are_reused(tmpdir):
+    path = make_dir(tmpdir.mkdir("templates"))
+    items = [
+        make_item("a", yaml_file=os.path.join(path, "standalone.yaml")),
+        make_item("b", yaml_file=os.path.join(path, "nested.yaml")),
+        make_item("c", template_dir=path),
+    ]
+    run(path, items, reuse=False, outcome="failed")
+    manifest, reused = run(path, items, reuse=True)
+    assert reused == 3
+    assert manifest.previous_reports(items[0])[0].outcome == "failed"
+
+    tmpdir.join("templates", "standalone_volume.yaml").write(EMPTY + "\n# changed")
+    manifest, reused = run(path, items, reuse=True)
+    assert manifest.reused == {"b"}
+
+
+def test_nested_file_change_only_reruns_tests_using_it(tmpdir):
+    path = make_dir(tmpdir.mkdir("templates"))
+    tmpdir.join("templates", "other.yaml").write(EMPTY)
+    tmpdir.join("templates", "other.env").write("parameters: {}")
+    items = [
+        make_item(name, yaml_file=os.path.join(path, name))
+        for name in sorted(os.listdir(path))
+        if name.endswith(".yaml")
+    ]
+    items.append(make_item("base.env", env_file=os.path.join(path, "base.env")))
+    run(path, items, reuse=False)
+    tmpdir.join("templates", "nested.yaml").write(EMPTY + "\n# changed")
+    manifest, reused = run(path, items, reuse=True)
+    assert manifest.reused == {
+        "other.yaml",
+        "standalone.yaml",
+        "standalone_volume.yaml",
+    }
+
+
+def test_new_parent_invalidates_nested_file(tmpdir, monkeypatch):
+    path = make_dir(tmpdir.mkdir("templates"))
+    tmpdir.join("templates", "other.yaml").write(EMPTY)
+    items = [make_item("a", yaml_file=os.path.join(path, "standalone.yaml"))]
+    run(path, items, reuse=False)
+    assert run(path, items, reuse=True)[1] == 1
+    tmpdir.join("templates", "other.yaml").write(
+        BASE.replace("nested.yaml", "standalone.yaml")
+    )
+    monkeypatch.setattr(template_index, "TEMPLATE_INDEXES", {})
+    monkeypatch.setattr(cached_yaml, "YAML_CACHE", {})
+    assert run(path, items, reuse=True)[1] == 0
+
+
+class Failure:
+    reprcrash = SimpleNamespace(message="AssertionError: x")
+
+    def __str__(self):
+        return "trace"
+
+
+def test_reports_are_saved_as_json(tmpdir):
+    path = make_dir(tmpdir.mkdir("templates"))
+    items = [make_item("a", yaml_file=os.path.join(path, "standalone.yaml"))]
+    failure = Failure()
+    reports = [
+        make_report("a", "skipped", ("test.py", 3, "Skipped: no env")),
+        make_report("a", "failed", failure),
+    ]
+    reports[1].sections.append(("Captured stdout call", "output"))
+    manifest = RunManifest()
+    manifest.configure(os.path.join(str(tmpdir), "manifest.json"), "fp", [path])
+    for report in reports:
+        manifest.add_report(report)
+    manifest.save(items)
+    with open(manifest.path) as f:
+        saved = json.load(f)["tests"]["a"]["reports"]
+    assert saved[1]["message"] == "AssertionError: x"
+
+    manifest.configure(manifest.path, "fp", [path], reuse=True)
+    skipped, failed = manifest.previous_reports(items[0])
+    assert skipped.longrepr == ("test.py", 3, "Skipped: no env")
+    assert failed.outcome == "failed"
+    assert str(failed.longrepr) == "trace"
+    assert failed.longrepr.reprcrash.message == "AssertionError: x"
+    assert failed.sections == [("Captured stdout call", "output")]
+    assert failed.location == ("test.py", 1, "a")
+
+
+def test_added_file_invalidates_directory(tmpdir):
+    path = make_dir(tmpdir.mkdir("templates"))
+    items = [make_item("a", yaml_file=os.path.join(path, "standalone.yaml"))]
+    run(path, items, reuse=False)
+    tmpdir.join("templates", "other.yaml").write(EMPTY)
+    assert run(path, items, reuse=True)[1] == 0
+
+
+def test_fingerprint_change_invalidates_manifest(tmpdir):
+    path = make_dir(tmpdir.mkdir("templates"))
+    items = [make_item("a", yaml_file=os.path.join(path, "standalone.yaml"))]
+    run(path, items, reuse=False)
+    manifest = RunManifest()
+    manifest.configure(
+        os.path.join(path, "..", incremental.MANIFEST_FILENAME),
+        "other",
+        [path],
+        reuse=True,
+    )
+    assert manifest.plan(items) == 0
+
+
+def test_parsed_arguments_depend_on_template_directory(tmpdir):
+    path = make_dir(tmpdir)
+    manifest = RunManifest()
+    manifest.configure(None, None, [path])
+    inputs = manifest.inputs(make_item("a", parsed_yaml_file={"resources": {}}))
+    assert {os.path.basename(f) for f in inputs} == set(os.listdir(path)) | {""}
+
+
+def make_config(tmpdir, incremental):
+    options = {
+        "template_dir": [str(tmpdir)],
+        "incremental": incremental,
+        "test_categories": None,
+        "continue_on_failure": False,
+    }
+    return SimpleNamespace(
+        getoption=options.get, option=SimpleNamespace(output_dir=str(tmpdir))
+    )
+
+
+def test_manifest_only_recorded_with_incremental(tmpdir, monkeypatch):
+    from tests import conftest
+
+    manifest = RunManifest()
+    monkeypatch.setattr(conftest, "MANIFEST", manifest)
+    conftest.configure_manifest(make_config(tmpdir, False))
+    assert not manifest.enabled
+    conftest.configure_manifest(make_config(tmpdir, True))
+    assert manifest.path == str(tmpdir.join(incremental.MANIFEST_FILENAME))
+    assert manifest.reuse
@@ -0,0 +1,197 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+#
+import re
+from pathlib import Path
+
+import pytest
+
+from tests import cached_yaml
+from tests.structures import HeatProcessor, Heat, _HEAT_PROCESSORS
+from tests.utils import network_roles, vm_types
+from tests.utils.naming_rules import RuleSet
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures"
+
+SAMPLE_NAMES = [
+    "",
+    "x",
+    "fw_server_0",
+    "fw_server_a",
+    "fw_0_oam_port_1",
+    "fw_0_int_oam_port_1",
+    "fw_0_subint_oam_vmi_0",
+    "fw_0_int_oam_vmi_0_v6_IP_2",
+    "fw_0_int_oam_vmi_0_v6_IP_x",
+    "int_oam_network",
+    "int_oam_RVN",
+    "int_oam_net_id",
+    "oam_net_name",
+    "fw_name_0",
+    "fw_name_0_names",
+    "fw_flavor_name",
+    "fw_image_name",
+]
+
+
+def collect_names():
+    """Returns the resource IDs and get_param names of the fixtures"""
+    names = set(SAMPLE_NAMES)
+
+    def add(value):
+        if isinstance(value, dict):
+            for k, v in value.items():
+                if k == "get_param" and isinstance(v, str):
+                    names.add(v)
+                elif k == "get_param" and isinstance(v, list) and v:
+                    names.add(str(v[0]))
+                add(v)
+        elif isinstance(value, list):
+            for v in value:
+                add(v)
+
+    for path in FIXTURES_DIR.glob("**/*.yaml"):
+        try:
+            yml = cached_yaml.load_path(str(path))
+        except cached_yaml.YAMLError:
+            continue
+        resources = yml.get("resources") if isinstance(yml, dict) else None
+        if isinstance(resources, dict):
+            names.update(str(rid) for rid in resources)
+            add(resources)
+    return sorted(names)
+
+
+NAMES = collect_names()
+
+
+def first_match(rules, text):
+    for name, pattern in rules:
+        match = re.match(pattern, text)
+        if match:
+            return name, match
+    return "", None
+
+
+def all_matches(rules, text):
+    matches = ((name, re.match(pattern, text)) for name, pattern in rules)
+    return [(name, m) for name, m in matches if m]
+
+
+def summary(name, match):
+    return name, match.groupdict() if match else None
+
+
+RULES = [
+    ("internal", r"int_(?P<role>.+)_net$"),
+    ("external", r"(?P<role>.+)_net$"),
+    ("plain", r"(?P<role>[a-z]+)(_(?P<index>\d+))?$"),
+]
+
+
+@pytest.mark.parametrize(
+    "text", ["int_oam_net", "oam_net", "oam", "oam_1", "OAM", "", "int__net"]
+)
+def test_match_is_first_rule(text):
+    name, match = RuleSet(RULES).match(text)
+    assert summary(name, match) == summary(*first_match(RULES, text))
+
+
+def test_match_groups():
+    name, match = RuleSet(RULES).match("oam_1")
+    assert name == "plain"
+    assert match.name == "plain"
+    assert match.group() == "oam_1"
+    assert match.group("role") == "oam"
+    assert match.group("role", "index") == ("oam", "1")
+    assert match.groupdict() == {"role": "oam", "index": "1"}
+    assert RuleSet(RULES).match("oam")[1].groupdict("") == {"role": "oam", "index": ""}
+    with pytest.raises(IndexError):
+        match.group("network_role")
+
+
+def test_match_all():
+    matches = RuleSet(RULES).match_all("int_oam_net")
+    assert [(n, m.groupdict()) for n, m in matches] == [
+        ("internal", {"role": "oam"}),
+        ("external", {"role": "int_oam"}),
+    ]
+    assert RuleSet(RULES).match_all("OAM") == []
+
+
+def test_empty_rule_set():
+    assert RuleSet([]).match("anything") == ("", None)
+    assert RuleSet([]).match_all("anything") == []
+
+
+def test_names_found():
+    assert len(NAMES) > 100
+
+
+@pytest.mark.parametrize(
+    "processor", sorted(_HEAT_PROCESSORS.values(), key=lambda p: p.resource_type)
+)
+def test_rid_rules_same_as_re_rids(processor):
+    rules = list(processor.re_rids.items())
+    for rid in NAMES:
+        expected = summary(*first_match(rules, rid))
+        assert summary(*processor.get_rid_match_tuple(rid)) == expected, rid
+    assert HeatProcessor.get_rid_match_tuple("fw_server_0") == ("", None)
+
+
+def test_vm_type_rules_same_as_patterns():
+    for rules in vm_types.PROPERTY_FORMATS.values():
+        patterns = rules.rules
+        for name in NAMES:
+            expected = [summary(*m) for m in all_matches(patterns, name)]
+            assert [summary(*m) for m in rules.match_all(name)] == expected, name
+
+
+@pytest.mark.parametrize("formats", ["PARAM_FORMATS", "RESOURCE_FORMATS"])
+def test_network_role_rules_same_as_patterns(formats):
+    rules = getattr(network_roles, formats)
+    for name in NAMES:
+        expected = summary(*first_match(rules.rules, name))
+        assert summary(*rules.match(name)) == expected, name
+
+
+def test_part_is_in_name():
+    assert Heat.part_is_in_name("fw", "fw_server_0")
+    assert Heat.part_is_in_name("server", "fw_server_0")
+    assert Heat.part_is_in_name("0", "fw_server_0")
+    assert not Heat.part_is_in_name("serv", "fw_server_0")
+    assert not Heat.part_is_in_name("fw", "fwx_server_0")
@@ -0,0 +1,123 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import json
+import os
+import subprocess  # nosec
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from tests import parallel
+
+ROOT_DIR = Path(__file__).parent.parent
+SAMPLE_HEAT_DIR = ROOT_DIR / "app_tests" / "preload_tests" / "sample_heat"
+
+
+def make_item(**params):
+    return SimpleNamespace(callspec=SimpleNamespace(params=params))
+
+
+def test_template_key_uses_file_parameter():
+    assert parallel.template_key(make_item(heat_template="a.yaml")) == "a.yaml"
+    assert parallel.template_key(make_item(env_file="a.env", other=1)) == "a.env"
+
+
+def test_template_key_no_single_file():
+    assert parallel.template_key(make_item(yaml_files=["a.yaml", "b.yaml"])) is None
+    assert parallel.template_key(SimpleNamespace()) is None
+
+
+def test_group_items_by_template():
+    items = [
+        make_item(yaml_file="a.yaml"),
+        make_item(yaml_files=["a.yaml", "b.yaml"]),
+        make_item(heat_template="b.yaml"),
+        make_item(heat_template="a.yaml"),
+        make_item(template_dir="dir"),
+    ]
+    assert parallel.group_items(items) == [[0, 3], [1], [2], [4]]
+
+
+def test_worker_count():
+    assert parallel.worker_count(3) == 3
+    assert parallel.worker_count(0) >= 1
+
+
+def run_validation(output_dir, *args):
+    """Validates the sample templates and returns the JSON report"""
+    command = [
+        sys.executable,
+        "-m",
+        "pytest",
+        "tests",
+        "-q",
+        "-p",
+        "no:cacheprovider",
+        # the two runs only need to match each other
+        "--assert=plain",
+        "--template-directory={}".format(SAMPLE_HEAT_DIR),
+        "--output-directory={}".format(output_dir),
+        "--report-format=json",
+        "--continue-on-failure",
+        "--category=environment_file",
+        "--category=openstack",
+    ]
+    command.extend(args)
+    subprocess.run(  # nosec
+        command,
+        cwd=str(ROOT_DIR),
+        env=dict(os.environ, PYTHONHASHSEED="0"),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    with open(os.path.join(str(output_dir), "report.json")) as f:
+        report = json.load(f)
+    del report["timestamp"]
+    for test in report["tests"]:
+        # the order of the files of a test is not deterministic
+        test["files"] = sorted(test["files"])
+    return report
+
+
+@pytest.mark.skipif(not parallel.is_supported(), reason="requires fork")
+def test_workers_report_same_as_serial(tmpdir):
+    serial = run_validation(tmpdir.join("serial"))
+    parallel_report = run_validation(tmpdir.join("parallel"), "--workers=2")
+    assert len(serial["tests"]) > 100
+    assert parallel_report == serial
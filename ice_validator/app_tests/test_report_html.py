@@ -0,0 +1,124 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import json
+
+import docutils.core
+import jinja2
+
+from tests.cached_yaml import DIGEST_SIZE, KEY_SIZE, sign
+from tests.report_html import RequirementsRenderer, get_report_template
+
+KEY = b"k" * KEY_SIZE
+TEXT = "\n\nR-12345: \nThe VNF **MUST** do something."
+
+
+def publish(text):
+    return docutils.core.publish_parts(writer_name="html", source=text)["body"]
+
+
+def test_render_matches_docutils():
+    renderer = RequirementsRenderer()
+    assert renderer.render(TEXT) == publish(TEXT)
+    assert renderer.render("") == publish("")
+
+
+def test_render_once_per_text(monkeypatch):
+    calls = []
+
+    def fake_publish(writer_name, source):
+        calls.append(source)
+        return {"body": "<p>{}</p>".format(source)}
+
+    monkeypatch.setattr(docutils.core, "publish_parts", fake_publish)
+    renderer = RequirementsRenderer()
+    assert renderer.render(TEXT) == renderer.render(TEXT)
+    renderer.render("other")
+    assert calls == [TEXT, "other"]
+
+
+def test_render_persisted(tmpdir, monkeypatch):
+    path = str(tmpdir.join("requirements_html.json"))
+    renderer = RequirementsRenderer(path, KEY)
+    html = renderer.render(TEXT)
+    renderer.save()
+
+    def fail(**kwargs):
+        raise AssertionError("rendered again")
+
+    monkeypatch.setattr(docutils.core, "publish_parts", fail)
+    assert RequirementsRenderer(path, KEY).render(TEXT) == html
+
+
+def test_render_ignores_cache_signed_with_another_key(tmpdir):
+    path = tmpdir.join("requirements_html.json")
+    renderer = RequirementsRenderer(str(path), KEY)
+    renderer.render(TEXT)
+    renderer.save()
+    data = json.loads(path.read_binary()[DIGEST_SIZE:].decode("utf8"))
+    data["html"] = {key: "<script>injected</script>" for key in data["html"]}
+    path.write_binary(sign(json.dumps(data).encode("utf8"), b"x" * KEY_SIZE))
+    assert RequirementsRenderer(str(path), KEY).render(TEXT) == publish(TEXT)
+
+
+def test_render_ignores_stale_cache(tmpdir):
+    path = tmpdir.join("requirements_html.json")
+    renderer = RequirementsRenderer(str(path), KEY)
+    renderer.render(TEXT)
+    renderer.save()
+    data = json.loads(path.read_binary()[DIGEST_SIZE:].decode("utf8"))
+    data["version"] = "0"
+    data["html"] = {key: "stale" for key in data["html"]}
+    path.write_binary(sign(json.dumps(data).encode("utf8"), KEY))
+    assert RequirementsRenderer(str(path), KEY).render(TEXT) == publish(TEXT)
+
+
+def test_report_template_matches_template():
+    template = get_report_template()
+    assert get_report_template() is template
+    with open(template.filename, "r") as f:
+        expected = jinja2.Template(f.read())
+    context = dict(
+        version="1.0",
+        num_failures=0,
+        categories="",
+        template_dir="<a>dir</a>",
+        checksum="0",
+        timestamp="now",
+        failures=[],
+        collection_failures=[],
+    )
+    assert template.render(**context) == expected.render(**context)
@@ -0,0 +1,117 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import io
+import json
+import os
+
+import pytest
+
+from tests.report_stream import ReportStream, ResultSpool, StreamedDict, dump_json
+
+DOCUMENTS = [
+    {},
+    [],
+    "text\nwith newline",
+    {"a": 1, "b": [1, {"c": None}], "d": {"e": [], "f": {}}, "g": "é"},
+    {"tests": [{"files": ["base.yaml"], "requirements": []}], "outcome": "PASS"},
+]
+
+
+def dumps(value):
+    f = io.StringIO()
+    dump_json(value, f)
+    return f.getvalue()
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_dump_json_matches_json_dump(document):
+    assert dumps(document) == json.dumps(document, indent=2)
+
+
+def test_dump_json_streams():
+    entries = [{"result": "PASS"}, {"result": "FAIL"}]
+    data = {"tests": iter(entries), "more": StreamedDict(iter([("0", 1)]))}
+    expected = {"tests": entries, "more": {"0": 1}}
+    assert dumps(data) == json.dumps(expected, indent=2)
+    assert dumps({"tests": iter([]), "more": StreamedDict([])}) == json.dumps(
+        {"tests": [], "more": {}}, indent=2
+    )
+
+
+def test_result_spool():
+    spool = ResultSpool()
+    assert list(spool) == []
+    spool.append({"id": 1})
+    spool.append({"id": 2})
+    assert list(spool) == [{"id": 1}, {"id": 2}]
+    spool.append({"id": 3})
+    assert [r["id"] for r in spool] == [1, 2, 3]
+    assert len(spool) == 3
+    spool.close()
+    assert len(spool) == 0
+
+
+def test_report_stream_rolls_up_requirements():
+    stream = ReportStream("/templates")
+    stream.add_test(
+        {"result": "FAIL", "error": "bad", "requirements": [{"id": "R-1"}]}
+    )
+    stream.add_test({"result": "PASS", "error": "", "requirements": [{"id": "R-1"}]})
+    stream.add_test({"result": "SKIP", "error": "", "requirements": []})
+    assert stream.requirement_results["R-1"] == {
+        "errors": {"bad"},
+        "outcomes": {"FAIL", "PASS"},
+    }
+    assert stream.requirement_results[""]["outcomes"] == {"SKIP"}
+    assert len(stream.tests) == 3
+    stream.close()
+
+
+def test_disabled_report_stream():
+    stream = ReportStream()
+    stream.add_test({"result": "PASS", "error": "", "requirements": []})
+    stream.add_failure({"test_id": "test"})
+    assert not stream.enabled
+    assert len(stream.tests) == 0
+    assert len(stream.failures) == 0
+
+
+def test_report_stream_ignores_other_processes(monkeypatch):
+    stream = ReportStream("/templates")
+    monkeypatch.setattr(os, "getpid", lambda: stream.pid + 1)
+    stream.add_test({"result": "PASS", "error": "", "requirements": []})
+    assert len(stream.tests) == 0
@@ -0,0 +1,113 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import json
+import os
+
+from tests import requirements_store
+from tests.requirements_store import RequirementsStore
+
+NEEDS = {
+    "current_version": "frankfurt",
+    "versions": {
+        "frankfurt": {
+            "needs": {
+                "R-1": {
+                    "id": "R-1",
+                    "description": "First",
+                    "docname": "Heat/Resource IDs",
+                    "keyword": "MUST",
+                    "validation_mode": "static",
+                    "layout": "unused",
+                }
+            }
+        }
+    },
+}
+
+
+def write_source(tmpdir, needs):
+    path = tmpdir.join("heat_requirements.json")
+    path.write(json.dumps(needs))
+    return str(path)
+
+
+def test_index_contains_current_version_only(tmpdir):
+    source = write_source(tmpdir, NEEDS)
+    index_path = str(tmpdir.join("heat_requirements.index.json"))
+    index = requirements_store.write_index(source, index_path)
+    assert index["version"] == "frankfurt"
+    assert index["needs"]["R-1"]["description"] == "First"
+    assert "layout" not in index["needs"]["R-1"]
+    assert requirements_store.read_index(index_path, index["source_sha256"]) == index
+
+
+def test_store_uses_index(tmpdir):
+    source = write_source(tmpdir, NEEDS)
+    index_path = str(tmpdir.join("heat_requirements.index.json"))
+    requirements_store.write_index(source, index_path)
+    store = RequirementsStore(source, index_path)
+    assert store["R-1"]["keyword"] == "MUST"
+    assert list(store) == ["R-1"]
+    assert store.from_index
+
+
+def test_store_ignores_stale_index(tmpdir):
+    source = write_source(tmpdir, NEEDS)
+    index_path = str(tmpdir.join("heat_requirements.index.json"))
+    requirements_store.write_index(source, index_path)
+    needs = json.loads(json.dumps(NEEDS))
+    needs["versions"]["frankfurt"]["needs"]["R-1"]["description"] = "Changed"
+    write_source(tmpdir, needs)
+    stat = os.stat(source)
+    os.utime(source, (stat.st_atime, stat.st_mtime + 10))
+    store = RequirementsStore(source, index_path)
+    assert store["R-1"]["description"] == "Changed"
+    assert not store.from_index
+
+
+def test_store_is_shared(tmpdir):
+    source = write_source(tmpdir, NEEDS)
+    store = requirements_store.get_store(source)
+    assert requirements_store.get_store(source) is store
+    assert store.needs is store.needs
+    assert store.index_path == str(tmpdir.join("heat_requirements.index.json"))
+
+
+def test_packaged_index_is_up_to_date():
+    store = RequirementsStore()
+    assert store.needs
+    assert store.from_index, "Run python update_reqs.py --index-only"
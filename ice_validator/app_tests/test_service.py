@@ -0,0 +1,249 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import http.client
+import json
+import os
+import threading
+import zipfile
+
+import pytest
+
+import service
+
+SAMPLE_DIR = os.path.join(os.path.dirname(__file__), "preload_tests", "sample_heat")
+
+
+def test_pytest_args_defaults():
+    args = service.pytest_args("/templates")
+    assert args == [
+        "--ignore=app_tests",
+        "--capture=sys",
+        "--template-directory=/templates",
+        "--report-format=html",
+    ]
+
+
+def test_pytest_args_all_options():
+    args = service.pytest_args(
+        "/templates",
+        categories=["a", "b"],
+        report_format="csv",
+        halt_on_failure=False,
+        template_source="pkg.zip",
+        preload_format="VNF-API",
+        output_dir="/out",
+    )
+    assert "--template-source=pkg.zip" in args
+    assert "--output-directory=/out" in args
+    assert args.count("--category") == 2
+    assert "--continue-on-failure" in args
+    assert "--preload-format=VNF-API" in args
+
+
+def test_make_job_defaults(tmpdir):
+    job = service.make_job({"template_dir": SAMPLE_DIR}, str(tmpdir))
+    assert job["report_format"] == "html"
+    assert job["halt_on_failure"] is True
+    assert os.path.dirname(job["output_dir"]) == str(tmpdir)
+    assert set(job) == set(service.JOB_PARAMETERS)
+
+
+@pytest.mark.parametrize(
+    "request_data",
+    [
+        [],
+        {},
+        {"template_dir": "/does/not/exist"},
+        {"template_dir": os.path.join(SAMPLE_DIR, "base.yaml")},
+        {"template_dir": SAMPLE_DIR, "bogus": True},
+        {"template_dir": SAMPLE_DIR, "report_format": "pdf"},
+        {"template_dir": SAMPLE_DIR, "categories": "openstack"},
+        {"template_dir": os.path.relpath(SAMPLE_DIR)},
+        {"template_dir": SAMPLE_DIR, "output_dir": "out"},
+        {"template_dir": SAMPLE_DIR, "preload_config": "preloads.json"},
+    ],
+)
+def test_make_job_invalid(request_data, tmpdir):
+    with pytest.raises(ValueError):
+        service.make_job(request_data, str(tmpdir))
+
+
+def test_make_job_output_dir_under_output_root(tmpdir):
+    output_root = tmpdir.mkdir("root")
+    request = {"template_dir": SAMPLE_DIR, "output_dir": str(output_root.join("a"))}
+    assert service.make_job(request, str(output_root))["output_dir"] == str(
+        output_root.join("a")
+    )
+    for output_dir in (str(tmpdir), str(output_root.join("..", "other"))):
+        request["output_dir"] = output_dir
+        with pytest.raises(ValueError):
+            service.make_job(request, str(output_root))
+
+
+@pytest.mark.parametrize(
+    "args, allowed",
+    [
+        ([], True),
+        (["--host", "::1"], True),
+        (["--host", "localhost"], True),
+        (["--host", "0.0.0.0"], False),
+        (["--host", "build.example.com"], False),
+        (["--host", "0.0.0.0", "--token", "secret"], True),
+        (["--host", "0.0.0.0", "--socket", "/tmp/vvp.sock"], True),
+    ],
+)
+def test_non_loopback_host_requires_token(args, allowed, monkeypatch):
+    monkeypatch.delenv(service.TOKEN_VARIABLE, raising=False)
+    if allowed:
+        service.parse_args(args)
+    else:
+        with pytest.raises(SystemExit):
+            service.parse_args(args)
+
+
+def test_socket_is_private(tmpdir, monkeypatch):
+    def chmod(*args):
+        raise AssertionError("socket permissions changed after it was created")
+
+    monkeypatch.setattr(os, "chmod", chmod)
+    socket_path = str(tmpdir.join("vvp.sock"))
+    umask = os.umask(0o022)
+    try:
+        server = service.make_server(FakeService(str(tmpdir)), socket_path)
+        server.server_close()
+        assert os.umask(0o022) == 0o022
+    finally:
+        os.umask(umask)
+    assert os.stat(socket_path).st_mode & 0o777 == 0o600
+
+
+def test_output_root_resolved_before_warm_up(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    validation_service = service.ValidationService(output_root="out")
+    assert validation_service.output_root == str(tmpdir.join("out"))
+
+
+def test_collect_reports(tmpdir):
+    tmpdir.join("report.json").write("{}")
+    tmpdir.join("report.html").write("")
+    tmpdir.mkdir("preloads")
+    reports = service.collect_reports(str(tmpdir), "html")
+    assert set(reports) == {"json", "html", "preloads"}
+
+
+class FakeService:
+    def __init__(self, output_root):
+        self.output_root = output_root
+
+    def status(self):
+        return {"version": "test", "workers": 1}
+
+    def validate(self, request):
+        job = service.make_job(request, self.output_root)
+        return {"success": True, "output_dir": job["output_dir"]}
+
+
+def serve(output_root, token):
+    server = service.make_server(FakeService(output_root), port=0, token=token)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    conn = http.client.HTTPConnection(*server.server_address)
+    conn.token = token
+    yield conn
+    conn.close()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=[None, "secret"])
+def client(request, tmpdir):
+    yield from serve(str(tmpdir), request.param)
+
+
+@pytest.fixture
+def token_client(tmpdir):
+    yield from serve(str(tmpdir), "secret")
+
+
+def call(conn, method, path, body=None, token=True):
+    headers = {}
+    if token and conn.token:
+        headers["Authorization"] = "Bearer {}".format(conn.token)
+    body = json.dumps(body) if body is not None else None
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read().decode("utf8"))
+
+
+def test_status(client):
+    assert call(client, "GET", "/status") == (200, {"version": "test", "workers": 1})
+
+
+def test_validate(client, tmpdir):
+    status, result = call(client, "POST", "/validate", {"template_dir": SAMPLE_DIR})
+    assert status == 200
+    assert result["success"]
+    assert result["output_dir"].startswith(str(tmpdir))
+
+
+def test_validate_zip(client, tmpdir):
+    package = str(tmpdir.join("vnf.zip"))
+    with zipfile.ZipFile(package, "w") as archive:
+        for name in os.listdir(SAMPLE_DIR):
+            archive.write(os.path.join(SAMPLE_DIR, name), name)
+    status, result = call(client, "POST", "/validate", {"template_dir": package})
+    assert status == 200
+    assert result["success"]
+
+
+def test_validate_invalid_request(client):
+    status, result = call(client, "POST", "/validate", {"template_dir": "/nope"})
+    assert status == 400
+    assert "template_dir" in result["error"]
+
+
+def test_unknown_path(client):
+    assert call(client, "GET", "/other")[0] == 404
+    assert call(client, "POST", "/other", {})[0] == 404
+
+
+def test_token_required(token_client):
+    assert call(token_client, "GET", "/status", token=False)[0] == 401
+    request = {"template_dir": SAMPLE_DIR}
+    assert call(token_client, "POST", "/validate", request, token=False)[0] == 401
+    token_client.token = "other"
+    assert call(token_client, "GET", "/status")[0] == 401
@@ -0,0 +1,255 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import os
+
+import pytest
+
+from tests import structures
+from tests.structures import Heat, get_nested_graph, load_heat
+from tests.utils.nested_files import get_list_of_nested_files
+
+TEMPLATE = """
+heat_template_version: 2015-04-30
+resources:
+  db_server_0:
+    type: OS::Nova::Server
+    properties:
+      networks:
+        - port: {get_resource: db_0_oam_port_0}
+  db_0_oam_port_0:
+    type: OS::Neutron::Port
+    properties:
+      network: {get_param: oam_net_id}
+  web_0_oam_port_0:
+    type: OS::Neutron::Port
+    depends_on: db_server_0
+  config:
+    type: OS::Heat::CloudConfig
+    depends_on: [db_server_0, web_0_oam_port_0]
+"""
+
+
+NESTED = {
+    "base.yaml": """
+heat_template_version: 2015-04-30
+resources:
+  web_server_0:
+    type: OS::Nova::Server
+  left:
+    type: left.yaml
+  right:
+    type: OS::Heat::ResourceGroup
+    properties:
+      count: {get_param: right_count}
+      resource_def:
+        type: right.yaml
+""",
+    "base.env": """
+parameters:
+  right_count: 3
+""",
+    "left.yaml": """
+heat_template_version: 2015-04-30
+resources:
+  left_port:
+    type: OS::Neutron::Port
+  shared:
+    type: shared.yaml
+""",
+    "right.yaml": """
+heat_template_version: 2015-04-30
+resources:
+  right_port:
+    type: OS::Neutron::Port
+  shared:
+    type: shared.yaml
+""",
+    "shared.yaml": """
+heat_template_version: 2015-04-30
+resources:
+  shared_volume:
+    type: OS::Cinder::Volume
+""",
+    "cycle_a.yaml": """
+heat_template_version: 2015-04-30
+resources:
+  b:
+    type: cycle_b.yaml
+""",
+    "cycle_b.yaml": """
+heat_template_version: 2015-04-30
+resources:
+  a:
+    type: cycle_a.yaml
+""",
+}
+
+
+@pytest.fixture
+def nested_dir(tmpdir, monkeypatch):
+    monkeypatch.setattr(structures, "HEAT_CACHE", {})
+    monkeypatch.setattr(structures, "NESTED_GRAPHS", {})
+    for name, contents in NESTED.items():
+        tmpdir.join(name).write(contents)
+    return str(tmpdir)
+
+
+@pytest.fixture
+def template(tmpdir):
+    path = tmpdir.join("base.yaml")
+    path.write(TEMPLATE)
+    return str(path)
+
+
+def test_get_resource_by_type(template):
+    heat = Heat(template)
+    ports = heat.get_resource_by_type("OS::Neutron::Port")
+    assert set(ports) == {"db_0_oam_port_0", "web_0_oam_port_0"}
+    assert set(heat.nova_server_resources) == {"db_server_0"}
+    assert heat.get_resource_by_type("OS::Cinder::Volume") == {}
+
+
+def test_vm_type_and_network_role_index(template):
+    heat = Heat(template)
+    assert set(heat.get_resources_by_vm_type("db")) == {
+        "db_server_0",
+        "db_0_oam_port_0",
+    }
+    assert set(heat.get_resources_by_network_role("oam")) == {
+        "db_0_oam_port_0",
+        "web_0_oam_port_0",
+    }
+
+
+def test_reverse_references(template):
+    heat = Heat(template)
+    assert heat.get_referencing_resources("db_0_oam_port_0") == {"db_server_0"}
+    assert heat.get_dependent_resources("db_server_0") == {
+        "web_0_oam_port_0",
+        "config",
+    }
+    assert heat.get_dependent_resources("config") == set()
+
+
+def test_load_heat_is_shared(template, monkeypatch):
+    monkeypatch.setattr(structures, "HEAT_CACHE", {})
+    heat = load_heat(template)
+    assert load_heat(template) is heat
+    assert load_heat(template, template) is not heat
+
+
+def test_get_all_resources_uses_env_counts(nested_dir):
+    heat = Heat(
+        os.path.join(nested_dir, "base.yaml"), os.path.join(nested_dir, "base.env")
+    )
+    resources = heat.get_all_resources()
+    assert list(resources) == [
+        "web_server_0",
+        "left",
+        "left_port",
+        "shared",
+        "shared_volume",
+        "right",
+        "right_port",
+    ]
+    counts = heat.get_resource_counts()
+    assert counts["web_server_0"] == 1
+    assert counts["right_port"] == 3
+    assert counts["left_port"] == 1
+
+
+def test_resource_counts_not_shared_between_counts(nested_dir, monkeypatch):
+    monkeypatch.setattr(structures, "HEAT_CACHE", {})
+    heat = load_heat(
+        os.path.join(nested_dir, "base.yaml"), os.path.join(nested_dir, "base.env")
+    )
+    expected = heat.get_resource_counts()
+    heat.get_all_resources(count=3)
+    assert heat.get_resource_counts(count=3)["web_server_0"] == 3
+    assert heat.get_resource_counts() == expected
+
+
+def test_nested_templates_loaded_once(nested_dir, monkeypatch):
+    loaded = []
+    original_load = Heat.load
+
+    def load(self, filepath):
+        loaded.append(filepath)
+        original_load(self, filepath)
+
+    monkeypatch.setattr(Heat, "load", load)
+    graph = get_nested_graph(nested_dir)
+    graph.add(load_heat(os.path.join(nested_dir, "left.yaml")))
+    graph.add(load_heat(os.path.join(nested_dir, "right.yaml")))
+    assert sorted(os.path.basename(f) for f in loaded) == [
+        "left.yaml",
+        "right.yaml",
+        "shared.yaml",
+    ]
+
+
+def test_iter_nested_heat_depth(nested_dir):
+    heat = load_heat(os.path.join(nested_dir, "base.yaml"))
+    assert [(d, h.basename) for d, h in heat.iter_nested_heat()] == [
+        (1, "left.yaml"),
+        (2, "shared.yaml"),
+        (1, "right.yaml"),
+        (2, "shared.yaml"),
+    ]
+    graph = get_nested_graph(nested_dir)
+    order = [os.path.basename(p) for p in graph.order]
+    assert order.index("shared.yaml") < order.index("left.yaml")
+    assert order.index("left.yaml") < order.index("base.yaml")
+
+
+def test_cycles_are_detected(nested_dir):
+    heat = load_heat(os.path.join(nested_dir, "cycle_a.yaml"))
+    assert [d for d, _ in heat.iter_nested_heat()] == [1]
+    assert set(heat.get_all_resources()) == {"a", "b"}
+    cycles = get_nested_graph(nested_dir).get_cycles(heat)
+    assert [[os.path.basename(p) for p in c] for c in cycles] == [
+        ["cycle_a.yaml", "cycle_b.yaml", "cycle_a.yaml"]
+    ]
+    base = load_heat(os.path.join(nested_dir, "base.yaml"))
+    assert get_nested_graph(nested_dir).get_cycles(base) == []
+
+
+def test_nested_files_of_cycle_member_not_truncated(nested_dir):
+    get_list_of_nested_files.cache_clear()
+    a, b = (os.path.join(nested_dir, f) for f in ("cycle_a.yaml", "cycle_b.yaml"))
+    assert get_list_of_nested_files(a, nested_dir) == [b, a]
+    assert get_list_of_nested_files(b, nested_dir) == [a, b]
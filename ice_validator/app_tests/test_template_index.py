@@ -0,0 +1,82 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import os
+from pathlib import Path
+
+import pytest
+
+from tests.utils import template_index
+from tests.utils.template_index import get_template_index
+
+SAMPLE_DIR = str(Path(__file__).parent / "preload_tests" / "sample_heat")
+
+
+def sample(name):
+    return "{}/{}".format(SAMPLE_DIR, name)
+
+
+@pytest.fixture
+def index(monkeypatch):
+    monkeypatch.setattr(template_index, "TEMPLATE_INDEXES", {})
+    return get_template_index(SAMPLE_DIR)
+
+
+def test_classification(index):
+    assert index.base_module == os.path.join(SAMPLE_DIR, "base.yaml")
+    assert index.volume_modules == {sample("base_volume.yaml")}
+    assert index.nested_files == {os.path.join(SAMPLE_DIR, "nested_svc.yaml")}
+    assert index.incremental_modules == {sample("incremental.yaml")}
+    assert index.is_nested(os.path.join(SAMPLE_DIR, "nested_svc.yaml"))
+    assert not index.is_nested(sample("base.yaml"))
+
+
+def test_env_pairs(index):
+    assert index.env_pairs == {
+        sample("base.yaml"): sample("base.env"),
+        sample("base_volume.yaml"): sample("base_volume.env"),
+        sample("incremental.yaml"): sample("incremental.env"),
+    }
+
+
+def test_parent_child_maps(index):
+    nested = os.path.join(SAMPLE_DIR, "nested_svc.yaml")
+    assert index.children[sample("base.yaml")] == [nested]
+    assert set(index.parents[nested]) == {sample("base.yaml"), sample("incremental.yaml")}
+
+
+def test_index_shared(index):
+    assert get_template_index(SAMPLE_DIR) is index
@@ -0,0 +1,137 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+import os
+import zipfile
+
+import pytest
+
+from tests import cached_yaml
+from tests.utils import template_source
+from tests.utils.template_source import ZipSource
+
+FILES = {
+    "base.yaml": "heat_template_version: 2015-04-30\n",
+    "base.env": "parameters: {}\n",
+    "scripts/user.data": "#!/bin/bash\n",
+}
+
+
+@pytest.fixture
+def archive(tmpdir):
+    path = str(tmpdir.join("vnf.zip"))
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, contents in FILES.items():
+            zf.writestr(name, contents)
+    yield path
+    template_source.close_archives()
+    cached_yaml.YAML_CACHE.clear()
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_zip_source_members(archive, use_mmap):
+    source = ZipSource(archive, use_mmap=use_mmap)
+    try:
+        assert source.listdir() == ["base.env", "base.yaml", "scripts"]
+        assert source.listdir("scripts") == ["user.data"]
+        assert source.isfile("base.yaml")
+        assert source.isdir("scripts")
+        assert not source.exists("missing.yaml")
+        assert source.read("scripts/user.data") == b"#!/bin/bash\n"
+        with source.open("base.env") as f:
+            assert f.read() == "parameters: {}\n"
+            assert f.name == os.path.join(archive, "base.env")
+    finally:
+        source.close()
+
+
+def test_zip_source_walk(archive):
+    walked = list(ZipSource(archive).walk())
+    assert walked == [
+        (archive, ["scripts"], ["base.env", "base.yaml"]),
+        (os.path.join(archive, "scripts"), [], ["user.data"]),
+    ]
+
+
+def test_zip_source_errors(archive):
+    source = ZipSource(archive)
+    with pytest.raises(FileNotFoundError):
+        source.read("missing.yaml")
+    with pytest.raises(NotADirectoryError):
+        source.listdir("base.yaml")
+    with pytest.raises(PermissionError):
+        source.open("base.yaml", "w")
+
+
+def test_virtual_paths(archive):
+    template_source.get_source(archive)
+    base = os.path.join(archive, "base.yaml")
+    assert template_source.isdir(archive)
+    assert template_source.isfile(base)
+    assert template_source.exists(os.path.join(archive, "scripts", "user.data"))
+    assert template_source.listdir(archive) == ["base.env", "base.yaml", "scripts"]
+    assert template_source.read_bytes(base) == FILES["base.yaml"].encode()
+    assert template_source.hash_file(base) == template_source.hash_file(base)
+
+
+def test_virtual_paths_open_archive(archive):
+    # the archive is opened on first access to one of its members
+    base = os.path.join(archive, "base.yaml")
+    assert not template_source.ARCHIVES
+    assert template_source.isfile(base)
+    assert os.path.abspath(archive) in template_source.ARCHIVES
+
+
+def test_regular_paths(tmpdir):
+    tmpdir.join("base.yaml").write("resources: {}\n")
+    path = str(tmpdir.join("base.yaml"))
+    assert template_source.isfile(path)
+    assert template_source.listdir(str(tmpdir)) == ["base.yaml"]
+    assert not template_source.exists(str(tmpdir.join("missing.yaml")))
+    assert isinstance(
+        template_source.get_source(str(tmpdir)), template_source.DirectorySource
+    )
+
+
+def test_load_path_from_archive(archive):
+    data = cached_yaml.load_path(os.path.join(archive, "base.env"))
+    assert data == {"parameters": {}}
+
+
+def test_archive_is_a_directory(archive):
+    # the archive is opened when it is used as a directory
+    assert template_source.listdir(archive) == ["base.env", "base.yaml", "scripts"]
+    assert os.path.abspath(archive) in template_source.ARCHIVES
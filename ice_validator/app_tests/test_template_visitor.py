@@ -0,0 +1,124 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+from pathlib import Path
+
+import pytest
+
+from tests import cached_yaml
+from tests.helpers import traverse
+from tests.utils import template_visitor
+from tests.utils.template_visitor import visit
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures"
+
+KEYS = ("get_param", "get_attr", "get_resource", "get_file", "vf_module_index")
+
+TEMPLATE = {
+    "parameters": {"name": {"type": "string"}},
+    "resources": {
+        "server": {
+            "type": "OS::Nova::Server",
+            "properties": {
+                "name": {"get_param": "name"},
+                "user_data": {"get_file": "init.sh"},
+                "metadata": ["vf_module_index", {"get_param": ["ips", 0]}],
+            },
+        }
+    },
+    "outputs": {"ip": {"value": {"get_attr": ["server", "first_address"]}}},
+}
+
+
+def traversed(data, key):
+    found = []
+    traverse(data, key, lambda path, value: found.append((path, value)))
+    return found
+
+
+def visited(data, key):
+    return [(o.path, o.value) for o in visit(data, *KEYS).find(key)]
+
+
+@pytest.mark.parametrize("key", KEYS)
+def test_same_as_traverse(key):
+    assert visited(TEMPLATE, key) == traversed(TEMPLATE, key)
+    for scalar in ("text", key, None, 1):
+        assert visited(scalar, key) == traversed(scalar, key)
+
+
+def test_same_as_traverse_for_fixtures():
+    mismatches = []
+    for path in sorted(FIXTURES_DIR.rglob("*.yaml")):
+        try:
+            yml = cached_yaml.load_path(str(path))
+        except Exception:  # nosec
+            continue  # invalid YAML fixtures
+        for key in KEYS:
+            if visited(yml, key) != traversed(yml, key):
+                mismatches.append((str(path), key))
+    assert not mismatches
+
+
+def test_section():
+    found = visit(TEMPLATE, *KEYS).find("get_param", section="resources")
+    assert [o.value for o in found] == ["name", ["ips", 0]]
+    assert visit(TEMPLATE).find("get_attr", section="resources") == []
+
+
+def test_visits_of_frozen_data_are_cached():
+    yml = cached_yaml.freeze(TEMPLATE)
+    result = visit(yml, *KEYS)
+    assert visit(yml) is result
+    assert visit(TEMPLATE) is not visit(TEMPLATE)
+
+
+def test_new_keys_visit_again(monkeypatch):
+    monkeypatch.setattr(template_visitor, "REGISTERED_KEYS", set(KEYS))
+    yml = cached_yaml.freeze(TEMPLATE)
+    result = visit(yml)
+    assert visit(yml, "type") is not result
+    assert [o.value for o in visit(yml).find("type")] == [
+        "string",
+        "OS::Nova::Server",
+    ]
+
+
+def test_for_each():
+    found = []
+    visit(TEMPLATE, *KEYS).for_each("get_attr", lambda p, v: found.append((p, v)))
+    path = ["outputs", "ip", "value", "get_attr"]
+    assert found == [(path, ["server", "first_address"])]
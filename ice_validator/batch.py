@@ -0,0 +1,288 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Validates many VNF packages in one invocation (``python vvp.py batch``).
+
+Each input is a template directory or a ZIP archive of templates, which is
+validated without being extracted.  The packages are scheduled across a pool
+of worker processes that import the validation scripts once and then validate
+one package after another, so the Heat engine and the parsed requirements are
+shared by every package a worker validates.  With ``--yaml-cache-dir``, the
+templates are parsed into a content-addressed cache shared by all the
+workers, so a template already parsed for another package is not parsed
+again.
+
+Every package gets its own output directory under the output root, named
+after the package.  A roll-up of the outcome and duration of every package
+is written to ``summary.json`` and ``summary.csv`` in the output root.
+"""
+
+import argparse
+import csv
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+import zipfile
+from shutil import rmtree
+
+from service import JOB_PARAMETERS, run_job, warm_up
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+
+SUMMARY_COLUMNS = ("package", "outcome", "duration", "output_dir", "error")
+
+
+def expand_inputs(patterns):
+    """
+    Expands the glob patterns of the packages to validate.  Patterns that
+    do not contain wildcards are used as-is.
+
+    :param patterns: paths or glob patterns of directories or ZIP files
+    :return: list of absolute paths without duplicates, in the order given
+    :raises: ValueError if a pattern doesn't match a directory or ZIP file
+    """
+    packages = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        matches = [m for m in matches if os.path.isdir(m) or zipfile.is_zipfile(m)]
+        if not matches:
+            raise ValueError(
+                "{} is not a template directory or ZIP file".format(pattern)
+            )
+        for match in matches:
+            path = os.path.abspath(match)
+            if path not in packages:
+                packages.append(path)
+    return packages
+
+
+def output_dirs(packages, output_root):
+    """
+    :return: a unique output directory under ``output_root`` for each
+             package, named after the package
+    """
+    dirs = []
+    for package in packages:
+        name = os.path.basename(package.rstrip(os.sep))
+        if zipfile.is_zipfile(package):
+            name = os.path.splitext(name)[0]
+        candidate, suffix = name, 1
+        while candidate in dirs:
+            suffix += 1
+            candidate = "{}-{}".format(name, suffix)
+        dirs.append(candidate)
+    return [os.path.join(output_root, d) for d in dirs]
+
+
+def get_outcome(output_dir):
+    """:return: overall outcome from the package's report.json, or ERROR"""
+    try:
+        with open(os.path.join(output_dir, "report.json"), encoding="utf8") as f:
+            return json.load(f)["outcome"]
+    except (OSError, ValueError, KeyError):
+        return "ERROR"
+
+
+def validate_package(task):
+    """
+    Validates a single package.  This runs in a worker process.
+
+    :param task: tuple of (package path, output directory, job options)
+    :return: dict summarizing the result (see SUMMARY_COLUMNS)
+    """
+    package, output_dir, options = task
+    start = time.time()
+    job = dict(JOB_PARAMETERS, **options)
+    job.update(template_source=package, output_dir=output_dir)
+    error = None
+    if os.path.exists(output_dir):
+        rmtree(output_dir, ignore_errors=True)
+    os.makedirs(output_dir, exist_ok=True)
+    try:
+        # ZIP archives are validated in place (see tests/utils/template_source.py)
+        result = run_job(dict(job, template_dir=package))
+        error = result["error"]
+        with open(os.path.join(output_dir, "log.txt"), "w", encoding="utf8") as f:
+            f.write(result["log"])
+    except Exception:
+        error = traceback.format_exc()
+    return {
+        "package": package,
+        "outcome": "ERROR" if error else get_outcome(output_dir),
+        "duration": round(time.time() - start, 3),
+        "output_dir": output_dir,
+        "error": error or "",
+    }
+
+
+def run_batch(packages, output_root, workers=1, **options):
+    """
+    Validates ``packages`` across ``workers`` processes.
+
+    :param packages:    paths to template directories or ZIP files
+    :param output_root: directory containing the output directory of each package
+    :param workers:     number of packages validated in parallel
+    :param options:     job options shared by every package (see
+                        ``service.JOB_PARAMETERS``)
+    :return: list of summaries in the order of ``packages``
+    """
+    dirs = output_dirs(packages, output_root)
+    tasks = [(package, d, options) for package, d in zip(packages, dirs)]
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context("spawn")
+    results = {}
+    with context.Pool(min(workers, len(tasks)) or 1, initializer=warm_up) as pool:
+        for summary in pool.imap_unordered(validate_package, tasks):
+            results[summary["package"]] = summary
+            print(
+                "{outcome:5} {duration:8.2f}s  {package}".format(**summary), flush=True
+            )
+    return [results[p] for p in packages]
+
+
+def write_summary(output_root, summaries):
+    """Writes summary.json and summary.csv to ``output_root``"""
+    with open(os.path.join(output_root, "summary.json"), "w") as f:
+        json.dump(summaries, f, indent=2)
+    with open(os.path.join(output_root, "summary.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(summaries)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="vvp.py batch", description="Validate multiple VNF packages"
+    )
+    parser.add_argument(
+        "packages",
+        nargs="+",
+        help="Template directories or ZIP files to validate (glob patterns allowed)",
+    )
+    parser.add_argument(
+        "--output-root",
+        default=os.path.join(PATH, "output", "batch"),
+        help="Directory where the output directory of each package is created",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of packages validated in parallel (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--category",
+        dest="categories",
+        action="append",
+        help="Optional category of tests to execute (multiple allowed)",
+    )
+    parser.add_argument(
+        "--report-format",
+        default="html",
+        choices=("csv", "html", "excel", "json"),
+        help="Format of the report of each package",
+    )
+    parser.add_argument(
+        "--continue-on-failure",
+        action="store_true",
+        help="Continue validation even when structural errors exist in input files",
+    )
+    parser.add_argument("--preload-format", help="Preload format to create")
+    parser.add_argument(
+        "--preload-config",
+        help="Directory or file containing the preload data source",
+    )
+    parser.add_argument("--preload-source", help="Name of the preload data source")
+    parser.add_argument(
+        "--yaml-cache-dir",
+        help="Directory to store parsed YAML files in, so templates shared by "
+        "several packages (or runs) are only parsed once",
+    )
+    args = parser.parse_args(argv)
+    # the workers change their working directory (see service.warm_up)
+    args.output_root = os.path.abspath(args.output_root)
+    if args.yaml_cache_dir:
+        args.yaml_cache_dir = os.path.abspath(args.yaml_cache_dir)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    try:
+        packages = expand_inputs(args.packages)
+    except ValueError as e:
+        print("ERROR: {}".format(e))
+        return 2
+    os.makedirs(args.output_root, exist_ok=True)
+    start = time.time()
+    summaries = run_batch(
+        packages,
+        args.output_root,
+        args.workers,
+        categories=args.categories,
+        report_format=args.report_format,
+        halt_on_failure=not args.continue_on_failure,
+        preload_config=args.preload_config,
+        preload_format=args.preload_format,
+        preload_source=args.preload_source,
+        yaml_cache_dir=args.yaml_cache_dir,
+    )
+    write_summary(args.output_root, summaries)
+    outcomes = [s["outcome"] for s in summaries]
+    print(
+        "{} packages validated in {:.2f}s: {} passed, {} failed, {} errors".format(
+            len(summaries),
+            time.time() - start,
+            outcomes.count("PASS"),
+            outcomes.count("FAIL"),
+            outcomes.count("ERROR"),
+        )
+    )
+    summary_path = os.path.join(args.output_root, "summary.csv")
+    print("Summary written to {}".format(summary_path))
+    return 0 if set(outcomes) <= {"PASS"} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Benchmark of the per-file cost of validating templates with the Heat engine.
+
+Usage (from the ice_validator directory)::
+
+    python -m benchmarks.heat_validation [--repeat N] [PATH ...]
+
+Each PATH may be a Heat template or a directory that will be searched
+recursively.  If no paths are provided, then the sample templates used by
+the preload tests are validated.  Two strategies are compared:
+
+- per-file: a new engine is created for every template (previous behavior)
+- shared:   a single engine is reused for every template
+"""
+
+import argparse
+import os
+import time
+import warnings
+
+from tests import cached_yaml
+from tests.heat_validation import HOTValidator, create_job
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(
+    THIS_DIR, "..", "app_tests", "preload_tests", "sample_heat"
+)
+
+
+def find_templates(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for dir_path, _, filenames in os.walk(path):
+            for filename in sorted(filenames):
+                if filename.endswith((".yaml", ".yml")):
+                    yield os.path.join(dir_path, filename)
+
+
+def load_jobs(paths):
+    """Returns (template, files, parameters) for every Heat template"""
+    jobs = []
+    for path in find_templates(paths):
+        with open(path) as f:
+            yml = cached_yaml.load(f)
+        if not isinstance(yml, dict) or "resources" not in yml:
+            continue
+        jobs.append(create_job(path, yml))
+    return jobs
+
+
+def per_file(jobs):
+    for template, files, parameters in jobs:
+        HOTValidator().validate(template, files, parameters)
+
+
+def shared(jobs):
+    validator = HOTValidator()
+    for template, files, parameters in jobs:
+        validator.validate(template, files, parameters)
+
+
+def measure(strategy, jobs, repeat):
+    """:return: seconds taken to validate every job ``repeat`` times"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        strategy(jobs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_PATH])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    jobs = load_jobs(args.paths)
+    count = len(jobs) * args.repeat
+    print("Validating {} templates x {}".format(len(jobs), args.repeat))
+    print("{:<10} {:>10} {:>12}".format("strategy", "seconds", "ms/template"))
+    for strategy in (per_file, shared):
+        elapsed = measure(strategy, jobs, args.repeat)
+        print(
+            "{:<10} {:>10.3f} {:>12.2f}".format(
+                strategy.__name__.replace("_", "-"), elapsed, elapsed * 1000 / count
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
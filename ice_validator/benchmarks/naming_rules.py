@@ -0,0 +1,187 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Micro-benchmark of matching names against the naming rule families.
+
+Usage (from the ice_validator directory)::
+
+    python -m benchmarks.naming_rules [--repeat N] [PATH ...]
+
+Each PATH may be a Heat template or a directory that will be searched
+recursively.  If no paths are provided, then the self-test fixtures are used.
+The resource IDs and ``get_param`` names of the templates are matched against
+every rule family.  Two strategies are compared:
+
+- sequential: each pattern of the family is tried in turn (previous behavior)
+- combined:   a single match of the family's ``RuleSet``
+"""
+
+import argparse
+import os
+import re
+import time
+
+from tests import cached_yaml
+from tests.structures import Heat, _HEAT_PROCESSORS
+from tests.utils import network_roles, vm_types
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(THIS_DIR, "..", "tests", "fixtures")
+
+
+def find_templates(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for dir_path, _, filenames in os.walk(path):
+            for filename in sorted(filenames):
+                if filename.endswith((".yaml", ".yml")):
+                    yield os.path.join(dir_path, filename)
+
+
+def iter_params(value):
+    if isinstance(value, dict):
+        for k, v in value.items():
+            if k == "get_param":
+                v = v[0] if isinstance(v, list) and v else v
+                if isinstance(v, str):
+                    yield v
+            yield from iter_params(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from iter_params(v)
+
+
+def load_names(paths):
+    """Returns the resource IDs and get_param names of the templates"""
+    names = []
+    for path in find_templates(paths):
+        try:
+            yml = cached_yaml.load_path(path)
+        except cached_yaml.YAMLError:
+            continue
+        resources = yml.get("resources") if isinstance(yml, dict) else None
+        if isinstance(resources, dict):
+            names.extend(rid for rid in resources if isinstance(rid, str))
+            names.extend(iter_params(resources))
+    return names
+
+
+def rule_families():
+    """Returns a dict of family name: RuleSet"""
+    families = {
+        p.resource_type: p.rid_rules for p in _HEAT_PROCESSORS.values() if p.re_rids
+    }
+    for prop, rules in vm_types.PROPERTY_FORMATS.items():
+        families["vm_type " + prop] = rules
+    families["network parameter"] = network_roles.PARAM_FORMATS
+    families["network resource"] = network_roles.RESOURCE_FORMATS
+    return families
+
+
+def sequential(rules, names):
+    patterns = [(name, re.compile(pattern)) for name, pattern in rules.rules]
+    for text in names:
+        for _, regex in patterns:
+            if regex.match(text):
+                break
+
+
+def combined(rules, names):
+    for text in names:
+        rules.match(text)
+
+
+def part_is_in_name(parts, names):
+    """Returns the seconds to test every part with Heat.part_is_in_name"""
+    start = time.perf_counter()
+    for part in parts:
+        for name in names:
+            Heat.part_is_in_name(part, name)
+    return time.perf_counter() - start
+
+
+def part_is_in_name_uncached(parts, names):
+    """Returns the seconds to test every part, compiling the regex per call"""
+    start = time.perf_counter()
+    for part in parts:
+        for name in names:
+            re.search("(^(%(x)s)_)|(_(%(x)s)_)|(_(%(x)s)$)" % dict(x=part), name)
+    return time.perf_counter() - start
+
+
+def measure(strategy, rules, names, repeat):
+    """:return: seconds taken to match every name ``repeat`` times"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        strategy(rules, names)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_PATH])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    names = load_names(args.paths)
+    print("Matching {} names x {}".format(len(names), args.repeat))
+    print("{:<40} {:>12} {:>12}".format("family", "sequential", "combined"))
+    totals = [0.0, 0.0]
+    for family, rules in sorted(rule_families().items()):
+        times = [
+            measure(strategy, rules, names, args.repeat)
+            for strategy in (sequential, combined)
+        ]
+        totals = [t + s for t, s in zip(totals, times)]
+        print("{:<40} {:>12.4f} {:>12.4f}".format(family, *times))
+    print("{:<40} {:>12.4f} {:>12.4f}".format("total", *totals))
+
+    parts = sorted(set(names))[:50]
+    print()
+    print("part_is_in_name for {} parts x {} names".format(len(parts), len(names)))
+    for label, strategy in (
+        ("compiled per call", part_is_in_name_uncached),
+        ("cached", part_is_in_name),
+    ):
+        print("{:<40} {:>12.4f}".format(label, strategy(parts, names)))
+
+
+if __name__ == "__main__":
+    main()
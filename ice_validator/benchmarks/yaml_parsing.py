@@ -0,0 +1,118 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Micro-benchmark of the YAML parser backends available to ``cached_yaml``.
+
+Usage (from the ice_validator directory)::
+
+    python -m benchmarks.yaml_parsing [--repeat N] [PATH ...]
+
+Each PATH may be a YAML file or a directory that will be searched recursively.
+If no paths are provided, then the self-test fixtures are used.
+"""
+
+import argparse
+import os
+import time
+
+from tests import cached_yaml
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(THIS_DIR, "..", "tests", "fixtures")
+YAML_EXTENSIONS = (".yaml", ".yml", ".env")
+
+
+def find_yaml_files(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for dir_path, _, filenames in os.walk(path):
+            for filename in sorted(filenames):
+                if filename.endswith(YAML_EXTENSIONS):
+                    yield os.path.join(dir_path, filename)
+
+
+def load_documents(paths):
+    """Returns the text of every parseable YAML document under paths"""
+    documents = []
+    for path in find_yaml_files(paths):
+        with open(path, encoding="utf8") as f:
+            contents = f.read()
+        try:
+            cached_yaml.parse(contents, backend="python")
+        except cached_yaml.YAMLError:
+            continue
+        documents.append(contents)
+    return documents
+
+
+def measure(documents, backend, repeat):
+    """
+    :return: tuple of (seconds, megabytes) for parsing every document
+             ``repeat`` times with ``backend``
+    """
+    size = sum(len(d.encode("utf8")) for d in documents) * repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for document in documents:
+            cached_yaml.parse(document, backend=backend)
+    elapsed = time.perf_counter() - start
+    return elapsed, size / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_PATH])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    documents = load_documents(args.paths)
+    print("Parsing {} documents x {}".format(len(documents), args.repeat))
+    print("{:<10} {:>10} {:>10} {:>10}".format("backend", "MB", "seconds", "MB/s"))
+    for backend in cached_yaml.available_backends():
+        elapsed, megabytes = measure(documents, backend, args.repeat)
+        print(
+            "{:<10} {:>10.2f} {:>10.3f} {:>10.2f}".format(
+                backend, megabytes, elapsed, megabytes / elapsed
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
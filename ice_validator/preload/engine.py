@@ -1,16 +1,24 @@
 import importlib
 import inspect
+import json
 import os
 import pkgutil
 import shutil
+import sys
+import tempfile
 from itertools import chain
 from pathlib import Path
 from typing import List, Type
 
+from cached_property import cached_property
+
 from preload.data import AbstractPreloadDataSource
 from preload.generator import AbstractPreloadGenerator
 from preload.model import get_heat_templates, Vnf
+from preload.pipeline import is_supported, run_plan
+from tests import cached_yaml
 from tests.helpers import get_output_dir
+from tests.parallel import worker_count
 
 
 def create_preloads(config, exitstatus):
@@ -26,7 +34,7 @@ def create_preloads(config, exitstatus):
     preload_dir = os.path.join(get_output_dir(config), "preloads")
     if os.path.exists(preload_dir):
         shutil.rmtree(preload_dir)
-    plugins = PluginManager()
+    plugins = PLUGIN_MGR
     available_formats = [p.format_name() for p in plugins.preload_generators]
     selected_formats = config.getoption("preload_formats") or available_formats
     preload_source = None
@@ -39,12 +47,16 @@ def create_preloads(config, exitstatus):
 
     heat_templates = get_heat_templates(config)
     vnf = None
+    plan = []
     for plugin_class in plugins.preload_generators:
         if plugin_class.format_name() not in selected_formats:
             continue
-        vnf = Vnf(heat_templates)
-        generator = plugin_class(vnf, preload_dir, preload_source)
-        generator.generate()
+        if vnf is None:
+            vnf = Vnf(heat_templates)
+        # each generator filters the outputs of its own copy of the model
+        generator = plugin_class(vnf.clone(), preload_dir, preload_source)
+        plan.extend(generator.plan())
+    run_plan(plan, preload_worker_count(config))
     if vnf and vnf.uses_contrail:
         print(
             "\nWARNING: Preload template generation does not support Contrail\n"
@@ -58,6 +70,19 @@ def create_preloads(config, exitstatus):
         )
 
 
+def preload_worker_count(config):
+    """
+    Returns the number of processes used to create the preloads requested
+    with --preload-workers (0 means one per CPU)
+    """
+    workers = config.getoption("preload_workers")
+    workers = worker_count(1 if workers is None else workers)
+    if workers > 1 and not is_supported():
+        print("WARNING: --preload-workers is not supported on this platform")
+        return 1
+    return workers
+
+
 def is_implementation_of(class_, base_class):
     """
     Returns True if the class is an implementation of AbstractPreloadGenerator
@@ -82,19 +107,136 @@ def get_implementations_of(class_, modules):
     return [m[1] for m in members]
 
 
+def is_plugin_name(name):
+    """
+    Returns True if the module name follows the naming convention of preload
+    plugin modules
+    """
+    return name.startswith("preload_") or name == "preload"
+
+
+def scan_path_entry(entry):
+    """
+    Returns the names of the preload plugin modules in the ``sys.path`` entry
+    """
+    return [m.name for m in pkgutil.iter_modules([entry]) if is_plugin_name(m.name)]
+
+
+def default_manifest_path():
+    """
+    Returns the path of the manifest in the cache directory of the validation
+    (``--yaml-cache-dir``), or None if nothing is stored between runs
+    """
+    directory = cached_yaml.cache_dir()
+    return os.path.join(directory, "preload_plugins.json") if directory else None
+
+
+class PluginManifest:
+    """
+    Names of the preload plugin modules found in each directory of
+    ``sys.path``.  A directory is only scanned again when its modification
+    time changes, so large directories such as site-packages are not listed
+    on every run.
+
+    :param path: JSON file the manifest is persisted in, or None to only keep
+                 it in memory
+    """
+
+    FORMAT = "1"
+
+    def __init__(self, path=None):
+        self.path = path
+        self.directories = None
+        self.modified = False
+
+    def load(self):
+        self.directories = {}
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf8") as f:
+                data = json.load(f)
+        except Exception:  # missing or corrupt - the directories are scanned
+            return
+        if isinstance(data, dict) and data.get("format") == self.FORMAT:
+            self.directories = data.get("directories", {})
+
+    def save(self):
+        if not (self.path and self.modified):
+            return
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(self.path), suffix=".tmp"
+            )
+            with os.fdopen(fd, "w", encoding="utf8") as f:
+                json.dump({"format": self.FORMAT, "directories": self.directories}, f)
+            os.replace(tmp_path, self.path)
+            self.modified = False
+        except OSError:
+            # the manifest only saves time, so discovery works without it
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def modules_in(self, entry):
+        """
+        Returns the names of the plugin modules in the ``sys.path`` entry
+        """
+        if self.directories is None:
+            self.load()
+        directory = os.path.abspath(entry or os.curdir)
+        if not os.path.isdir(directory):  # archives and missing entries
+            return scan_path_entry(entry)
+        mtime = os.stat(directory).st_mtime_ns
+        cached = self.directories.get(directory)
+        if cached and cached["mtime"] == mtime:
+            return cached["modules"]
+        modules = scan_path_entry(entry)
+        self.directories[directory] = {"mtime": mtime, "modules": modules}
+        self.modified = True
+        return modules
+
+    def find_modules(self, path=None):
+        """
+        Returns the names of the plugin modules in the order they are found on
+        the path.
+
+        :param path: list of directories, defaults to ``sys.path``
+        """
+        names = []
+        for entry in sys.path if path is None else path:
+            for name in self.modules_in(entry):
+                if name not in names:
+                    names.append(name)
+        self.save()
+        return names
+
+
 class PluginManager:
-    def __init__(self):
-        self.preload_plugins = [
-            importlib.import_module(name)
-            for finder, name, ispkg in pkgutil.iter_modules()
-            if name.startswith("preload_") or name == "preload"
-        ]
-        self.preload_generators: List[
-            Type[AbstractPreloadGenerator]
-        ] = get_implementations_of(AbstractPreloadGenerator, self.preload_plugins)
-        self.preload_sources: List[
-            Type[AbstractPreloadDataSource]
-        ] = get_implementations_of(AbstractPreloadDataSource, self.preload_plugins)
+    """
+    Preload plugins of the process.  The plugin modules are only discovered and
+    imported when the generators or sources are first used.
+
+    :param manifest: PluginManifest used to find the plugin modules, defaults
+                     to the manifest in the cache directory (if configured)
+    """
+
+    def __init__(self, manifest=None):
+        self.manifest = manifest
+
+    @cached_property
+    def preload_plugins(self):
+        manifest = self.manifest or PluginManifest(default_manifest_path())
+        return [importlib.import_module(name) for name in manifest.find_modules()]
+
+    @cached_property
+    def preload_generators(self) -> List[Type[AbstractPreloadGenerator]]:
+        return get_implementations_of(AbstractPreloadGenerator, self.preload_plugins)
+
+    @cached_property
+    def preload_sources(self) -> List[Type[AbstractPreloadDataSource]]:
+        return get_implementations_of(AbstractPreloadDataSource, self.preload_plugins)
 
     def get_source_for_id(self, identifier: str) -> Type[AbstractPreloadDataSource]:
         for source in self.preload_sources:
@@ -111,4 +253,5 @@ class PluginManager:
         raise RuntimeError("Unable to find preload source for name {}".format(name))
 
 
+# Shared by everything in the process that uses the preload plugins
 PLUGIN_MGR = PluginManager()
@@ -1,6 +1,5 @@
 import os
 import re
-import tempfile
 from pathlib import Path
 from typing import Any, Optional, Mapping
 
@@ -8,7 +7,8 @@ from cached_property import cached_property
 
 from preload.data import AbstractPreloadInstance, AbstractPreloadDataSource
 from preload.model import VnfModule
-from tests.helpers import check, first, unzip, load_yaml
+from tests.helpers import check, first, load_yaml
+from tests.utils import template_source
 
 SERVICE_TEMPLATE_PATTERN = re.compile(r".*service-.*?-template.yml")
 RESOURCE_TEMPLATE_PATTERN = re.compile(r".*resource-(.*?)-template.yml")
@@ -16,20 +16,6 @@ RESOURCE_TEMPLATE_PATTERN = re.compile(r".*resource-(.*?)-template.yml")
 ZONE_PARAMS = ("availability_zone_0", "availability_zone_1", "availability_zone_2")
 
 
-def yaml_files(path):
-    """
-    Return files that are YAML (end with .yml or .yaml)
-
-    :param path: Directory path object
-    :return: list of paths to YAML files
-    """
-    return [
-        p
-        for p in path.iterdir()
-        if p.is_file() and p.suffix.lower() in (".yml", ".yaml")
-    ]
-
-
 class CloudServiceArchive:
     """
     Wrapper to extract information from a CSAR file.
@@ -37,11 +23,14 @@ class CloudServiceArchive:
 
     def __init__(self, csar_path):
         self.csar_path = Path(csar_path)
-        with tempfile.TemporaryDirectory() as csar_dir:
-            csar_dir = Path(csar_dir)
-            unzip(self.csar_path, csar_dir)
-            self._service = self._get_service_template(csar_dir)
-            self._resources = self._get_vf_module_resource_templates(csar_dir)
+        check(
+            template_source.is_archive(self.csar_path),
+            "{} is not a valid zipfile or does not exist".format(self.csar_path),
+        )
+        # The members are read in place (see tests/utils/template_source.py)
+        csar_dir = Path(template_source.get_source(self.csar_path).path())
+        self._service = self._get_service_template(csar_dir)
+        self._resources = self._get_vf_module_resource_templates(csar_dir)
 
     def get_vf_module(self, vf_module):
         """
@@ -145,12 +134,17 @@ class CloudServiceArchive:
         """
         def_dir = csar_dir / "Definitions"
         check(
-            def_dir.exists(),
+            template_source.isdir(def_dir),
             "CSAR is invalid. {} does not contain a Definitions directory.".format(
                 csar_dir.as_posix()
             ),
         )
-        return yaml_files(def_dir)
+        return [
+            def_dir / name
+            for name in template_source.listdir(def_dir)
+            if template_source.isfile(def_dir / name)
+            and os.path.splitext(name)[1].lower() in (".yml", ".yaml")
+        ]
 
     def _get_service_template(self, csar_dir):
         """
@@ -170,7 +164,11 @@ class CloudServiceArchive:
             (name, def_dir / "resource-{}-template.yml".format(name))
             for name in self.vf_module_resource_names
         )
-        return {name: load_yaml(path) for name, path in mapping if path.exists()}
+        return {
+            name: load_yaml(path)
+            for name, path in mapping
+            if template_source.exists(path)
+        }
 
     @property
     def service_name(self):
@@ -49,6 +49,7 @@ from preload.data import (
     BlankPreloadInstance,
 )
 from preload.model import VnfModule, Vnf
+from preload.pipeline import PreloadTask, run_plan
 
 
 def represent_ordered_dict(dumper, data):
@@ -149,8 +150,8 @@ class AbstractPreloadGenerator(ABC):
         At this time, VNF-API does not support output parameter passing, but
         GR-API does.
 
-        If this is true, then the generator will call Vnf#filter_output_params
-        after the preload module for the base module has been created
+        If this is true, then the generator will call Vnf#filter_base_outputs
+        before the preloads of the incremental modules are created
         """
         raise NotImplementedError()
 
@@ -163,14 +164,25 @@ class AbstractPreloadGenerator(ABC):
         raise NotImplementedError()
 
     def generate(self):
-        # handle the base module first
-        print("\nGenerating {} preloads".format(self.format_name()))
+        """Create the preloads of every module"""
+        run_plan(self.plan())
+
+    def plan(self):
+        """
+        Returns the progress messages and ``PreloadTask`` that create the
+        preloads of every module, base module first.  When output passing is
+        supported, the base module outputs are filtered from the other modules
+        here, so every task can then be executed independently (see
+        ``preload.pipeline.run_plan``).
+        """
+        plan = ["\nGenerating {} preloads".format(self.format_name())]
         if self.vnf.base_module:
-            self.generate_preloads(self.vnf.base_module)
+            plan.extend(self.plan_preloads(self.vnf.base_module))
         if self.supports_output_passing():
             self.vnf.filter_base_outputs()
         for mod in self.vnf.incremental_modules:
-            self.generate_preloads(mod)
+            plan.extend(self.plan_preloads(mod))
+        return plan
 
     def start_module(self):
         """Initialize/reset the environment for the module"""
@@ -185,26 +197,41 @@ class AbstractPreloadGenerator(ABC):
 
         :param module:  module to generate for
         """
-        print("\nGenerating Preloads for {}".format(module))
-        print("-" * 50)
-        print("... generating blank template")
-        self.start_module()
+        run_plan(self.plan_preloads(module))
+
+    def plan_preloads(self, module):
+        """
+        Returns the progress messages and ``PreloadTask`` of
+        ``generate_preloads``.
+
+        :param module:  module to generate for
+        """
+        plan = [
+            "\nGenerating Preloads for {}".format(module),
+            "-" * 50,
+        ]
         preload = BlankPreloadInstance(Path(self.base_output_dir), module.label)
         blank_preload_dir = self.make_preload_dir(preload)
-        self.generate_module(module, preload, blank_preload_dir)
-        self.generate_preload_env(module, preload)
+        plan.append(
+            PreloadTask(
+                self,
+                module,
+                preload,
+                blank_preload_dir,
+                "... generating blank template",
+            )
+        )
+        plan.append(PreloadTask(self, module, preload))
 
         if self.data_source:
             preloads = self.data_source.get_module_preloads(module)
             for preload in preloads:
                 output_dir = self.make_preload_dir(preload)
-                print(
-                    "... generating preload for {} to {}".format(
-                        preload.module_label, output_dir
-                    )
+                message = "... generating preload for {} to {}".format(
+                    preload.module_label, output_dir
                 )
-                self.start_module()
-                self.generate_module(module, preload, output_dir)
+                plan.append(PreloadTask(self, module, preload, output_dir, message))
+        return plan
 
     def make_preload_dir(self, preload: AbstractPreloadInstance):
         preload_dir = preload.output_dir.joinpath(self.output_sub_dir())
@@ -34,6 +34,7 @@
 # limitations under the License.
 #
 # ============LICENSE_END============================================
+import copy
 import os
 from abc import ABC, abstractmethod
 from collections import OrderedDict
@@ -48,9 +49,10 @@ from tests.helpers import (
     remove,
 )
 from tests.parametrizers import parametrize_heat_templates
-from tests.structures import NeutronPortProcessor, Heat
+from tests.structures import NeutronPortProcessor, load_heat
 from tests.test_environment_file_parameters import get_preload_excluded_parameters
-from tests.utils import nested_dict
+from tests.utils import nested_dict, template_source
+from tests.utils.env_parameters import get_env_parameter_table
 from tests.utils.vm_types import get_vm_type_for_nova_server
 
 from tests.test_environment_file_parameters import ENV_PARAMETER_SPEC
@@ -84,6 +86,19 @@ def get_heat_templates(config):
     return heat_templates
 
 
+def _copy_once(obj, copies):
+    """
+    Returns a shallow copy of obj, creating it on first use so every object
+    that referred to obj refers to the same copy.
+
+    :param copies: dict of id of the original to its copy
+    """
+    key = id(obj)
+    if key not in copies:
+        copies[key] = copy.copy(obj)
+    return copies[key]
+
+
 class FilterBaseOutputs(ABC):
     """
     Invoked to remove parameters in an object that appear in the base module.
@@ -93,7 +108,9 @@ class FilterBaseOutputs(ABC):
     created.
 
     The method should remove the parameters that exist in the base module from
-    both itself and any sub-objects.
+    both itself and any sub-objects.  It must replace the filtered attributes
+    rather than modify them in place, as they are shared with the copies made
+    by ``Vnf.clone``.
     """
 
     @abstractmethod
@@ -281,6 +298,21 @@ class Vnf:
         for mod in non_base_modules:
             mod.filter_output_params(self.base_output_params)
 
+    def clone(self):
+        """
+        Returns a copy of the model that can be filtered with
+        ``filter_base_outputs`` without changing this one.  The objects that
+        filtering changes are copied, and everything else, such as the
+        templates and the parameters, is shared until it is filtered.
+        """
+        vnf = copy.copy(self)
+        copies = {}
+        vnf.modules = [m.clone(vnf, copies) for m in self.modules]
+        if self.base_module:
+            vnf.base_module = copies[id(self.base_module)]
+        vnf.incremental_modules = [copies[id(m)] for m in self.incremental_modules]
+        return vnf
+
 
 def env_path(heat_path):
     """
@@ -290,7 +322,7 @@ def env_path(heat_path):
     """
     base_path = os.path.splitext(heat_path)[0]
     env_path = "{}.env".format(base_path)
-    return env_path if os.path.exists(env_path) else None
+    return env_path if template_source.exists(env_path) else None
 
 
 class VnfModule(FilterBaseOutputs):
@@ -299,7 +331,7 @@ class VnfModule(FilterBaseOutputs):
         self.config = config
         self.vnf_name = os.path.splitext(os.path.basename(template_file))[0]
         self.template_file = template_file
-        self.heat = Heat(filepath=template_file, envpath=env_path(template_file))
+        self.heat = load_heat(template_file, env_path(template_file))
         env_pair = get_environment_pair(self.template_file)
         env_yaml = env_pair.get("eyml") if env_pair else {}
         self.parameters = {key: "" for key in self.heat.parameters}
@@ -322,8 +354,8 @@ class VnfModule(FilterBaseOutputs):
         basename, ext = os.path.splitext(heat_filename)
         volume_template_name = "{}_volume{}".format(basename, ext)
         volume_path = os.path.join(heat_dir, volume_template_name)
-        if os.path.exists(volume_path):
-            volume_mod = Heat(filepath=volume_path)
+        if template_source.exists(volume_path):
+            volume_mod = load_heat(volume_path)
             return volume_mod.outputs
         else:
             return {}
@@ -343,10 +375,32 @@ class VnfModule(FilterBaseOutputs):
         ]
         self.outputs_filtered = True
 
+    def clone(self, vnf, copies):
+        """
+        Returns a copy of the module for ``vnf`` (see ``Vnf.clone``).
+
+        :param copies: dict of id of the original to its copy
+        """
+        module = _copy_once(self, copies)
+        module.vnf = vnf
+        module.networks = [_copy_once(n, copies) for n in self.networks]
+        module.virtual_machine_types = []
+        for vm in self.virtual_machine_types:
+            vm_copy = _copy_once(vm, copies)
+            vm_copy.vnf_module = module
+            vm_copy.ports = []
+            for port in vm.ports:
+                port_copy = _copy_once(port, copies)
+                port_copy.vm = vm_copy
+                port_copy.network = _copy_once(port.network, copies)
+                vm_copy.ports.append(port_copy)
+            module.virtual_machine_types.append(vm_copy)
+        return module
+
     def _create_vm_types(self):
         servers = self.heat.get_resource_by_type("OS::Nova::Server", all_resources=True)
         vm_types = {}
-        for _, props in yield_by_count(servers):
+        for _, props in yield_by_count(servers, self.heat.get_resource_counts()):
             vm_type = get_vm_type_for_nova_server(props)
             vm = vm_types.setdefault(vm_type, VirtualMachineType(vm_type, self))
             vm.vm_count += 1
@@ -357,7 +411,7 @@ class VnfModule(FilterBaseOutputs):
 
     def _add_networks(self):
         ports = self.heat.get_resource_by_type("OS::Neutron::Port", all_resources=True)
-        for rid, props in yield_by_count(ports):
+        for rid, props in yield_by_count(ports, self.heat.get_resource_counts()):
             resource_type, port_match = NeutronPortProcessor.get_rid_match_tuple(rid)
             if resource_type != "external":
                 continue
@@ -391,11 +445,8 @@ class VnfModule(FilterBaseOutputs):
 
     @property
     def platform_provided_params(self):
-        result = set()
-        for spec in self.env_specs:
-            for props in spec["PLATFORM PROVIDED"]:
-                result.add(props["property"][-1])
-        return result
+        table = get_env_parameter_table(self.env_specs)
+        return {s["property"][-1] for s in table.rules_of_type("PLATFORM PROVIDED")}
 
     @property
     def env_template(self):
@@ -473,15 +524,17 @@ class VnfModule(FilterBaseOutputs):
         return hash(self) == hash(other)
 
 
-def yield_by_count(sequence):
+def yield_by_count(sequence, counts):
     """
-    Iterates through sequence and yields each item according to its __count__
-    attribute.  If an item has a __count__ of it will be returned 3 times
+    Iterates through sequence and yields each item according to its count
+    in ``counts``.  If an item has a count of 3 it will be returned 3 times
     before advancing to the next item in the sequence.
 
-    :param sequence: sequence of dicts (must contain __count__)
+    :param sequence: mapping of resource ID to resource
+    :param counts:   mapping of resource ID to count (see
+                     Heat.get_resource_counts). Missing IDs default to 1.
     :returns:        generator of tuple key, value pairs
     """
     for key, value in sequence.items():
-        for i in range(value["__count__"]):
+        for i in range(counts.get(key, 1)):
             yield (key, value)
@@ -0,0 +1,166 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Runs the preload generation plan of one or more preload generators.
+
+A plan is an ordered list of progress messages (strings) and ``PreloadTask``.
+Generators build their plan after the model has been prepared for output
+passing (see ``AbstractPreloadGenerator.plan``), so every task of a plan is
+independent of the others and they can be executed across a pool of forked
+worker processes.  The progress messages and the timing of every task are
+printed in the order of the plan, the same as a serial run.
+"""
+
+import multiprocessing
+import time
+
+# Tasks of the plan being executed.  Set before the workers are forked
+# so they can be referenced by index instead of being pickled.
+_TASKS = []
+
+
+def is_supported():
+    """Parallel generation relies on forking the prepared generators"""
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+class PreloadTask:
+    """
+    Creates one preload of ``module`` with ``preload`` in ``output_dir`` or,
+    if ``output_dir`` is None, the .env template of the module.  ``key``
+    identifies the file(s) written by the task.
+    """
+
+    def __init__(self, generator, module, preload, output_dir=None, message=""):
+        self.generator = generator
+        self.module = module
+        self.preload = preload
+        self.output_dir = output_dir
+        self.message = message
+
+    @property
+    def key(self):
+        if self.output_dir is None:
+            env_dir = self.preload.output_dir.joinpath("preload_env")
+            return env_dir.joinpath("{}.env".format(self.module.label))
+        return (self.output_dir, self.preload.preload_basename)
+
+    def run(self):
+        """
+        Creates the preload.
+
+        :return: seconds taken
+        """
+        start = time.perf_counter()
+        if self.output_dir is None:
+            self.generator.generate_preload_env(self.module, self.preload)
+        else:
+            self.generator.start_module()
+            self.generator.generate_module(self.module, self.preload, self.output_dir)
+        return time.perf_counter() - start
+
+
+def remove_overwritten(plan):
+    """
+    Removes the tasks whose files are written again by a later task of the
+    plan, so the outcome does not depend on the order tasks finish.  The .env
+    templates are created by every format for example, and the last one
+    wins in a serial run.
+    """
+    last = {}
+    for index, entry in enumerate(plan):
+        if isinstance(entry, PreloadTask):
+            last[entry.key] = index
+    return [
+        entry
+        for index, entry in enumerate(plan)
+        if not isinstance(entry, PreloadTask) or last[entry.key] == index
+    ]
+
+
+def _run_task(index):
+    """Runs a task of the plan (runs in a worker process)"""
+    return _TASKS[index].run()
+
+
+def _timings(tasks, workers):
+    """Yields the seconds taken by each task in the order of ``tasks``"""
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield task.run()
+        return
+    _TASKS[:] = tasks
+    try:
+        context = multiprocessing.get_context("fork")
+        workers = min(workers, len(tasks))
+        # several tasks per message, while keeping the progress flowing
+        chunksize = max(1, len(tasks) // (workers * 8))
+        with context.Pool(workers) as pool:
+            yield from pool.imap(_run_task, range(len(tasks)), chunksize)
+    finally:
+        del _TASKS[:]
+
+
+def run_plan(plan, workers=1):
+    """
+    Executes the tasks of ``plan`` and prints its progress messages and the
+    time taken by each task in order.
+
+    :param plan:    list of progress messages and PreloadTask
+    :param workers: number of worker processes (1 runs the tasks in this
+                    process)
+    :return:        number of tasks executed
+    """
+    plan = remove_overwritten(plan)
+    tasks = [entry for entry in plan if isinstance(entry, PreloadTask)]
+    timings = _timings(tasks, workers)
+    start = time.perf_counter()
+    for entry in plan:
+        if not isinstance(entry, PreloadTask):
+            print(entry)
+            continue
+        seconds = next(timings)
+        if entry.message:
+            print("{} ({:.1f} ms)".format(entry.message, seconds * 1000))
+    if tasks:
+        print(
+            "\nGenerated {} preloads and templates in {:.2f} seconds".format(
+                len(tasks), time.perf_counter() - start
+            )
+        )
+    return len(tasks)
@@ -92,7 +92,7 @@ class VnfApiPreloadGenerator(AbstractPreloadGenerator):
         filename = "{}{}.json".format(preload_data.preload_basename, incomplete)
         outfile = output_dir.joinpath(filename)
         with outfile.open("w") as f:
-            json.dump(template, f, indent=4)
+            f.write(json.dumps(template, indent=4))
 
     def _populate(
         self,
@@ -0,0 +1,522 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+A long-lived validation service (``python vvp.py serve``).
+
+Starting a validation normally pays for the interpreter start-up, importing
+OpenStack Heat and the other report dependencies, importing every test
+module, and discovering the preload plugins.  The service does this once
+and then accepts validation jobs over HTTP, either on a localhost port or on
+a Unix socket.  When a token is configured, every request must provide it in
+an ``Authorization: Bearer <token>`` header.  The service refuses to listen
+on an interface other than the loopback without a token.
+
+Jobs are executed by a pool of pre-forked worker processes.  Every worker is
+forked from the warmed-up service process and executes a single job before
+it is replaced, so no state (parsed templates, results, etc.) is shared
+between jobs.
+
+API:
+
+``GET /status``
+    Returns the version of the validation scripts and the number of workers.
+
+``POST /validate``
+    Executes a validation job and returns its result once complete.  The
+    body is a JSON object with the same inputs as ``vvp.run_pytest``.  Paths
+    must be absolute since the service runs from its own directory:
+
+    - template_dir (required): directory or ZIP file containing the templates
+    - categories: list of optional categories
+    - report_format: csv, html, excel, or json (default: html)
+    - halt_on_failure: halt when base failures are found (default: true)
+    - template_source: path or name of the template shown on the report
+    - preload_config: directory or file containing the preload data source
+    - preload_format: preload format to generate
+    - preload_source: name of the preload data source plugin
+    - output_dir: directory to write the reports to, which must be under
+      the service's output root.  Defaults to a new directory under the
+      output root
+    - include_report: if true, the contents of report.json are returned
+      as ``report``
+
+    The response contains ``success``, ``exit_code``, ``output_dir``,
+    ``reports`` (paths to the generated files), ``duration`` (seconds),
+    ``log`` (output of the run), and ``error`` (traceback if the run failed)
+"""
+
+import argparse
+import contextlib
+import glob
+import hmac
+import importlib
+import io
+import ipaddress
+import json
+import multiprocessing
+import os
+import socketserver
+import sys
+import tempfile
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import version
+from tests.utils import template_source
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8990
+
+# environment variable used as the default of --token
+TOKEN_VARIABLE = "VVP_SERVICE_TOKEN"
+
+# inputs of a validation job and their defaults
+JOB_PARAMETERS = {
+    "template_dir": None,
+    "categories": None,
+    "report_format": "html",
+    "halt_on_failure": True,
+    "template_source": None,
+    "preload_config": None,
+    "preload_format": None,
+    "preload_source": None,
+    "output_dir": None,
+}
+
+# job parameters that are paths on the host of the service
+PATH_PARAMETERS = ("template_dir", "preload_config", "output_dir")
+
+REPORT_FILES = {
+    "csv": "report.csv",
+    "html": "report.html",
+    "excel": "report.xlsx",
+    "json": "report.json",
+}
+
+
+def pytest_args(
+    template_dir,
+    categories=None,
+    report_format="html",
+    halt_on_failure=True,
+    template_source=None,
+    preload_config=None,
+    preload_format=None,
+    preload_source=None,
+    output_dir=None,
+    yaml_cache_dir=None,
+):
+    """
+    Returns the pytest arguments to validate ``template_dir``.  See
+    ``vvp.run_pytest`` for a description of the parameters.
+
+    :param output_dir:     directory to write the reports to (defaults to the
+                           output directory of the validation scripts)
+    :param yaml_cache_dir: directory of the persistent cache of parsed
+                           templates (disabled by default)
+    :return: list of command line arguments
+    """
+    from preload.engine import PLUGIN_MGR
+
+    args = [
+        "--ignore=app_tests",
+        "--capture=sys",
+        "--template-directory={}".format(template_dir),
+        "--report-format={}".format(report_format),
+    ]
+    if template_source is not None:
+        args.append("--template-source={}".format(template_source))
+    if output_dir:
+        args.append("--output-directory={}".format(output_dir))
+    if yaml_cache_dir:
+        args.append("--yaml-cache-dir={}".format(yaml_cache_dir))
+    if preload_config:
+        args.append("--preload-source={}".format(preload_config))
+        args.append(
+            "--preload-source-type={}".format(
+                PLUGIN_MGR.get_source_for_name(preload_source).get_identifier()
+            )
+        )
+    if categories:
+        for category in categories:
+            args.extend(("--category", category))
+    if not halt_on_failure:
+        args.append("--continue-on-failure")
+    if preload_format:
+        args.append("--preload-format={}".format(preload_format))
+    return args
+
+
+def make_job(request, output_root):
+    """
+    Validates the body of a validation request and fills in the defaults.
+
+    :param request:     dict decoded from the JSON request
+    :param output_root: directory where default output directories are created
+    :return: dict of job parameters accepted by ``pytest_args``
+    :raises: ValueError if the request is invalid
+    """
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object")
+    unknown = set(request) - set(JOB_PARAMETERS) - {"include_report"}
+    if unknown:
+        raise ValueError("Unknown parameters: {}".format(", ".join(sorted(unknown))))
+    job = dict(JOB_PARAMETERS)
+    job.update((k, v) for k, v in request.items() if k in JOB_PARAMETERS)
+    for name in PATH_PARAMETERS:
+        # the working directory of the service is not the client's
+        if job[name] and not os.path.isabs(job[name]):
+            raise ValueError("{} must be an absolute path".format(name))
+    template_dir = job["template_dir"]
+    if not template_dir or not (
+        os.path.isdir(template_dir) or template_source.is_archive(template_dir)
+    ):
+        raise ValueError("template_dir must be an existing directory or ZIP file")
+    job["report_format"] = (job["report_format"] or "html").lower()
+    if job["report_format"] not in REPORT_FILES:
+        raise ValueError(
+            "report_format must be one of: {}".format(", ".join(REPORT_FILES))
+        )
+    if job["categories"] is not None and not isinstance(job["categories"], list):
+        raise ValueError("categories must be a list")
+    if not job["output_dir"]:
+        os.makedirs(output_root, exist_ok=True)
+        job["output_dir"] = tempfile.mkdtemp(prefix="vvp-", dir=output_root)
+    elif not is_under(job["output_dir"], output_root):
+        raise ValueError("output_dir must be under {}".format(output_root))
+    return job
+
+
+def is_under(path, root):
+    """:return: True if ``path`` is ``root`` or inside it (links resolved)"""
+    path, root = os.path.realpath(path), os.path.realpath(root)
+    return os.path.commonpath([path, root]) == root
+
+
+def is_loopback(host):
+    """:return: True if ``host`` only accepts connections from this machine"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False  # a host name that may resolve to any interface
+
+
+def collect_reports(output_dir, report_format):
+    """
+    :return: dict of the report files (and preloads directory) that were
+             generated in ``output_dir``
+    """
+    names = {"json": "report.json", report_format: REPORT_FILES[report_format]}
+    names["failures"] = "failures"
+    names["preloads"] = "preloads"
+    return {
+        key: os.path.join(output_dir, name)
+        for key, name in names.items()
+        if os.path.exists(os.path.join(output_dir, name))
+    }
+
+
+def run_job(job, include_report=False):
+    """
+    Executes a validation job.  This runs in a worker process.
+
+    :param job:            job parameters (see ``make_job``)
+    :param include_report: if True, the report.json contents are returned
+    :return: dict describing the result (see module documentation)
+    """
+    import pytest
+
+    log = io.StringIO()
+    start = time.time()
+    exit_code, error = None, None
+    with contextlib.redirect_stderr(log), contextlib.redirect_stdout(log):
+        try:
+            exit_code = int(pytest.main(args=pytest_args(**job)))
+        except Exception:
+            error = traceback.format_exc()
+    result = {
+        "success": error is None,
+        "exit_code": exit_code,
+        "output_dir": job["output_dir"],
+        "reports": collect_reports(job["output_dir"], job["report_format"]),
+        "duration": round(time.time() - start, 3),
+        "log": log.getvalue(),
+        "error": error,
+    }
+    if include_report and "json" in result["reports"]:
+        with open(result["reports"]["json"], encoding="utf8") as f:
+            result["report"] = json.load(f)
+    return result
+
+
+def warm_up():
+    """
+    Imports everything a validation needs so the workers forked from this
+    process start warm
+    """
+    os.chdir(PATH)
+    if PATH not in sys.path:
+        sys.path.insert(0, PATH)
+    importlib.import_module("preload.engine")
+    importlib.import_module("tests.conftest")
+    # the modules the validation only imports when they are used
+    for name in importlib.import_module("tests.import_profile").DEFERRED_IMPORTS:
+        importlib.import_module(name)
+    for path in sorted(glob.glob(os.path.join(PATH, "tests", "test_*.py"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        importlib.import_module("tests.{}".format(name))
+
+
+class ValidationService:
+    """
+    Executes validation jobs in a pool of worker processes
+
+    :param workers:     number of jobs executed in parallel
+    :param output_root: directory where the output directory of each job is
+                        created when the job does not provide one
+    """
+
+    def __init__(self, workers=1, output_root=None):
+        self.workers = workers
+        # resolved now as warm_up changes the working directory
+        self.output_root = os.path.abspath(
+            output_root or os.path.join(PATH, "output", "service")
+        )
+        self.pool = None
+
+    def start(self):
+        warm_up()
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+        else:
+            context = multiprocessing.get_context("spawn")
+        # each worker executes one job and is then replaced by a fresh fork,
+        # so jobs never see each other's cached state
+        self.pool = context.Pool(self.workers, maxtasksperchild=1)
+
+    def status(self):
+        return {"version": version.VERSION, "workers": self.workers}
+
+    def validate(self, request):
+        """
+        Executes the validation requested and waits for its result
+
+        :param request: dict of job parameters (see module documentation)
+        :return: dict describing the result
+        :raises: ValueError if the request is invalid
+        """
+        job = make_job(request, self.output_root)
+        include_report = bool(request.get("include_report"))
+        return self.pool.apply(run_job, (job, include_report))
+
+    def close(self):
+        if self.pool:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """HTTP interface of the ValidationService (see module documentation)"""
+
+    server_version = "vvp/{}".format(version.VERSION)
+
+    def is_authorized(self):
+        """
+        :return: True if the request provides the token of the server (or
+                 the server has none), otherwise sends a 401 response
+        """
+        token = self.server.token
+        if not token:
+            return True
+        provided = self.headers.get("Authorization", "").encode("utf8")
+        if hmac.compare_digest(provided, "Bearer {}".format(token).encode("utf8")):
+            return True
+        self.send_json(401, {"error": "Missing or invalid token"})
+        return False
+
+    def do_GET(self):
+        if not self.is_authorized():
+            return
+        if self.path.rstrip("/") == "/status":
+            self.send_json(200, self.server.service.status())
+        else:
+            self.send_json(404, {"error": "Not found: {}".format(self.path)})
+
+    def do_POST(self):
+        if not self.is_authorized():
+            return
+        if self.path.rstrip("/") != "/validate":
+            self.send_json(404, {"error": "Not found: {}".format(self.path)})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length).decode("utf8") or "{}")
+            result = self.server.service.validate(request)
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+            return
+        except Exception:
+            self.send_json(500, {"error": traceback.format_exc()})
+            return
+        self.send_json(200, result)
+
+    def send_json(self, status, data):
+        body = json.dumps(data, indent=2).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # clients of a Unix socket do not have an address
+        return self.client_address[0] if self.client_address else "local"
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class ThreadingUnixHTTPServer(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    daemon_threads = True
+
+    def server_bind(self):
+        # create the socket private to the user so no other user can connect
+        # before its permissions could be changed
+        umask = os.umask(0o177)
+        try:
+            socketserver.UnixStreamServer.server_bind(self)
+        finally:
+            os.umask(umask)
+
+
+def make_server(
+    service, socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT, token=None
+):
+    """
+    Creates the HTTP server for ``service`` listening on the Unix socket
+    ``socket_path`` if provided, otherwise on ``host``:``port``.  If ``token``
+    is provided, requests without it are rejected.
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, RequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), RequestHandler)
+    server.service = service
+    server.token = token
+    return server
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="vvp.py serve", description="Run the VNF validations as a service"
+    )
+    parser.add_argument(
+        "--socket", help="Path of the Unix socket to listen on (instead of a port)"
+    )
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help="Interface to listen on (default: {})".format(DEFAULT_HOST),
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help="Port to listen on (default: {})".format(DEFAULT_PORT),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of validations executed in parallel (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--output-root",
+        help="Directory where the output directory of each job is created. "
+        "Jobs can't write outside of it",
+    )
+    parser.add_argument(
+        "--token",
+        default=os.environ.get(TOKEN_VARIABLE),
+        help="Token clients must provide as a Bearer token (default: the {} "
+        "environment variable).  Required to listen on an interface other "
+        "than the loopback".format(TOKEN_VARIABLE),
+    )
+    args = parser.parse_args(argv)
+    if not args.socket and not args.token and not is_loopback(args.host):
+        parser.error("--token is required to listen on {}".format(args.host))
+    return args
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.socket:
+        args.socket = os.path.abspath(args.socket)
+    service = ValidationService(args.workers, args.output_root)
+    service.start()
+    server = make_server(service, args.socket, args.host, args.port, args.token)
+    address = args.socket or "{}:{}".format(args.host, args.port)
+    print(
+        "vvp {} validation service listening on {} with {} workers".format(
+            version.VERSION, address, args.workers
+        )
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
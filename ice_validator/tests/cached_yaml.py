@@ -35,26 +35,411 @@
 #
 # ============LICENSE_END============================================
 
+import hashlib
+import hmac
+import io
 import os
+import secrets
+import pickle  # nosec
+import tempfile
 
 import yaml
 
+from tests.utils import template_source
+
+try:
+    from yaml import CSafeLoader
+except ImportError:  # PyYAML was built without libyaml
+    CSafeLoader = None
+
 YAML_CACHE = {}
 resolver = yaml.resolver
 YAMLError = yaml.YAMLError
 constructor = yaml.constructor
 
+# Available parser backends, fastest first
+LOADERS = {"libyaml": CSafeLoader, "python": yaml.SafeLoader}
+
+# Files in the persistent cache are named <sha256>.pickle.  Bump the
+# format whenever the structure of the pickled data changes.
+CACHE_SUFFIX = ".pickle"
+CACHE_FORMAT = "3"
+
+# Entries start with an HMAC-SHA256 of the pickle signed with a per-user key
+# kept outside of the cache directory, so entries written by anyone else are
+# never unpickled.
+KEY_FILE = "yaml_cache.key"
+KEY_SIZE = 32  # bytes
+DIGEST_SIZE = hashlib.sha256().digest_size
+DEFAULT_MAX_CACHE_SIZE = 256 * 1024 * 1024  # bytes
+
+# Directory of the persistent parse cache.  ``None`` disables the
+# persistent cache and only the in-memory ``YAML_CACHE`` is used.
+_cache_dir = None
+_max_cache_size = DEFAULT_MAX_CACHE_SIZE
+_cache_size = None  # bytes currently used, computed lazily
+_key = None  # key signing the cache entries, see signing_key
+_backend = None  # name of the parser backend, see select_loader
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("{} is read-only".format(type(self).__name__))
+
+
+class FrozenDict(dict):
+    """
+    A read-only dict.  Parsed templates are shared by every test, so any
+    attempt to modify them raises a TypeError.  Use ``copy`` or ``thaw`` to
+    get a mutable copy.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = _read_only
+
+    def copy(self):
+        """Returns a shallow, mutable copy"""
+        return dict(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+class FrozenList(list):
+    """
+    A read-only list.  See FrozenDict.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = reverse = sort = clear = _read_only
+
+    def copy(self):
+        """Returns a shallow, mutable copy"""
+        return list(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return FrozenList, (list(self),)
+
+
+def freeze(data):
+    """Returns a read-only version of the data structure (dicts and lists)"""
+    if isinstance(data, (FrozenDict, FrozenList)):
+        return data
+    elif isinstance(data, dict):
+        return FrozenDict((k, freeze(v)) for k, v in data.items())
+    elif isinstance(data, list):
+        return FrozenList(freeze(v) for v in data)
+    return data
+
+
+def thaw(data):
+    """Returns a fully mutable deep copy of a (possibly frozen) data structure"""
+    if isinstance(data, dict):
+        return {k: thaw(v) for k, v in data.items()}
+    elif isinstance(data, list):
+        return [thaw(v) for v in data]
+    return data
+
+
+# Ensure frozen structures are dumped as plain mappings and sequences
+for _dumper in (yaml.Dumper, yaml.SafeDumper):
+    _dumper.add_representer(FrozenDict, yaml.SafeDumper.represent_dict)
+    _dumper.add_representer(FrozenList, yaml.SafeDumper.represent_list)
+
 
 def add_constructor(tag, constructor):
     yaml.add_constructor(tag, constructor)
 
 
+def available_backends():
+    """Returns the names of the parser backends usable in this environment"""
+    return [name for name, loader in LOADERS.items() if loader]
+
+
+def select_loader(backend=None):
+    """
+    Selects the loader used to parse templates.  If ``backend`` is not
+    provided, then the libyaml based ``CSafeLoader`` is used when PyYAML was
+    built with libyaml, otherwise the pure-Python ``SafeLoader`` is used.
+
+    :param backend: optional name of the backend (libyaml or python)
+    :return: name of the backend selected
+    :raises: ValueError if the requested backend is unknown or not available
+    """
+    global _backend
+    if backend is None:
+        backend = available_backends()[0]
+    elif backend not in available_backends():
+        raise ValueError(
+            "YAML backend {} is not available. Available backends: {}".format(
+                backend, ", ".join(available_backends())
+            )
+        )
+    _backend = backend
+    return backend
+
+
+def backend_name():
+    """Returns the name of the parser backend in use (libyaml or python)"""
+    return _backend
+
+
+def parse(stream, backend=None):
+    """
+    Parses YAML using the selected backend.  This has the same semantics as
+    ``yaml.safe_load``, but is significantly faster when libyaml is available.
+
+    :param stream: string or file-like object
+    :param backend: optional backend to use instead of the selected backend
+    :return: parsed data structure
+    """
+    loader = LOADERS[backend or _backend]
+    return yaml.load(stream, Loader=loader)  # nosec
+
+
+def default_key_path():
+    """Returns the per-user file holding the key that signs cache entries"""
+    import appdirs
+
+    return os.path.join(appdirs.user_config_dir("vvp", "onap"), KEY_FILE)
+
+
+def signing_key(path=None):
+    """
+    Returns the key that signs the persistent cache entries, creating it
+    (readable by the user only) the first time.
+
+    :param path: file holding the key (defaults to ``default_key_path``)
+    """
+    path = path or default_key_path()
+    try:
+        with open(path, "rb") as f:
+            key = f.read()
+        if len(key) >= KEY_SIZE:
+            return key
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    key = secrets.token_bytes(KEY_SIZE)
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    os.replace(tmp_path, path)
+    return key
+
+
+def configure(cache_dir=None, enabled=True, max_size=DEFAULT_MAX_CACHE_SIZE, key=None):
+    """
+    Configures the persistent, content-addressed parse cache.  Nothing is
+    stored between runs unless a ``cache_dir`` is given.
+
+    :param cache_dir:   directory to store parsed templates in
+    :param enabled:     if False, then only the in-memory cache is used
+    :param max_size:    maximum size (in bytes) of the cache directory.  The
+                        least recently used entries are evicted beyond this size
+    :param key:         key signing the entries (defaults to ``signing_key()``)
+    """
+    global _cache_dir, _max_cache_size, _cache_size, _key
+    _max_cache_size = max_size
+    _cache_size = None
+    if not enabled or not cache_dir:
+        _cache_dir = None
+        return
+    try:
+        _key = key or signing_key()
+        os.makedirs(cache_dir, exist_ok=True)
+        _cache_dir = cache_dir
+    except OSError as e:
+        print("WARNING: Unable to create YAML cache {}: {}".format(cache_dir, e))
+        _cache_dir = None
+
+
+def cache_dir():
+    """Returns the active persistent cache directory or None if disabled"""
+    return _cache_dir
+
+
+def cache_key(contents):
+    """
+    Returns the key for the persistent cache.  Keys are based on the
+    file contents, PyYAML version, parser backend, and cache format so the
+    same file is never parsed twice, regardless of where it is located.
+
+    :param contents: text of the YAML file
+    :return: hex digest
+    """
+    sha = hashlib.sha256(yaml.__version__.encode("utf8"))
+    sha.update(b"\0")
+    sha.update(_backend.encode("utf8"))
+    sha.update(b"\0")
+    sha.update(CACHE_FORMAT.encode("utf8"))
+    sha.update(b"\0")
+    sha.update(contents.encode("utf8"))
+    return sha.hexdigest()
+
+
+def sign(payload, key=None):
+    """
+    Returns ``payload`` prefixed with its HMAC-SHA256 so it can be stored in
+    the cache directory.
+
+    :param payload: bytes to sign
+    :param key:     signing key (defaults to the key of the cache)
+    """
+    return hmac.new(key or _key, payload, hashlib.sha256).digest() + payload
+
+
+def verify(entry, key=None):
+    """
+    Returns the payload of an ``entry`` created by ``sign``, or None if it was
+    not signed with ``key`` (defaults to the key of the cache)
+    """
+    digest, payload = entry[:DIGEST_SIZE], entry[DIGEST_SIZE:]
+    expected = hmac.new(key or _key, payload, hashlib.sha256).digest()
+    return payload if hmac.compare_digest(digest, expected) else None
+
+
+def _read_cache(key):
+    path = os.path.join(_cache_dir, key + CACHE_SUFFIX)
+    try:
+        with open(path, "rb") as f:
+            entry = f.read()
+    except OSError:
+        return False, None
+    payload = verify(entry)
+    if payload is None:
+        return False, None  # not written by this user - just re-parse
+    try:
+        data = pickle.loads(payload)  # nosec - signed by this user
+    except Exception:  # incompatible entry - just re-parse
+        return False, None
+    try:
+        os.utime(path)  # mark as recently used for LRU eviction
+    except OSError:
+        pass
+    return True, data
+
+
+def _write_cache(key, data):
+    global _cache_size
+    path = os.path.join(_cache_dir, key + CACHE_SUFFIX)
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=_cache_dir, suffix=".tmp")
+        # write to a temporary file first so concurrent runs never see
+        # a partially written entry
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        with os.fdopen(fd, "wb") as f:
+            f.write(sign(payload))
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+    except Exception as e:
+        print("WARNING: Unable to write YAML cache entry {}: {}".format(path, e))
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    if _cache_size is None:
+        evict()
+    else:
+        _cache_size += size
+        if _cache_size > _max_cache_size:
+            evict()
+
+
+def evict(max_size=None):
+    """
+    Removes the least recently used entries from the persistent cache
+    until the cache is no larger than ``max_size`` bytes.
+
+    :param max_size: defaults to the size passed to ``configure``
+    """
+    global _cache_size
+    if not _cache_dir:
+        return
+    max_size = _max_cache_size if max_size is None else max_size
+    entries = []
+    for entry in os.scandir(_cache_dir):
+        if entry.is_file() and entry.name.endswith(CACHE_SUFFIX):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+    _cache_size = total
+
+
+def clear():
+    """Clears the in-memory cache and all entries of the persistent cache"""
+    YAML_CACHE.clear()
+    if _cache_dir:
+        evict(max_size=0)
+
+
+def _named_stream(contents, fp):
+    """Stream of the contents read from ``fp``, so parse errors name the file"""
+    stream = io.StringIO(contents)
+    stream.name = getattr(fp, "name", "<file>")
+    return stream
+
+
+def _load_cached(fp):
+    if not _cache_dir:
+        return freeze(parse(fp))
+    contents = fp.read()
+    key = cache_key(contents)
+    found, data = _read_cache(key)
+    if not found:
+        data = freeze(parse(_named_stream(contents, fp)))
+        _write_cache(key, data)
+    return data
+
+
 def load(fp):
-    """Provides cached loading of yaml files"""
+    """
+    Provides cached loading of yaml files.  The same read-only structure
+    (see FrozenDict and FrozenList) is returned to every caller.
+    """
     abs_path = os.path.abspath(fp.name)
     if abs_path not in YAML_CACHE:
-        YAML_CACHE[abs_path] = yaml.safe_load(fp)
+        YAML_CACHE[abs_path] = _load_cached(fp)
     return YAML_CACHE[abs_path]
 
 
 safe_load = load
+
+
+def load_path(path):
+    """
+    Same as ``load``, but takes the path of the file, which may also be the
+    virtual path of a member of an archive (see template_source).  The file
+    is not opened at all when it was already loaded.
+    """
+    abs_path = os.path.abspath(path)
+    if abs_path not in YAML_CACHE:
+        with template_source.open_file(path) as fp:
+            YAML_CACHE[abs_path] = _load_cached(fp)
+    return YAML_CACHE[abs_path]
+
+
+select_loader()
@@ -0,0 +1,145 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Digests of the files of a template directory, computed once per session.
+
+``digest_directory`` computes the SHA-256 of every file under a directory
+(reading the files in chunks, with a thread pool for large directories)
+and the aggregate checksum shown on the reports.  The aggregate is the MD5
+of the sorted list of relative paths and file digests, so it only depends
+on the contents of the directory, and is the same for a directory and for
+a ZIP archive of it.  The digests are cached until ``clear`` is called, so
+the report writers and the run manifest share them.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.utils import template_source
+
+CHUNK_SIZE = 1024 * 1024
+
+# Directories with at least this many files are hashed by a thread pool
+PARALLEL_THRESHOLD = 16
+
+MAX_THREADS = min(8, os.cpu_count() or 1)
+
+# Digests computed so far (absolute path -> SHA-256 hex or None)
+FILE_DIGESTS = {}
+
+# Directories digested so far (absolute path -> DirectoryDigest)
+DIRECTORY_DIGESTS = {}
+
+
+def clear():
+    """Forgets every digest computed so far"""
+    FILE_DIGESTS.clear()
+    DIRECTORY_DIGESTS.clear()
+
+
+def _hash_file(path):
+    sha = hashlib.sha256()
+    try:
+        with template_source.open_file(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                sha.update(chunk)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+    return sha.hexdigest()
+
+
+def file_digest(path):
+    """
+    :return: SHA-256 of the contents of the file at ``path`` (hex) or None if
+             the file does not exist
+    """
+    abs_path = os.path.abspath(path)
+    if abs_path not in FILE_DIGESTS:
+        FILE_DIGESTS[abs_path] = _hash_file(abs_path)
+    return FILE_DIGESTS[abs_path]
+
+
+class DirectoryDigest:
+    """
+    Digests of the files under a directory.
+
+    :param path:  absolute path to the directory
+    :param files: dict of path relative to ``path`` (using ``/``) -> SHA-256
+    """
+
+    def __init__(self, path, files):
+        self.path = path
+        self.files = dict(sorted(files.items()))
+
+    @property
+    def checksum(self):
+        """:return: MD5 aggregate of the file digests (hex)"""
+        md5 = hashlib.md5()  # nosec
+        for name, digest in self.files.items():
+            md5.update("{}\0{}\n".format(name, digest).encode("utf8"))
+        return md5.hexdigest()
+
+
+def list_files(path):
+    """:return: sorted absolute paths of every file under ``path``"""
+    return sorted(
+        os.path.join(dir_path, filename)
+        for dir_path, _, filenames in template_source.walk(path)
+        for filename in filenames
+    )
+
+
+def digest_directory(path):
+    """
+    :param path: directory (or ZIP archive) containing files
+    :return: DirectoryDigest of ``path``, computed on the first call only
+    """
+    abs_path = os.path.abspath(path)
+    if abs_path not in DIRECTORY_DIGESTS:
+        paths = list_files(abs_path)
+        missing = [p for p in paths if p not in FILE_DIGESTS]
+        if len(missing) >= PARALLEL_THRESHOLD and MAX_THREADS > 1:
+            with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
+                FILE_DIGESTS.update(zip(missing, executor.map(_hash_file, missing)))
+        files = {
+            os.path.relpath(p, abs_path).replace(os.sep, "/"): file_digest(p)
+            for p in paths
+        }
+        DIRECTORY_DIGESTS[abs_path] = DirectoryDigest(abs_path, files)
+    return DIRECTORY_DIGESTS[abs_path]
@@ -37,29 +37,48 @@
 
 import csv
 import datetime
-import hashlib
-import io
-import json
 import os
 import re
 import time
 
-from preload.engine import PLUGIN_MGR, create_preloads
+from preload.engine import create_preloads
+from tests import (
+    cached_yaml,
+    checksums,
+    helpers,
+    import_profile,
+    parallel,
+    requirements_store,
+    structures,
+)
+from tests.heat_validation import DEFAULT_HEAT_TIMEOUT, HEAT_POOL
 from tests.helpers import get_output_dir
+from tests.utils import (
+    env_parameters,
+    nested_files,
+    template_index,
+    template_source,
+    template_visitor,
+)
+from tests.incremental import MANIFEST, MANIFEST_FILENAME, make_fingerprint
+from tests.report_html import (
+    get_renderer,
+    get_report_template,
+    render_requirements,
+)
+from tests.report_stream import ReportStream, StreamedDict, dump_json
 
 try:
     from html import escape
 except ImportError:
     from cgi import escape
 from collections import defaultdict
+from itertools import chain
 
 import traceback
 
-import docutils.core
-import jinja2
 import pytest
 from more_itertools import partition
-import xlsxwriter
 from six import string_types
 
 # noinspection PyUnresolvedReferences
@@ -95,8 +114,8 @@ executed. Please refer these issue to the VNF Validation Tool team.
 
 COLLECTION_FAILURES = []
 
-# Captures the results of every test run
-ALL_RESULTS = []
+# Streams the results of every test run to the report writers
+RESULTS = ReportStream()
 
 
 def extract_error_msg(rep):
@@ -133,9 +152,9 @@ class TestResult:
 
     RESULT_MAPPING = {"passed": "PASS", "failed": "FAIL", "skipped": "SKIP"}
 
-    def __init__(self, item, outcome):
+    def __init__(self, item, result):
         self.item = item
-        self.result = outcome.get_result()
+        self.result = result
         self.files = self._get_files()
         self.error_message = self._get_error_message()
 
@@ -248,6 +267,17 @@ class TestResult:
             )
         return data
 
+    def _get_param(self, name):
+        """
+        :return: Value of the parametrized argument ``name``.  Read from the
+                 collected parameters so it is also available when the test
+                 was executed in another process.
+        """
+        callspec = getattr(self.item, "callspec", None)
+        if callspec is not None and name in callspec.params:
+            return callspec.params[name]
+        return self.item.funcargs[name]
+
     def _get_files(self):
         """
         Extracts the list of files passed into the test case.
@@ -256,17 +286,17 @@ class TestResult:
         if "environment_pair" in self.item.fixturenames:
             return [
                 "{} environment pair".format(
-                    self.item.funcargs["environment_pair"]["name"]
+                    self._get_param("environment_pair")["name"]
                 )
             ]
         elif "heat_volume_pair" in self.item.fixturenames:
             return [
-                "{} volume pair".format(self.item.funcargs["heat_volume_pair"]["name"])
+                "{} volume pair".format(self._get_param("heat_volume_pair")["name"])
             ]
         elif "heat_templates" in self.item.fixturenames:
-            return [os.path.basename(f) for f in self.item.funcargs["heat_templates"]]
+            return [os.path.basename(f) for f in self._get_param("heat_templates")]
         elif "yaml_files" in self.item.fixturenames:
-            return [os.path.basename(f) for f in self.item.funcargs["yaml_files"]]
+            return [os.path.basename(f) for f in self._get_param("yaml_files")]
         else:
             parts = self.result.nodeid.split("[")
             return [""] if len(parts) == 1 else [os.path.basename(parts[1][:-1])]
@@ -285,13 +315,21 @@ class TestResult:
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """
-    Captures the test results for later reporting.  This will also halt testing
-    if a base failure is encountered (can be overridden with continue-on-failure)
+    Captures the test results for later reporting.
     """
     outcome = yield
-    if outcome.get_result().when != "call":
+    record_report(item, outcome.get_result())
+
+
+def record_report(item, report):
+    """
+    Captures the result of a test case for later reporting.  This will also
+    halt testing if a base failure is encountered (can be overridden with
+    continue-on-failure)
+    """
+    if report.when != "call":
         return  # only capture results of test cases themselves
-    result = TestResult(item, outcome)
+    result = TestResult(item, report)
     if (
         not item.config.option.continue_on_failure
         and result.is_base_test
@@ -301,10 +339,94 @@ def pytest_runtest_makereport(item, call):
             result.error_message
         )
         result.error_message = msg
-        ALL_RESULTS.append(result)
+        stream_result(result)
         pytest.exit("{}\n{}\n{}".format(msg, result.files, result.test_case))
 
-    ALL_RESULTS.append(result)
+    stream_result(result)
+
+
+def stream_result(result):
+    """
+    Appends the result of a test case to the report spools (see
+    report_stream.py)
+    """
+    if not RESULTS.enabled:
+        return
+    reqs = load_current_requirements()
+    RESULTS.add_test(
+        {
+            "files": relative_paths(RESULTS.template_path, result.files),
+            "test_module": result.test_module,
+            "test_case": result.test_case,
+            "result": result.outcome,
+            "error": result.error_message if result.is_failed else "",
+            "requirements": result.requirements_metadata(reqs),
+        }
+    )
+    if result.is_failed:
+        RESULTS.add_failure(
+            {
+                "files": result.files,
+                "test_id": result.test_id,
+                "test_case": result.test_case,
+                "test_module": result.test_module,
+                "requirement_ids": result.requirement_ids,
+                "requirement_text": result.requirement_text(reqs),
+                "error_message": result.error_message,
+                "raw_output": result.raw_output,
+            }
+        )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """
+    Replays the reports of the previous run instead of executing the test
+    when its inputs have not changed (see ``--incremental``)
+    """
+    if not MANIFEST.is_reused(item):
+        return None
+    parallel.log_reports(item, MANIFEST.previous_reports(item), record_report)
+    return True
+
+
+def pytest_runtest_logreport(report):
+    MANIFEST.add_report(report)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    """
+    Distributes the test cases across worker processes when ``--workers`` is
+    greater than 1.  Base tests are always executed first in this process so
+    a base failure can still halt the run before any other test executes.
+    """
+    workers = parallel.worker_count(session.config.getoption("workers"))
+    if workers <= 1 or session.config.option.collectonly or not session.items:
+        return None  # use the default serial loop
+    if not parallel.is_supported():
+        print("WARNING: --workers is not supported on this platform")
+        return None
+
+    if session.testsfailed and not session.config.option.continue_on_collection_errors:
+        raise session.Interrupted("%d errors during collection" % session.testsfailed)
+
+    other_items, base_items = partition(
+        lambda i: "base" in {m.name for m in i.iter_markers()}, session.items
+    )
+    other_items, base_items = list(other_items), list(base_items)
+    for i, item in enumerate(base_items):
+        nextitem = base_items[i + 1] if i + 1 < len(base_items) else None
+        item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+        if session.shouldfail or session.shouldstop:
+            return True
+    reused = {
+        i: MANIFEST.previous_reports(item)
+        for i, item in enumerate(other_items)
+        if MANIFEST.is_reused(item)
+    }
+    parallel.run_items(other_items, workers, record_report, reused)
+    return True
 
 
 def make_timestamp():
@@ -318,8 +440,29 @@ def make_timestamp():
 
 # noinspection PyUnusedLocal
 def pytest_sessionstart(session):
-    ALL_RESULTS.clear()
+    global RESULTS
+    RESULTS.close()
+    RESULTS = ReportStream(get_template_source(session.config))
     COLLECTION_FAILURES.clear()
+    clear_template_caches()
+
+
+def clear_template_caches():
+    """
+    Clears the state cached for the templates of the previous session, so
+    one process can validate several template directories (see batch.py).
+    Caches keyed by contents rather than by path are kept.
+    """
+    cached_yaml.YAML_CACHE.clear()
+    structures.HEAT_CACHE.clear()
+    structures.NESTED_GRAPHS.clear()
+    template_index.TEMPLATE_INDEXES.clear()
+    helpers._find_environment_file_for.cache_clear()
+    nested_files.get_list_of_nested_files.cache_clear()
+    env_parameters.TEMPLATE_PARAMETERS.clear()
+    env_parameters.ENVIRONMENT_PARAMETERS.clear()
+    template_visitor.VISITS.clear()
+    checksums.clear()
 
 
 # noinspection PyUnusedLocal
@@ -327,21 +470,72 @@ def pytest_sessionfinish(session, exitstatus):
     """
     If not a self-test run, generate the output reports
     """
+    HEAT_POOL.close()
     if not session.config.option.template_dir:
         return
+    if not session.config.option.collectonly:
+        MANIFEST.save(session.items)
 
-    if session.config.option.template_source:
-        template_source = session.config.option.template_source[0]
-    else:
-        template_source = os.path.abspath(session.config.option.template_dir[0])
+    profile = None
+    if session.config.option.import_profile:
+        profile = profile_imports(session, get_output_dir(session.config))
 
     categories_selected = session.config.option.test_categories or ""
     generate_report(
         get_output_dir(session.config),
-        template_source,
+        get_template_source(session.config),
         categories_selected,
         session.config.option.report_format,
+        profile,
+    )
+    RESULTS.close()
+
+
+def profile_imports(session, outpath):
+    """
+    Profiles the start-up imports of the validator (see import_profile) and
+    writes the profile to the output directory.
+
+    :return: summary of the profile for the JSON report, or None if the
+             profile could not be created
+    """
+    modules = ["tests.conftest"]
+    modules.extend(
+        sorted({i.module.__name__ for i in session.items if getattr(i, "module", None)})
+    )
+    try:
+        text = import_profile.profile_imports(modules)
+    except Exception as e:
+        print("WARNING: Unable to profile imports: {}".format(e))
+        return None
+    import_profile.write_profile(outpath, text)
+    profile = import_profile.summarize(import_profile.parse(text))
+    print(
+        "\nStart-up imports: {:.0f} ms ({} modules), see {}".format(
+            profile["total_us"] / 1000,
+            len(profile["modules"]),
+            os.path.join(outpath, import_profile.PROFILE_FILE),
+        )
     )
+    if profile["deferred_imported"]:
+        print(
+            "WARNING: Imported at start-up: {}".format(
+                ", ".join(profile["deferred_imported"])
+            )
+        )
+    return profile
+
+
+def get_template_source(config):
+    """
+    :return: path of the templates validated as shown on the reports, or
+             None when running the self-tests
+    """
+    if not config.option.template_dir:
+        return None
+    if config.option.template_source:
+        return config.option.template_source[0]
+    return os.path.abspath(config.option.template_dir[0])
 
 
 def pytest_terminal_summary(terminalreporter, exitstatus):
@@ -392,6 +586,26 @@ def pytest_collection_modifyitems(session, config, items):
     )
 
 
+def pytest_collection_finish(session):
+    """
+    Determines which tests can reuse the results of the previous run (see
+    ``--incremental``) and submits the templates of the other tests to the
+    Heat worker pool (if enabled) so they are validated while the other
+    tests execute
+    """
+    if session.config.option.collectonly:
+        return
+    if MANIFEST.reuse:
+        reused = MANIFEST.plan(session.items)
+        print(
+            "Reusing the results of {} of {} tests from the previous run".format(
+                reused, len(session.items)
+            )
+        )
+    if HEAT_POOL.enabled:
+        HEAT_POOL.submit_items(i for i in session.items if not MANIFEST.is_reused(i))
+
+
 def make_href(paths, base_dir=None):
     """
     Create an anchor tag to link to the file paths provided.
@@ -415,7 +629,9 @@ def make_href(paths, base_dir=None):
     return "<br/>".join(links)
 
 
-def generate_report(outpath, template_path, categories, output_format="html"):
+def generate_report(
+    outpath, template_path, categories, output_format="html", profile=None
+):
     """
     Generates the various output reports.
 
@@ -423,12 +639,14 @@ def generate_report(outpath, template_path, categories, output_format="html"):
     :param template_path: directory containing the Heat templates validated
     :param categories: Optional categories selected
     :param output_format: One of "html", "excel", or "csv". Default is "html"
+    :param profile: Optional profile of the start-up imports to include in
+                    the JSON report
     :raises: ValueError if requested output format is unknown
     """
-    failures = [r for r in ALL_RESULTS if r.is_failed]
+    failures = RESULTS.failures
     generate_failure_file(outpath)
     output_format = output_format.lower().strip() if output_format else "html"
-    generate_json(outpath, template_path, categories)
+    generate_json(outpath, template_path, categories, profile)
     if output_format == "html":
         generate_html_report(outpath, categories, template_path, failures)
     elif output_format == "excel":
@@ -445,11 +663,12 @@ def write_json(data, path):
     """
     Pretty print data as JSON to the output path requested
 
-    :param data: Data structure to be converted to JSON
+    :param data: Data structure to be converted to JSON (see
+                 report_stream.dump_json)
     :param path: Where to write output
     """
     with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+        dump_json(data, f)
 
 
 def generate_failure_file(outpath):
@@ -459,17 +678,20 @@ def generate_failure_file(outpath):
     more comprehensive output.
     """
     failure_path = os.path.join(outpath, "failures")
-    failures = [r for r in ALL_RESULTS if r.is_failed]
-    data = {}
-    for i, fail in enumerate(failures):
-        data[str(i)] = {
-            "file": fail.files[0] if len(fail.files) == 1 else fail.files,
-            "vnfrqts": fail.requirement_ids,
-            "test": fail.test_case,
-            "test_file": fail.test_module,
-            "raw_output": fail.raw_output,
-            "message": fail.error_message,
-        }
+    data = StreamedDict(
+        (
+            str(i),
+            {
+                "file": fail["files"][0] if len(fail["files"]) == 1 else fail["files"],
+                "vnfrqts": fail["requirement_ids"],
+                "test": fail["test_case"],
+                "test_file": fail["test_module"],
+                "raw_output": fail["raw_output"],
+                "message": fail["error_message"],
+            },
+        )
+        for i, fail in enumerate(RESULTS.failures)
+    )
     write_json(data, failure_path)
 
 
@@ -505,30 +727,29 @@ def generate_csv_report(output_dir, categories, template_path, failures):
     # table header
     rows.append([col for col, _ in REPORT_COLUMNS])
 
-    reqs = load_current_requirements()
-
-    # table content
-    for i, failure in enumerate(failures, start=1):
-        rows.append(
-            [
-                i,
-                "\n".join(failure.files),
-                failure.requirement_text(reqs),
-                failure.error_message,
-                failure.test_id,
-            ]
-        )
-
     output_path = os.path.join(output_dir, "report.csv")
     with open(output_path, "w", newline="") as f:
         writer = csv.writer(f)
-        for row in rows:
-            writer.writerow(row)
+        writer.writerows(rows)
+        # table content, streamed from the spool
+        for i, failure in enumerate(failures, start=1):
+            writer.writerow(
+                [
+                    i,
+                    "\n".join(failure["files"]),
+                    failure["requirement_text"],
+                    failure["error_message"],
+                    failure["test_id"],
+                ]
+            )
 
 
 def generate_excel_report(output_dir, categories, template_path, failures):
+    import xlsxwriter
+
     output_path = os.path.join(output_dir, "report.xlsx")
-    workbook = xlsxwriter.Workbook(output_path)
+    # rows are written in order and flushed as they are completed
+    workbook = xlsxwriter.Workbook(output_path, {"constant_memory": True})
     bold = workbook.add_format({"bold": True, "align": "top"})
     code = workbook.add_format(
         {"font_name": "Courier", "text_wrap": True, "align": "top"}
@@ -571,18 +792,16 @@ def generate_excel_report(output_dir, categories, template_path, failures):
     for col_num, (col_name, _) in enumerate(REPORT_COLUMNS):
         worksheet.write(start_error_table_row + 1, col_num, col_name, bold)
 
-    reqs = load_current_requirements()
-
     # table content
     for col, width in enumerate((20, 30, 60, 60, 40)):
         worksheet.set_column(col, col, width)
     err_num = 1
     for row, failure in enumerate(failures, start=start_error_table_row + 2):
         worksheet.write(row, 0, str(err_num), normal)
-        worksheet.write(row, 1, "\n".join(failure.files), normal)
-        worksheet.write(row, 2, failure.requirement_text(reqs), normal)
-        worksheet.write(row, 3, failure.error_message.replace("\n", "\n\n"), normal)
-        worksheet.write(row, 4, failure.test_id, normal)
+        worksheet.write(row, 1, "\n".join(failure["files"]), normal)
+        worksheet.write(row, 2, failure["requirement_text"], normal)
+        worksheet.write(row, 3, failure["error_message"].replace("\n", "\n\n"), normal)
+        worksheet.write(row, 4, failure["test_id"], normal)
         err_num += 1
     worksheet.autofilter(
         start_error_table_row + 1,
@@ -631,7 +850,7 @@ def aggregate_results(outcomes, r_id=None):
         return "ERROR"
 
 
-def aggregate_run_results(collection_failures, test_results):
+def aggregate_run_results(collection_failures, failures):
     """
     Determines overall status of run based on all failures and results.
 
@@ -640,12 +859,12 @@ def aggregate_run_results(collection_failures, test_results):
     * 'PASS' - All tests executed properly and no failures were detected
 
     :param collection_failures: failures occuring during test setup
-    :param test_results: list of all test executuion results
+    :param failures: failed test executions
     :return: one of 'ERROR', 'FAIL', or 'PASS'
     """
     if collection_failures:
         return "ERROR"
-    elif any(r.is_failed for r in test_results):
+    elif len(failures):
         return "FAIL"
     else:
         return "PASS"
@@ -656,7 +875,7 @@ def relative_paths(base_dir, paths):
 
 
 # noinspection PyTypeChecker
-def generate_json(outpath, template_path, categories):
+def generate_json(outpath, template_path, categories, profile=None):
     """
     Creates a JSON summary of the entire test run.
     """
@@ -669,49 +888,31 @@ def generate_json(outpath, template_path, categories):
         "timestamp": make_iso_timestamp(),
         "checksum": hash_directory(template_path),
         "categories": categories,
-        "outcome": aggregate_run_results(COLLECTION_FAILURES, ALL_RESULTS),
+        "outcome": aggregate_run_results(COLLECTION_FAILURES, RESULTS.failures),
         "tests": [],
         "requirements": [],
     }
+    if profile:
+        data["import_profile"] = profile
+
+    collection_failures = [
+        {
+            "files": [],
+            "test_module": result["module"],
+            "test_case": result["test"],
+            "result": "ERROR",
+            "error": result["error"],
+            "requirements": result["requirements"],
+        }
+        for result in COLLECTION_FAILURES
+    ]
+    # the results of the tests are streamed from the spool when written
+    data["tests"] = chain(collection_failures, RESULTS.tests)
 
-    results = data["tests"]
-    for result in COLLECTION_FAILURES:
-        results.append(
-            {
-                "files": [],
-                "test_module": result["module"],
-                "test_case": result["test"],
-                "result": "ERROR",
-                "error": result["error"],
-                "requirements": result["requirements"],
-            }
-        )
-    for result in ALL_RESULTS:
-        results.append(
-            {
-                "files": relative_paths(template_path, result.files),
-                "test_module": result.test_module,
-                "test_case": result.test_case,
-                "result": result.outcome,
-                "error": result.error_message if result.is_failed else "",
-                "requirements": result.requirements_metadata(reqs),
-            }
-        )
-
-    # Build a mapping of requirement ID to the results
-    r_id_results = defaultdict(lambda: {"errors": set(), "outcomes": set()})
-    for test_result in results:
-        test_reqs = test_result["requirements"]
-        r_ids = (
-            [r["id"] if isinstance(r, dict) else r for r in test_reqs]
-            if test_reqs
-            else ("",)
-        )
-        for r_id in r_ids:
-            item = r_id_results[r_id]
-            item["outcomes"].add(test_result["result"])
-            if test_result["error"]:
-                item["errors"].add(test_result["error"])
+    # Mapping of requirement ID to the results, rolled up as the tests ran
+    for test_result in collection_failures:
+        RESULTS.roll_up(test_result)
+    r_id_results = RESULTS.requirement_results
 
     requirements = data["requirements"]
     for r_id, r_data in reqs.items():
@@ -739,39 +940,65 @@ def generate_json(outpath, template_path, categories):
     write_json(data, report_path)
 
 
+class HtmlFailure:
+    """Failure as shown on the HTML report"""
+
+    def __init__(self, failure, template_path):
+        self.failure = failure
+        self.template_path = template_path
+
+    @property
+    def file_links(self):
+        return make_href(self.failure["files"], self.template_path)
+
+    @property
+    def test_id(self):
+        return self.failure["test_id"]
+
+    @property
+    def error_message(self):
+        return escape(self.failure["error_message"]).replace("\n", "<br/><br/>")
+
+    @property
+    def raw_output(self):
+        return escape(self.failure["raw_output"])
+
+    @property
+    def requirements(self):
+        return render_requirements(self.failure["requirement_text"])
+
+
+class HtmlFailures:
+    """
+    Failures of the HTML report, read from the spool every time the template
+    iterates over them
+    """
+
+    def __init__(self, failures, template_path):
+        self.failures = failures
+        self.template_path = template_path
+
+    def __iter__(self):
+        return (HtmlFailure(f, self.template_path) for f in self.failures)
+
+    def __len__(self):
+        return len(self.failures)
+
+
 def generate_html_report(outpath, categories, template_path, failures):
-    reqs = load_current_requirements()
-    fail_data = []
-    for failure in failures:
-        fail_data.append(
-            {
-                "file_links": make_href(failure.files, template_path),
-                "test_id": failure.test_id,
-                "error_message": escape(failure.error_message).replace(
-                    "\n", "<br/><br/>"
-                ),
-                "raw_output": escape(failure.raw_output),
-                "requirements": docutils.core.publish_parts(
-                    writer_name="html", source=failure.requirement_text(reqs)
-                )["body"],
-            }
-        )
-    pkg_dir = os.path.split(__file__)[0]
-    j2_template_path = os.path.join(pkg_dir, "report.html.jinja2")
-    with open(j2_template_path, "r") as f:
-        report_template = jinja2.Template(f.read())
-        contents = report_template.render(
-            version=version.VERSION,
-            num_failures=len(failures) + len(COLLECTION_FAILURES),
-            categories=categories,
-            template_dir=make_href(template_path),
-            checksum=hash_directory(template_path),
-            timestamp=make_timestamp(),
-            failures=fail_data,
-            collection_failures=COLLECTION_FAILURES,
-        )
+    contents = get_report_template().generate(
+        version=version.VERSION,
+        num_failures=len(failures) + len(COLLECTION_FAILURES),
+        categories=categories,
+        template_dir=make_href(template_path),
+        checksum=hash_directory(template_path),
+        timestamp=make_timestamp(),
+        failures=HtmlFailures(failures, template_path),
+        collection_failures=COLLECTION_FAILURES,
+    )
     with open(os.path.join(outpath, "report.html"), "w") as f:
-        f.write(contents)
+        f.writelines(contents)
+    get_renderer().save()
 
 
 def pytest_addoption(parser):
@@ -832,10 +1059,12 @@ def pytest_addoption(parser):
         "--preload-format",
         dest="preload_formats",
         action="append",
+        # the formats are not listed, as discovering the preload plugins
+        # here would happen before --yaml-cache-dir is known
         help=(
             "Preload format to create (multiple allowed). If not provided "
-            "then all available formats will be created: {}"
-        ).format(", ".join(g.format_name() for g in PLUGIN_MGR.preload_generators)),
+            "then all available formats will be created"
+        ),
     )
 
     parser.addoption(
@@ -843,9 +1072,7 @@ def pytest_addoption(parser):
         dest="preload_source_type",
         action="store",
         default="envfiles",
-        help=(
-            "Preload source type to create (multiple allowed): {}"
-        ).format(", ".join(s.get_identifier() for s in PLUGIN_MGR.preload_sources)),
+        help="Preload source type to create (multiple allowed)",
     )
 
     parser.addoption(
@@ -855,6 +1082,100 @@ def pytest_addoption(parser):
         help="File or directory containing the source dat for the preloads",
     )
 
+    parser.addoption(
+        "--preload-workers",
+        dest="preload_workers",
+        action="store",
+        type=int,
+        default=1,
+        help=(
+            "Number of processes used to create the preloads of every module, "
+            "environment and format (0 uses one per CPU)"
+        ),
+    )
+
+    parser.addoption(
+        "--workers",
+        dest="workers",
+        action="store",
+        type=int,
+        default=1,
+        help=(
+            "Number of processes used to execute the tests (0 uses one per CPU). "
+            "Tests validating the same file always run in the same process."
+        ),
+    )
+
+    parser.addoption(
+        "--heat-workers",
+        dest="heat_workers",
+        action="store",
+        type=int,
+        default=0,
+        help=(
+            "Number of processes used to validate templates with OpenStack Heat "
+            "while the other tests execute (0 validates in the test process)"
+        ),
+    )
+
+    parser.addoption(
+        "--heat-timeout",
+        dest="heat_timeout",
+        action="store",
+        type=int,
+        default=DEFAULT_HEAT_TIMEOUT,
+        help="Seconds to wait for OpenStack Heat to validate a single template",
+    )
+
+    parser.addoption(
+        "--incremental",
+        dest="incremental",
+        action="store_true",
+        help=(
+            "Only execute the tests whose input files changed since the previous "
+            "--incremental run with the same output directory, and reuse the "
+            "results of the other tests"
+        ),
+    )
+
+    parser.addoption(
+        "--archive-mmap",
+        dest="archive_mmap",
+        action="store_true",
+        help=(
+            "Memory map the archive when --template-directory is a zip file "
+            "instead of reading it through a regular file handle"
+        ),
+    )
+
+    parser.addoption(
+        "--yaml-cache-dir",
+        dest="yaml_cache_dir",
+        action="store",
+        default=None,
+        help=(
+            "Directory to store parsed YAML files and other caches between runs. "
+            "Nothing is stored between runs unless it is provided"
+        ),
+    )
+
+    parser.addoption(
+        "--no-yaml-cache",
+        dest="no_yaml_cache",
+        action="store_true",
+        help="Do not reuse or store parsed YAML files between runs",
+    )
+
+    parser.addoption(
+        "--import-profile",
+        dest="import_profile",
+        action="store_true",
+        help=(
+            "Profile the imports of the validator at start-up (python -X "
+            "importtime) and include the profile in the reports"
+        ),
+    )
+
 
 def pytest_configure(config):
     """
@@ -870,6 +1191,62 @@ def pytest_configure(config):
     ):
         raise Exception('One of "--template-directory" or'
                         ' "--self-test" must be specified')
+    cached_yaml.configure(
+        cache_dir=config.getoption("yaml_cache_dir"),
+        enabled=not config.getoption("no_yaml_cache"),
+    )
+    heat_workers = config.getoption("heat_workers")
+    if heat_workers and config.getoption("workers") != 1:
+        print("WARNING: --heat-workers is ignored when --workers is used")
+        heat_workers = 0
+    HEAT_POOL.configure(heat_workers, config.getoption("heat_timeout"))
+    configure_template_sources(config)
+    configure_manifest(config)
+
+
+def configure_template_sources(config):
+    """
+    Opens the template directories given as zip archives, so their members
+    are validated in place (see tests/utils/template_source.py)
+    """
+    template_source.close_archives()
+    template_source.configure(use_mmap=config.getoption("archive_mmap"))
+    for template_dir in config.getoption("template_dir") or []:
+        if template_source.is_archive(template_dir):
+            template_source.open_archive(template_dir)
+
+
+def configure_manifest(config):
+    """
+    With ``--incremental``, records the inputs and results of every test in
+    the output directory so the next ``--incremental`` run can reuse them
+    """
+    template_dirs = config.getoption("template_dir")
+    if not config.getoption("incremental") or not template_dirs:
+        if config.getoption("incremental"):
+            print("WARNING: --incremental is ignored when --self-test is used")
+        MANIFEST.configure(None, None, [])
+        return
+    fingerprint = make_fingerprint(
+        version.VERSION,
+        sorted(os.path.abspath(d) for d in template_dirs),
+        sorted(config.getoption("test_categories") or []),
+        config.getoption("continue_on_failure"),
+    )
+    MANIFEST.configure(
+        os.path.join(get_output_dir(config), MANIFEST_FILENAME),
+        fingerprint,
+        template_dirs,
+        reuse=True,
+    )
+
+
+# noinspection PyUnusedLocal
+def pytest_report_header(config, startdir):
+    """Reports the YAML parser backend and parse cache in use"""
+    return "yaml parser: {}, yaml cache: {}".format(
+        cached_yaml.backend_name(), cached_yaml.cache_dir() or "disabled"
+    )
 
 
 def pytest_generate_tests(metafunc):
@@ -986,25 +1363,22 @@ def pytest_generate_tests(metafunc):
 
 def hash_directory(path):
     """
-    Create md5 hash using the contents of all files under ``path``
+    Checksum of the contents of all files under ``path``.  Computed once per
+    session (see checksums.py).
+
     :param path: string directory containing files
     :return: string MD5 hash code (hex)
     """
-    md5 = hashlib.md5()  # nosec
-    for dir_path, sub_dirs, filenames in os.walk(path):
-        for filename in filenames:
-            file_path = os.path.join(dir_path, filename)
-            with open(file_path, "rb") as f:
-                md5.update(f.read())
-    return md5.hexdigest()
+    return checksums.digest_directory(path).checksum
 
 
 def load_current_requirements():
-    """Loads dict of current requirements or empty dict if file doesn't exist"""
-    with io.open(HEAT_REQUIREMENTS_FILE, encoding="utf8", mode="r") as f:
-        data = json.load(f)
-        version = data["current_version"]
-        return data["versions"][version]["needs"]
+    """
+    Loads dict of current requirements from the process-wide requirements
+    store (see requirements_store.py).  The result is shared and must not be
+    modified.
+    """
+    return requirements_store.get_store(HEAT_REQUIREMENTS_FILE).needs
 
 
 def select_heat_requirements(reqs):
@@ -1091,7 +1465,8 @@ def pytest_report_collectionfinish(config, startdir, items):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     reqs = load_current_requirements()
-    requirements = select_heat_requirements(reqs)
+    # the requirements are updated below, so work on a copy
+    requirements = {k: dict(v) for k, v in select_heat_requirements(reqs).items()}
     testable_requirements = is_testable(requirements)
     unmapped, mapped = partition(
         lambda i: hasattr(i.function, "requirement_ids"), items
@@ -1104,7 +1479,7 @@ def pytest_report_collectionfinish(config, startdir, items):
             if req_id not in req_to_test:
                 req_to_test[req_id].add(item)
                 if req_id in requirements:
-                    reqs[req_id].update(
+                    requirements[req_id].update(
                         {
                             "test_case": item.function.__module__,
                             "validated_by": item.function.__name__,
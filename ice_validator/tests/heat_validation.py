@@ -0,0 +1,354 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Validates Heat templates with the OpenStack Heat engine.
+
+Templates can be validated in the test process (``HOTValidator``) or by a
+pool of worker processes (``HEAT_POOL``) that each create the Heat engine
+once.  When the pool is enabled, the templates are submitted at collection
+time so their validation overlaps with the execution of the other tests.
+
+Importing Heat takes longer than most validation runs, so it is only imported
+when a template is validated.
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+
+import mock
+
+from tests import cached_yaml as yaml
+from tests.utils import template_source
+from tests.utils.nested_files import get_list_of_nested_files
+
+DEFAULT_HEAT_TIMEOUT = 120
+
+# Seconds between checks of the jobs started by the workers of the pool
+POLL_INTERVAL = 0.1
+
+
+def load_file(filename, file_cache):
+    basename = os.path.basename(filename)
+    if basename not in file_cache:
+        with template_source.open_file(filename, "r") as fh:
+            file_cache[basename] = fh.read()
+
+    return file_cache[basename]
+
+
+def generate_parameters(yml_data):
+    parameters = yml_data.get("parameters", {})
+    dummy_params = {}
+
+    for p, v in parameters.items():
+        param_type = v.get("type", "")
+        if param_type == "comma_delimited_list":
+            param = "1,2,3"
+        elif param_type == "string":
+            param = "123"
+        elif param_type == "json":
+            param = {"abc": "123"}
+        elif param_type == "number":
+            param = 123
+        elif param_type == "boolean":
+            param = True
+        else:
+            param = "123"
+        dummy_params[p] = param
+
+    return {"parameters": dummy_params}
+
+
+def create_job(yaml_file, yml_data):
+    """
+    :param yaml_file: path to the template
+    :param yml_data:  parsed contents of the template
+    :return: tuple of (template text, nested files, generated parameters)
+    """
+    files = {}
+    dirname = os.path.dirname(yaml_file)
+    for file in set(get_list_of_nested_files(yaml_file, dirname)):
+        load_file(file, files)
+    return load_file(yaml_file, files), files, generate_parameters(yml_data)
+
+
+class HOTValidator:
+    """
+    Validates templates with a Heat engine that does not require an OpenStack
+    deployment.  Creating the engine is expensive so a single instance should
+    be shared by every validation in the process.
+    """
+
+    def __init__(self):
+        from heat.engine import resources
+        from heat.engine import service
+        from heat.tests import utils
+
+        resources.initialise()
+        self.ctx = utils.dummy_context()
+        self.engine = service.EngineService("a", "t")
+
+    def validate(self, template, files, parameters):
+        """
+        :param template:    text of the template to validate
+        :param files:       mapping of file name to contents of nested files
+        :param parameters:  parameters to pass to the template
+        :return: error reported by Heat or None if the template is valid
+        """
+        from heat.common import template_format
+
+        t = template_format.parse(template)
+
+        # Services are never available without a deployment
+        with mock.patch(
+            "heat.engine.resource.Resource.is_service_available",
+            return_value=(True, None),
+        ):
+            try:
+                res = dict(
+                    self.engine.validate_template(
+                        self.ctx, t, files=files, params=parameters, show_nested=False
+                    )
+                )
+            except Exception as e:
+                res = {"Error": e.__context__}
+
+        return res.get("Error")
+
+    def validate_file(self, yaml_file, yml_data):
+        """
+        :param yaml_file: path to the template
+        :param yml_data:  parsed contents of the template
+        :return: error reported by Heat or None if the template is valid
+        """
+        return self.validate(*create_job(yaml_file, yml_data))
+
+
+# Validator shared by the process (see get_validator)
+_VALIDATOR = None
+
+
+def get_validator():
+    """
+    Returns the HOTValidator shared by every validation in the process,
+    including later test sessions executed by the same process
+    """
+    global _VALIDATOR
+    if _VALIDATOR is None:
+        _VALIDATOR = HOTValidator()
+    return _VALIDATOR
+
+
+# Queue the workers of the pool report the start of each job to
+_STARTED = None
+
+
+def _init_worker(started):
+    global _STARTED
+    _STARTED = started
+    get_validator()
+
+
+def _validate_job(yaml_file, job):
+    """Validates the job in a worker process"""
+    _STARTED.put((yaml_file, time.monotonic()))
+    return _run_job(job)
+
+
+def _run_job(job):
+    """
+    Validates the job.  The error is returned as text since Heat exceptions
+    can't always be transferred between processes.
+    """
+    error = get_validator().validate(*job)
+    if error is None:
+        return None
+    return str(error) or type(error).__name__
+
+
+class HeatValidationPool:
+    """
+    Validates templates in a pool of worker processes.  A job that does not
+    finish within the timeout of starting is reported as an error, and the
+    pool is replaced so the worker stuck on that job can't delay the
+    remaining jobs.
+    """
+
+    def __init__(self):
+        self.workers = 0
+        self.timeout = DEFAULT_HEAT_TIMEOUT
+        self._pool = None
+        self._started = None
+        self._jobs = {}
+        self._results = {}
+        self._start_times = {}
+        self._timed_out = set()
+
+    @property
+    def enabled(self):
+        return self.workers > 0
+
+    def configure(self, workers, timeout=DEFAULT_HEAT_TIMEOUT):
+        """
+        :param workers: number of worker processes (0 disables the pool)
+        :param timeout: seconds a single template may take once its validation
+                        has started
+        """
+        self.close()
+        self.workers = workers
+        self.timeout = timeout
+
+    def _start(self):
+        if self._pool is None:
+            self._started = multiprocessing.Queue()
+            self._pool = multiprocessing.Pool(
+                self.workers, initializer=_init_worker, initargs=(self._started,)
+            )
+        return self._pool
+
+    def _apply(self, yaml_file, job):
+        self._results[yaml_file] = self._start().apply_async(
+            _validate_job, (yaml_file, job)
+        )
+
+    def submit(self, yaml_file, yml_data):
+        """Queues the template for validation if it was not already queued"""
+        if yaml_file not in self._results:
+            job = create_job(yaml_file, yml_data)
+            self._jobs[yaml_file] = job
+            self._apply(yaml_file, job)
+
+    def submit_items(self, items):
+        """
+        Queues the templates of every test item that uses the ``heat_validator``
+        fixture and will not be skipped.
+        """
+        for item in items:
+            params = getattr(getattr(item, "callspec", None), "params", {})
+            if (
+                "heat_validator" not in item.fixturenames
+                or "yaml_file" not in params
+                or item.get_closest_marker("skip")
+            ):
+                continue
+            try:
+                yml = yaml.load_path(params["yaml_file"])
+            except Exception:  # nosec
+                continue  # reported by the test itself
+            if isinstance(yml, dict) and "resources" in yml:
+                self.submit(params["yaml_file"], yml)
+
+    def validate_file(self, yaml_file, yml_data):
+        """
+        :param yaml_file: path to the template
+        :param yml_data:  parsed contents of the template
+        :return: error reported by Heat or None if the template is valid
+        """
+        self.submit(yaml_file, yml_data)
+        try:
+            while yaml_file not in self._timed_out:
+                result = self._results[yaml_file]
+                if result.ready():
+                    return result.get()
+                self._check_timeouts()
+                started = self._start_times.get(yaml_file)
+                wait = POLL_INTERVAL
+                if started is not None:
+                    remaining = started + self.timeout - time.monotonic()
+                    wait = max(0, min(wait, remaining))
+                result.wait(wait)
+            return "Heat validation did not complete within {} seconds".format(
+                self.timeout
+            )
+        finally:
+            self._jobs.pop(yaml_file, None)
+            self._results.pop(yaml_file, None)
+            self._start_times.pop(yaml_file, None)
+            self._timed_out.discard(yaml_file)
+
+    def _check_timeouts(self):
+        """
+        Records the start of the jobs reported by the workers, and replaces
+        the pool if a job has been running for longer than the timeout
+        """
+        while True:
+            try:
+                yaml_file, started = self._started.get_nowait()
+            except queue.Empty:
+                break
+            self._start_times[yaml_file] = started
+        now = time.monotonic()
+        expired = [
+            yaml_file
+            for yaml_file, started in self._start_times.items()
+            if now - started >= self.timeout
+            and yaml_file in self._results
+            and not self._results[yaml_file].ready()
+        ]
+        if expired:
+            self._timed_out.update(expired)
+            self._restart()
+
+    def _restart(self):
+        """
+        Replaces the pool and resubmits the jobs that were neither completed
+        nor timed out
+        """
+        self._pool.terminate()
+        self._pool.join()
+        self._pool = None
+        self._start_times.clear()
+        for yaml_file, job in self._jobs.items():
+            if yaml_file in self._timed_out or self._results[yaml_file].ready():
+                continue
+            self._apply(yaml_file, job)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._jobs.clear()
+        self._results.clear()
+        self._start_times.clear()
+        self._timed_out.clear()
+
+
+HEAT_POOL = HeatValidationPool()
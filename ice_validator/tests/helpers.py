@@ -44,10 +44,12 @@ import os
 import re
 import zipfile
 from collections import defaultdict
+from functools import lru_cache
 from typing import Set
 
 from boltons import funcutils
 from tests import cached_yaml as yaml
+from tests.utils import template_source
 
 __path__ = [os.path.dirname(os.path.abspath(__file__))]
 DEFAULT_OUTPUT_DIR = "{}/../output".format(__path__[0])
@@ -99,17 +101,14 @@ def get_parsed_yml_for_yaml_files(yaml_files, sections=None):
     parsed_yml_list = []
     for yaml_file in yaml_files:
         try:
-            with open(yaml_file) as fh:
-                yml = yaml.load(fh)
+            yml = load_yaml(yaml_file)
         except yaml.YAMLError as e:
             # pylint: disable=superfluous-parens
             print("Error in %s: %s" % (yaml_file, e))
             continue
         if yml:
             if sections:
-                for k in yml.keys():
-                    if k not in sections:
-                        del yml[k]
+                yml = {k: v for k, v in yml.items() if k in sections}
             parsed_yml_list.append(yml)
     return parsed_yml_list
 
@@ -164,11 +163,9 @@ def get_environment_pair(heat_template):
     base_dir, filename = os.path.split(heat_template)
     basename = os.path.splitext(filename)[0]
     env_template = os.path.join(base_dir, "{}.env".format(basename))
-    if os.path.exists(env_template):
-        with open(heat_template, "r") as fh:
-            yyml = yaml.load(fh)
-        with open(env_template, "r") as fh:
-            eyml = yaml.load(fh)
+    if template_source.exists(env_template):
+        yyml = load_yaml(heat_template)
+        eyml = load_yaml(env_template)
 
         environment_pair = {"name": basename, "yyml": yyml, "eyml": eyml}
         return environment_pair
@@ -178,41 +175,37 @@ def get_environment_pair(heat_template):
 
 def find_environment_file(yaml_files):
     """
-    Pass file and recursively step backwards until environment file is found
+    Pass file and step backwards through the templates that nest it until an
+    environment file is found.  Results for a single file are cached for the
+    session and returned read-only.
 
     :param yaml_files: list or string, start at size 1 and grows recursively
     :return: corresponding environment file for a file, or None
     """
-    # sanitize
     if isinstance(yaml_files, str):
-        yaml_files = [yaml_files]
+        return _find_environment_file_for(yaml_files)
+    return _find_environment_file(yaml_files)
 
-    yaml_file = yaml_files[-1]
-    filepath, filename = os.path.split(yaml_file)
 
+@lru_cache(maxsize=None)
+def _find_environment_file_for(yaml_file):
+    return yaml.freeze(_find_environment_file([yaml_file]))
+
+
+def _find_environment_file(yaml_files):
+    # imported here as the index is built with these helpers
+    from tests.utils.template_index import get_template_index
+
+    yaml_file = yaml_files[-1]
     environment_pair = get_environment_pair(yaml_file)
     if environment_pair:
         return environment_pair
 
-    for file in os.listdir(filepath):
-        fq_name = "{}/{}".format(filepath, file)
-        if fq_name.endswith("yaml") or fq_name.endswith("yml"):
-            if fq_name not in yaml_files:
-                with open(fq_name) as f:
-                    yml = yaml.load(f)
-                resources = yml.get("resources", {})
-                for resource_id, resource in resources.items():
-                    resource_type = resource.get("type", "")
-                    if resource_type == "OS::Heat::ResourceGroup":
-                        resource_type = (
-                            resource.get("properties", {})
-                            .get("resource_def", {})
-                            .get("type", "")
-                        )
-                    # found called nested file
-                    if resource_type == filename:
-                        yaml_files.append(fq_name)
-                        environment_pair = find_environment_file(yaml_files)
+    index = get_template_index(os.path.dirname(yaml_file))
+    for parent in index.parents.get(yaml_file, []):
+        if parent not in yaml_files:
+            yaml_files.append(parent)
+            environment_pair = _find_environment_file(yaml_files)
 
     return environment_pair
 
@@ -222,11 +215,10 @@ def load_yaml(yaml_file):
     Load the YAML file at the given path.  If the file has previously been
     loaded, then a cached version will be returned.
 
-    :param yaml_file: path to the YAML file
+    :param yaml_file: path to the YAML file (or member of an archive)
     :return: data structure loaded from the YAML file
     """
-    with open(yaml_file) as fh:
-        return yaml.load(fh)
+    return yaml.load_path(yaml_file)
 
 
 def traverse(data, search_key, func, path=None):
@@ -309,17 +301,10 @@ def get_base_template_from_yaml_files(yaml_files):
 
 
 def get_base_template_from_yaml_file(yaml_file):
-    (dirname, filename) = os.path.split(yaml_file)
-    files = os.listdir(dirname)
-    for file in files:
-        basename, __ = os.path.splitext(os.path.basename(file))
-        if (
-            (__ == ".yaml" or __ == ".yml")
-            and RE_BASE.search(basename)
-            and basename.find("volume") == -1
-        ):
-            return os.path.join(dirname, "{}{}".format(basename, __))
-    return None
+    # imported here as the index is built with these helpers
+    from tests.utils.template_index import get_template_index
+
+    return get_template_index(os.path.dirname(yaml_file)).base_module
 
 
 def parameter_type_to_heat_type(parameter):
@@ -0,0 +1,140 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Start-up time of the validator.
+
+Modules that take long to import and are only needed by some runs are
+imported by the code paths that use them (``DEFERRED_IMPORTS``).  With
+``--import-profile`` the modules imported at start-up are profiled with
+``python -X importtime`` in a fresh interpreter, and the profile is written to
+the output directory and the JSON report so regressions are visible.
+"""
+
+import os
+import subprocess  # nosec
+import sys
+from collections import namedtuple
+
+# Imported by the code that uses them instead of at start-up.  Long running
+# processes import them up front (see service.warm_up)
+DEFERRED_IMPORTS = (
+    "docutils.core",
+    "heat.common.template_format",
+    "heat.engine.resources",
+    "heat.engine.service",
+    "heat.tests.utils",
+    "jinja2",
+    "xlsxwriter",
+)
+
+PROFILE_FILE = "import_profile.txt"
+PROFILE_TIMEOUT = 300
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ImportTime = namedtuple("ImportTime", "module self_us cumulative_us depth")
+
+
+def parse(text):
+    """
+    Parses the output of ``python -X importtime``
+
+    :param text: text written to stderr by the interpreter
+    :return: list of ImportTime in the order they were written
+    """
+    records = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        records.append(
+            ImportTime(module, int(fields[0]), int(fields[1]), max(depth, 0))
+        )
+    return records
+
+
+def profile_imports(modules):
+    """
+    Imports the modules in a fresh interpreter with ``-X importtime``.
+    ``pytest`` is imported first, so its plugins are not attributed to the
+    validator's modules.
+
+    :param modules: names of the modules to import
+    :return: text of the profile in the format of ``-X importtime``
+    :raises RuntimeError: if the modules could not be imported
+    """
+    code = "\n".join("import {}".format(m) for m in ["pytest"] + list(modules))
+    process = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        timeout=PROFILE_TIMEOUT,
+    )
+    if process.returncode:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+    return "".join(
+        line + "\n"
+        for line in process.stderr.splitlines()
+        if line.startswith("import time:")
+    )
+
+
+def summarize(records):
+    """
+    :param records: ImportTime records of the profile
+    :return: data of the profile as included in the JSON report
+    """
+    return {
+        "total_us": sum(r.cumulative_us for r in records if r.depth == 0),
+        "deferred_imported": sorted(
+            {r.module for r in records} & set(DEFERRED_IMPORTS)
+        ),
+        "modules": [r._asdict() for r in records],
+    }
+
+
+def write_profile(outpath, text):
+    """Writes the profile to ``PROFILE_FILE`` in the output directory"""
+    with open(os.path.join(outpath, PROFILE_FILE), "w") as f:
+        f.write(text)
@@ -0,0 +1,438 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Run manifest used to re-validate only the tests affected by a change.
+
+Every run using ``--incremental`` records, for each test case, the files it
+reads (with a hash of their contents) and the reports pytest produced for it.
+The next ``--incremental`` run replays the reports of a test whose inputs are
+unchanged instead of executing the test again, so the generated reports are
+identical to those of a full run.
+
+The files a test reads are derived from its parametrized arguments.  A
+template is considered together with its environment file (or, when it has
+none, the templates nesting it and their environment files), its volume
+module, the templates it nests at any depth, all non-template files of the
+directory, the list of files in the directory, and which templates nest it.
+Tests that are not parametrized with files depend on the whole template
+directory.
+"""
+
+import hashlib
+import json
+import os
+
+from _pytest.runner import TestReport
+
+from tests.checksums import digest_directory, file_digest, list_files
+from tests.utils import template_source
+from tests.utils.template_index import get_template_index, is_yaml_filename
+
+MANIFEST_FILENAME = "run_manifest.json"
+
+# Bump whenever the structure of the manifest changes
+MANIFEST_FORMAT = "2"
+
+# Appended to a path in the manifest to record the templates nesting it
+NESTING_SUFFIX = "#nesting"
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def hash_listing(dirname):
+    """
+    :return: SHA-256 of the sorted names of the files in ``dirname`` (hex)
+    """
+    sha = hashlib.sha256()
+    for name in sorted(template_source.listdir(dirname)):
+        sha.update(name.encode("utf8"))
+        sha.update(b"\0")
+    return sha.hexdigest()
+
+
+def hash_validation_code():
+    """
+    :return: SHA-256 of the source of the validation tests (hex), so a change
+             to the tests themselves invalidates all recorded results
+    """
+    sha = hashlib.sha256()
+    for dir_path, sub_dirs, filenames in os.walk(TESTS_DIR):
+        sub_dirs[:] = sorted(
+            d for d in sub_dirs if d not in ("fixtures", "__pycache__")
+        )
+        for filename in sorted(filenames):
+            if filename.endswith(".py"):
+                path = os.path.join(dir_path, filename)
+                sha.update(os.path.relpath(path, TESTS_DIR).encode("utf8"))
+                sha.update(b"\0")
+                sha.update(file_digest(path).encode("utf8"))
+    return sha.hexdigest()
+
+
+def _template_for(index, path):
+    """:return: the template paired with ``path`` (itself if a template)"""
+    if is_yaml_filename(path):
+        return path
+    base = os.path.splitext(path)[0]
+    return next(
+        (f for f in (base + ".yaml", base + ".yml") if f in index.yaml_files), None
+    )
+
+
+def _environment_chain(index, yaml_path):
+    """
+    Returns ``yaml_path`` and the templates nesting it that are visited
+    (like ``find_environment_file`` does) to find its environment file.
+    """
+    chain = [yaml_path]
+    for current in chain:
+        if current not in index.env_pairs:
+            chain.extend(p for p in index.parents.get(current, []) if p not in chain)
+    return chain
+
+
+def related_files(path):
+    """
+    Returns the files that must be unchanged for the results of a test of the
+    template (or environment file) ``path`` to remain valid: the template
+    and its environment file (or those of the templates nesting it when it
+    has none), its volume module, the templates it nests, and the
+    non-template files of the directory.
+
+    :param path: path to a file in a template directory
+    :return: set of paths including ``path``
+    """
+    dirname = os.path.dirname(path)
+    index = get_template_index(dirname)
+    related = {path}
+    yaml_path = _template_for(index, path)
+    if yaml_path:
+        base = os.path.splitext(yaml_path)[0]
+        if base.endswith("_volume"):
+            volume_pair = base[: -len("_volume")]
+        else:
+            volume_pair = base + "_volume"
+        templates = _environment_chain(index, yaml_path)
+        templates.extend(
+            f
+            for f in (volume_pair + ".yaml", volume_pair + ".yml")
+            if f in index.yaml_files
+        )
+        related.update(templates)
+        related.update(index.env_pairs[f] for f in templates if f in index.env_pairs)
+        pending = [yaml_path]
+        while pending:
+            for child in index.children.get(pending.pop(), []):
+                if child not in related:
+                    related.add(child)
+                    pending.append(child)
+    related.update(
+        f
+        for f in list_files(dirname)
+        if not is_yaml_filename(f) and not f.endswith(".env")
+    )
+    return related
+
+
+def hash_nesting(path):
+    """
+    :return: SHA-256 (hex) of the templates nesting ``path`` and the other
+             templates of its environment chain, so a test is re-run when a
+             template starts or stops nesting it
+    """
+    index = get_template_index(os.path.dirname(path))
+    yaml_path = _template_for(index, path)
+    chain = _environment_chain(index, yaml_path) if yaml_path else []
+    sha = hashlib.sha256()
+    for current in chain:
+        for name in [current] + index.parents.get(current, []):
+            sha.update(name.encode("utf8"))
+            sha.update(b"\0")
+        sha.update(b"\n")
+    return sha.hexdigest()
+
+
+class RunManifest:
+    """
+    Records the inputs and reports of every test case in a run, and decides
+    which test cases can reuse the reports of the previous run.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.fingerprint = None
+        self.template_dirs = []
+        self.reuse = False
+        self.previous = {}
+        self.reports = {}
+        self.reused = set()
+        self._listings = {}
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def configure(self, path, fingerprint, template_dirs, reuse=False):
+        """
+        :param path:          path to the manifest file, None disables recording
+        :param fingerprint:   identifies everything besides the input files that
+                              determines the outcome of the tests (validation
+                              code, options, etc.)
+        :param template_dirs: directories being validated
+        :param reuse:         if True, reports of the previous run are reused
+        """
+        self.__init__()
+        self.path = path
+        self.fingerprint = fingerprint
+        self.template_dirs = [os.path.abspath(d) for d in template_dirs]
+        self.reuse = reuse
+        if reuse and path:
+            self.previous = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print("WARNING: Unable to read run manifest {}: {}".format(self.path, e))
+            return {}
+        if (
+            data.get("format") != MANIFEST_FORMAT
+            or data.get("fingerprint") != self.fingerprint
+        ):
+            return {}
+        return data.get("tests", {})
+
+    def _hash(self, path):
+        return file_digest(path)
+
+    def _listing(self, dirname):
+        if dirname not in self._listings:
+            self._listings[dirname] = hash_listing(dirname)
+        return self._listings[dirname]
+
+    def inputs(self, item):
+        """
+        Returns the files read by the test case.
+
+        :param item: collected test item
+        :return: dict of path -> SHA-256 of its contents.  Directories are
+                 mapped to the hash of their file listing, and the path of
+                 each file argument followed by ``NESTING_SUFFIX`` to the hash
+                 of the templates nesting it
+        """
+        params = getattr(getattr(item, "callspec", None), "params", None)
+        paths = set()
+        dirs = set()
+        nesting = {}
+        values = list(params.values()) if params else [None]
+        for value in values:
+            for v in value if isinstance(value, (list, tuple)) else [value]:
+                if isinstance(v, str) and template_source.isfile(v):
+                    paths.update(related_files(os.path.abspath(v)))
+                    dirs.add(os.path.dirname(os.path.abspath(v)))
+                    nesting[os.path.abspath(v)] = hash_nesting(os.path.abspath(v))
+                elif isinstance(v, str) and template_source.isdir(v):
+                    paths.update(list_files(os.path.abspath(v)))
+                    dirs.add(os.path.abspath(v))
+                elif v is not None and not isinstance(v, (bool, int, float)):
+                    # parsed content or an unknown argument, so assume the
+                    # test depends on everything
+                    for template_dir in self.template_dirs:
+                        paths.update(list_files(template_dir))
+                        dirs.add(template_dir)
+        if not params:
+            for template_dir in self.template_dirs:
+                paths.update(list_files(template_dir))
+                dirs.add(template_dir)
+        inputs = {path: self._hash(path) for path in paths}
+        inputs.update((d + os.sep, self._listing(d)) for d in dirs)
+        inputs.update((p + NESTING_SUFFIX, h) for p, h in nesting.items())
+        return inputs
+
+    def plan(self, items):
+        """
+        Determines which items can reuse the reports of the previous run.
+
+        :param items: collected test items
+        :return: number of items that will reuse their previous reports
+        """
+        self.reused = set()
+        if not self.reuse:
+            return 0
+        for template_dir in self.template_dirs:
+            # hashes every file of the directory at once (see checksums.py)
+            digest_directory(template_dir)
+        for item in items:
+            entry = self.previous.get(item.nodeid)
+            if entry and entry["inputs"] == self.inputs(item):
+                self.reused.add(item.nodeid)
+        return len(self.reused)
+
+    def is_reused(self, item):
+        return item.nodeid in self.reused
+
+    def previous_reports(self, item):
+        """:return: reports recorded for ``item`` by the previous run"""
+        return [_load_report(r) for r in self.previous[item.nodeid]["reports"]]
+
+    def add_report(self, report):
+        """Records a report logged during this run"""
+        if self.enabled:
+            self.reports.setdefault(report.nodeid, []).append(report)
+
+    def save(self, items):
+        """
+        Writes the manifest for the items that were executed (or reused) in
+        this run.
+        """
+        if not self.enabled:
+            return
+        tests = {}
+        for item in items:
+            reports = self.reports.get(item.nodeid)
+            if not reports:
+                continue  # not executed (ex: halted on a base failure)
+            tests[item.nodeid] = {
+                "outcome": _outcome(reports),
+                "inputs": self.inputs(item),
+                "reports": [_dump_report(r) for r in reports],
+            }
+        data = {
+            "format": MANIFEST_FORMAT,
+            "fingerprint": self.fingerprint,
+            "tests": tests,
+        }
+        try:
+            with open(self.path, "w") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+        except OSError as e:
+            print("WARNING: Unable to write run manifest {}: {}".format(self.path, e))
+
+
+def _outcome(reports):
+    for report in reports:
+        if report.outcome != "passed":
+            return report.outcome
+    return "passed"
+
+
+class _ReplayedFailure(str):
+    """
+    Text of a failure recorded by a previous run, with the message of the
+    exception that caused it (as ``reprcrash.message``)
+    """
+
+    def __new__(cls, text, message):
+        failure = super().__new__(cls, text)
+        failure.reprcrash = _ReplayedCrash(message)
+        return failure
+
+
+class _ReplayedCrash:
+    def __init__(self, message):
+        self.message = message
+
+
+def _dump_report(report):
+    """:return: the fields of ``report`` as JSON compatible values"""
+    longrepr = report.longrepr
+    message = None
+    if isinstance(longrepr, tuple):
+        longrepr = list(longrepr)  # skip location and reason
+    elif longrepr is not None:
+        crash = getattr(longrepr, "reprcrash", None)
+        message = str(crash.message) if crash is not None else None
+        longrepr = str(longrepr)
+    data = {
+        "nodeid": report.nodeid,
+        "location": list(report.location),
+        "keywords": {k: 1 for k in report.keywords},
+        "outcome": report.outcome,
+        "when": report.when,
+        "longrepr": longrepr,
+        "message": message,
+        "sections": [list(s) for s in report.sections],
+        "duration": report.duration,
+        "user_properties": [
+            [k, str(v)] for k, v in getattr(report, "user_properties", ())
+        ],
+    }
+    if hasattr(report, "wasxfail"):
+        data["wasxfail"] = report.wasxfail
+    return data
+
+
+def _load_report(data):
+    """:return: TestReport rebuilt from the fields saved by ``_dump_report``"""
+    longrepr = data["longrepr"]
+    if isinstance(longrepr, list):
+        longrepr = tuple(longrepr)
+    elif data["message"] is not None:
+        longrepr = _ReplayedFailure(longrepr, data["message"])
+    extra = {"wasxfail": data["wasxfail"]} if "wasxfail" in data else {}
+    return TestReport(
+        data["nodeid"],
+        tuple(data["location"]),
+        data["keywords"],
+        data["outcome"],
+        longrepr,
+        data["when"],
+        sections=[tuple(s) for s in data["sections"]],
+        duration=data["duration"],
+        user_properties=[tuple(p) for p in data["user_properties"]],
+        **extra
+    )
+
+
+def make_fingerprint(*values):
+    """
+    :param values: strings identifying the configuration of the run
+    :return: SHA-256 (hex) of the validation code and ``values``
+    """
+    sha = hashlib.sha256(hash_validation_code().encode("utf8"))
+    for value in values:
+        sha.update(b"\0")
+        sha.update(str(value).encode("utf8"))
+    return sha.hexdigest()
+
+
+# Manifest of the current session
+MANIFEST = RunManifest()
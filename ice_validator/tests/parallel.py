@@ -0,0 +1,214 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Runs the collected test items across a pool of worker processes.
+
+Items are grouped by the template file they validate so that all tests for
+a given file run in the same worker and reuse its YAML cache.  Workers are
+forked after collection, execute their groups without logging, and send the
+reports back to the main process.  The main process then replays the reports
+in the original collection order so the terminal output and all generated
+reports match a serial run.
+"""
+
+import copy
+import multiprocessing
+import os
+import pickle  # nosec
+from collections import OrderedDict
+
+from _pytest.runner import runtestprotocol
+
+# Parameters whose value identifies the single template file a test validates
+FILE_PARAMS = (
+    "yaml_file",
+    "heat_template",
+    "volume_template",
+    "template",
+    "filename",
+    "env_file",
+)
+
+# Items of the session being executed.  Set before the workers are forked
+# so they can be referenced by index instead of being pickled.
+_ITEMS = []
+
+
+def is_supported():
+    """Parallel execution relies on forking the collected session"""
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def worker_count(requested):
+    """
+    :param requested: number of workers requested (0 means one per CPU)
+    :return: number of workers to use
+    """
+    return requested if requested > 0 else (os.cpu_count() or 1)
+
+
+def template_key(item):
+    """
+    Returns the template file validated by the item or None if the item
+    validates multiple files (or none).
+    """
+    params = getattr(getattr(item, "callspec", None), "params", {})
+    for name in FILE_PARAMS:
+        value = params.get(name)
+        if isinstance(value, str):
+            return value
+    return None
+
+
+def group_items(items):
+    """
+    Groups the indices of ``items`` by template file.  Items that are not
+    tied to a single file are placed in their own group.  Groups are
+    returned largest first so the pool stays evenly loaded.
+
+    :param items: collected test items
+    :return: list of lists of item indices
+    """
+    groups = OrderedDict()
+    for index, item in enumerate(items):
+        key = template_key(item)
+        groups.setdefault(key if key else index, []).append(index)
+    return sorted(groups.values(), key=len, reverse=True)
+
+
+def _serialize(report):
+    """
+    Returns the report pickled.  If the representation of the failure can't
+    be pickled, then the text of the failure is used instead.
+    """
+    try:
+        return pickle.dumps(report, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        report = copy.copy(report)
+        report.longrepr = str(report.longrepr)
+        return pickle.dumps(report, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _init_worker():
+    """Gives each worker its own output capturing"""
+    if not _ITEMS:
+        return
+    capman = _ITEMS[0].config.pluginmanager.getplugin("capturemanager")
+    if capman is not None:
+        # The capture files inherited from the main process would otherwise
+        # be shared by all workers.  The CaptureManager API used here is the
+        # one of pytest 3.7 (the version pinned in requirements.txt)
+        capman.stop_global_capturing()
+        capman.start_global_capturing()
+        capman.suspend_global_capture()
+
+
+def _run_group(indices):
+    """
+    Executes the items of a group (runs in a worker process).
+
+    :return: list of (item index, serialized reports)
+    """
+    results = []
+    for pos, index in enumerate(indices):
+        item = _ITEMS[index]
+        if pos + 1 < len(indices):
+            nextitem = _ITEMS[indices[pos + 1]]
+        else:
+            # Any later item keeps the session fixtures alive for the next
+            # group executed by this worker
+            nextitem = _ITEMS[index + 1] if index + 1 < len(_ITEMS) else None
+        reports = runtestprotocol(item, log=False, nextitem=nextitem)
+        results.append((index, [_serialize(r) for r in reports]))
+    return results
+
+
+def log_reports(item, reports, on_report):
+    """
+    Logs the reports of an item that was executed elsewhere as if it had
+    just been executed in this process.
+    """
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    for report in reports:
+        on_report(item, report)
+        item.ihook.pytest_runtest_logreport(report=report)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+
+
+def run_items(items, workers, on_report, completed=None):
+    """
+    Runs ``items`` across ``workers`` processes and logs the results in
+    the original order of ``items``.
+
+    :param items:     collected test items
+    :param workers:   number of worker processes
+    :param on_report: called with (item, report) in the main process for
+                      every report before it is logged
+    :param completed: optional dict of item index -> reports for items that
+                      do not need to be executed
+    """
+    if not items:
+        return
+    _ITEMS[:] = items
+    context = multiprocessing.get_context("fork")
+    completed = dict(completed or {})
+    groups = [
+        [index for index in group if index not in completed]
+        for group in group_items(items)
+    ]
+    groups = [group for group in groups if group]
+    next_to_log = 0
+
+    def log_ready():
+        # log everything that is ready without changing the order
+        nonlocal next_to_log
+        while next_to_log in completed:
+            log_reports(items[next_to_log], completed.pop(next_to_log), on_report)
+            next_to_log += 1
+
+    try:
+        log_ready()
+        if not groups:
+            return
+        with context.Pool(workers, initializer=_init_worker) as pool:
+            for results in pool.imap_unordered(_run_group, groups):
+                for index, reports in results:
+                    completed[index] = [pickle.loads(r) for r in reports]  # nosec
+                log_ready()
+    finally:
+        del _ITEMS[:]
@@ -40,12 +40,13 @@
 """parametrizers
 """
 
-from os import path, listdir
+from os import path
 import re
 from tests import cached_yaml as yaml
 import pytest
 from tests.helpers import get_parsed_yml_for_yaml_files, check_basename_ending
 from tests.utils.nested_files import get_nested_files
+from tests.utils.template_source import isdir, isfile, listdir
 
 VERSION = "1.0.0"
 
@@ -84,7 +85,7 @@ def list_filenames_in_template_dir(
             path.join(template_dir, s, f)
             for s in sub_dirs
             for f in listdir(path.join(template_dir, s))
-            if path.isfile(path.join(template_dir, s, f))
+            if isfile(path.join(template_dir, s, f))
             and path.splitext(f)[-1] in extensions
             and check_basename_ending(template_type, path.splitext(f)[0])
         ]
@@ -92,7 +93,7 @@ def list_filenames_in_template_dir(
         filenames = [
             path.join(template_dir, f)
             for f in listdir(template_dir)
-            if path.isfile(path.join(template_dir, f))
+            if isfile(path.join(template_dir, f))
             and path.splitext(f)[-1] in extensions
             and check_basename_ending(template_type, path.splitext(f)[0])
         ]
@@ -335,14 +336,14 @@ def parametrize_template_dir(metafunc):
             path.join(template_dir, s, t)
             for s in ["pass"]
             for t in listdir(path.join(template_dir, s))
-            if path.isdir(path.join(template_dir, s, t))
+            if isdir(path.join(template_dir, s, t))
         ]
 
         dirs += [
             pytest.mark.xfail(path.join(template_dir, s, t))
             for s in ["fail"]
             for t in listdir(path.join(template_dir, s))
-            if path.isdir(path.join(template_dir, s, t))
+            if isdir(path.join(template_dir, s, t))
         ]
     else:
         dirs = [template_dir]
@@ -374,10 +375,8 @@ def parametrize_environment_pair(metafunc, template_type=""):
             yfilename = basename + ".yaml"
 
         try:
-            with open(filename) as fh:
-                eyml = yaml.load(fh)
-            with open(yfilename) as fh:
-                yyml = yaml.load(fh)
+            eyml = yaml.load_path(filename)
+            yyml = yaml.load_path(yfilename)
 
             if "fail" in filename:
                 pairs.append(
@@ -419,10 +418,8 @@ def parametrize_heat_volume_pair(metafunc):
             yfilename = basename + ".yaml"
 
         try:
-            with open(vfilename) as fh:
-                vyml = yaml.load(fh)
-            with open(yfilename) as fh:
-                yyml = yaml.load(fh)
+            vyml = yaml.load_path(vfilename)
+            yyml = yaml.load_path(yfilename)
 
             if "fail" in vfilename:
                 pairs.append(
@@ -0,0 +1,181 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Rendering helpers for the HTML report.
+
+The requirement text of a failure is rendered to HTML with docutils, which
+is slow, while the same text is repeated by every failure of a test.  Each
+distinct text is therefore rendered only once, and the rendered HTML is kept
+in the persistent cache directory (see cached_yaml.configure) so later runs
+don't render it again.  The HTML is written to the report as is, so the cache
+file is signed like the cached templates and ignored if anyone else wrote it.
+The Jinja2 template of the report is compiled once per process.  docutils and
+Jinja2 are only imported when an HTML report is generated.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+from tests import cached_yaml
+
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT_TEMPLATE = "report.html.jinja2"
+RENDER_CACHE_FILE = "requirements_html.json"
+RENDER_CACHE_FORMAT = "2"
+
+
+def text_key(text):
+    """Returns the key of the rendered HTML of ``text``"""
+    return hashlib.sha256(text.encode("utf8")).hexdigest()
+
+
+class RequirementsRenderer:
+    """
+    Renders requirement text to HTML, at most once per distinct text.
+
+    :param cache_path: signed JSON file to persist the rendered HTML in, or
+                       None to only keep it in memory
+    :param key:        key signing the file (defaults to the key of the
+                       cached_yaml cache)
+    """
+
+    def __init__(self, cache_path=None, key=None):
+        self.cache_path = cache_path
+        self.key = key
+        self.rendered = None
+        self.modified = False
+
+    def _version(self):
+        import docutils
+
+        return "{}-{}".format(RENDER_CACHE_FORMAT, docutils.__version__)
+
+    def _load(self):
+        self.rendered = {}
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, "rb") as f:
+                payload = cached_yaml.verify(f.read(), self.key)
+            if payload is None:
+                return  # not written by this user - just render again
+            data = json.loads(payload.decode("utf8"))
+        except FileNotFoundError:
+            return
+        except Exception:  # corrupt cache - just render again
+            return
+        if isinstance(data, dict) and data.get("version") == self._version():
+            self.rendered = data.get("html", {})
+
+    def render(self, text):
+        """Returns the body of the HTML rendered from the reStructuredText"""
+        if self.rendered is None:
+            self._load()
+        key = text_key(text)
+        html = self.rendered.get(key)
+        if html is None:
+            import docutils.core
+
+            html = docutils.core.publish_parts(writer_name="html", source=text)[
+                "body"
+            ]
+            self.rendered[key] = html
+            self.modified = True
+        return html
+
+    def save(self):
+        """Writes newly rendered HTML to the cache file, if there is one"""
+        if not (self.cache_path and self.modified):
+            return
+        cache_dir = os.path.dirname(self.cache_path)
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            # concurrent runs must never see a partially written file
+            data = json.dumps(
+                {"version": self._version(), "html": self.rendered},
+                separators=(",", ":"),
+            )
+            with os.fdopen(fd, "wb") as f:
+                f.write(cached_yaml.sign(data.encode("utf8"), self.key))
+            os.replace(tmp_path, self.cache_path)
+            self.modified = False
+        except Exception as e:
+            print("WARNING: Unable to write {}: {}".format(self.cache_path, e))
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+_RENDERER = None
+_ENVIRONMENT = None
+
+
+def get_renderer():
+    """
+    Returns the renderer of the process.  The rendered HTML is persisted in
+    the cache directory of cached_yaml, unless the persistent cache is
+    disabled.
+    """
+    global _RENDERER
+    cache_dir = cached_yaml.cache_dir()
+    cache_path = os.path.join(cache_dir, RENDER_CACHE_FILE) if cache_dir else None
+    if _RENDERER is None or _RENDERER.cache_path != cache_path:
+        _RENDERER = RequirementsRenderer(cache_path)
+    return _RENDERER
+
+
+def render_requirements(text):
+    """Renders the requirement text of a failure to HTML"""
+    return get_renderer().render(text)
+
+
+def get_report_template():
+    """
+    Returns the compiled template of the HTML report.  The template is
+    compiled once per process.
+    """
+    global _ENVIRONMENT
+    if _ENVIRONMENT is None:
+        import jinja2
+
+        _ENVIRONMENT = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(TEMPLATE_DIR), auto_reload=False
+        )
+    return _ENVIRONMENT.get_template(REPORT_TEMPLATE)
@@ -0,0 +1,198 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Streams the results of the tests to the report writers.
+
+The results are appended to temporary spool files on disk as each test
+completes, instead of being kept in memory until the end of the run.  The
+per-requirement roll-up is updated as the results arrive.  When the session
+finishes, the report writers read the spools back one record at a time
+(see conftest.generate_report), so the memory needed to write the reports
+doesn't grow with the number of failures.
+"""
+
+import json
+import os
+import tempfile
+from collections import defaultdict
+
+
+class ResultSpool:
+    """
+    Sequence of JSON serializable records appended to a temporary file.
+    Iterating over the spool reads the records back in order.
+    """
+
+    def __init__(self):
+        self._file = None
+        self._count = 0
+
+    def append(self, record):
+        if self._file is None:
+            self._file = tempfile.TemporaryFile("w+", encoding="utf8")
+        self._file.write(json.dumps(record))
+        self._file.write("\n")
+        self._count += 1
+
+    def __iter__(self):
+        if self._file is None:
+            return
+        self._file.seek(0)
+        for line in self._file:
+            yield json.loads(line)
+        self._file.seek(0, 2)  # further records are appended at the end
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._count = 0
+
+
+class ReportStream:
+    """
+    Spools the entries of the tests for report.json and the details of the
+    failures for the other reports, and rolls up the results of the tests
+    by requirement.
+
+    Only the process that created the stream records results, as the worker
+    processes of ``--workers`` send their results back to it (see parallel.py).
+
+    :param template_path: directory validated, or None to not spool anything
+                          (ex: --self-test)
+    """
+
+    def __init__(self, template_path=None):
+        self.template_path = template_path
+        self.pid = os.getpid()
+        self.tests = ResultSpool()
+        self.failures = ResultSpool()
+        # requirement ID ("" if not mapped) -> errors and outcomes of its tests
+        self.requirement_results = defaultdict(
+            lambda: {"errors": set(), "outcomes": set()}
+        )
+
+    @property
+    def enabled(self):
+        return self.template_path is not None and os.getpid() == self.pid
+
+    def add_test(self, entry):
+        """
+        Records the entry of a test in report.json
+
+        :param entry: dict with the result, error, and requirements of the test
+        """
+        if not self.enabled:
+            return
+        self.tests.append(entry)
+        self.roll_up(entry)
+
+    def add_failure(self, failure):
+        """Records the details of a failed test for the other reports"""
+        if self.enabled:
+            self.failures.append(failure)
+
+    def roll_up(self, entry):
+        """Adds the result of the test ``entry`` to its requirements' results"""
+        test_reqs = entry["requirements"]
+        r_ids = (
+            [r["id"] if isinstance(r, dict) else r for r in test_reqs]
+            if test_reqs
+            else ("",)
+        )
+        for r_id in r_ids:
+            item = self.requirement_results[r_id]
+            item["outcomes"].add(entry["result"])
+            if entry["error"]:
+                item["errors"].add(entry["error"])
+
+    def close(self):
+        self.tests.close()
+        self.failures.close()
+
+
+class StreamedDict:
+    """
+    Iterator of (key, value) pairs written as a JSON object by ``dump_json``
+
+    :param pairs: iterable of (string key, value)
+    """
+
+    def __init__(self, pairs):
+        self.pairs = pairs
+
+    def items(self):
+        return self.pairs
+
+
+def _is_stream(value):
+    return hasattr(value, "__iter__") and not isinstance(
+        value, (str, bytes, dict, list, tuple)
+    )
+
+
+def dump_json(value, f, level=0):
+    """
+    Same as ``json.dump(value, f, indent=2)``, but dicts and iterators (ex:
+    a ResultSpool) are written one item at a time, so iterators (written as
+    lists) and StreamedDicts are never loaded in memory as a whole.
+
+    :param value: data to write
+    :param f:     file opened for writing
+    :param level: nesting level of ``value`` in the document
+    """
+    pad = "  " * level
+    if isinstance(value, (dict, StreamedDict)):
+        empty = True
+        for key, item in value.items():
+            f.write("{}\n{}  {}: ".format("{" if empty else ",", pad, json.dumps(key)))
+            dump_json(item, f, level + 1)
+            empty = False
+        f.write("{}" if empty else "\n{}}}".format(pad))
+    elif _is_stream(value):
+        empty = True
+        for item in value:
+            f.write("{}\n{}  ".format("[" if empty else ",", pad))
+            dump_json(item, f, level + 1)
+            empty = False
+        f.write("[]" if empty else "\n{}]".format(pad))
+    else:
+        f.write(json.dumps(value, indent=2).replace("\n", "\n" + pad))
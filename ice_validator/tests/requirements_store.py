@@ -0,0 +1,194 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Lazy, indexed access to the requirements in heat_requirements.json.
+
+heat_requirements.json is the needs.json published by the VNFRQTS project.
+It contains every version of the requirements with all of their metadata,
+while the validation scripts only need a few fields of the current version.
+``update_reqs.py`` therefore also writes heat_requirements.index.json, a
+compact copy of the current version keyed by requirement ID, along with
+the SHA-256 of the source file it was built from.  The index is only used
+while that hash matches, otherwise the source file is parsed instead.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+
+ICE_VALIDATOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAT_REQUIREMENTS_FILE = os.path.join(ICE_VALIDATOR_DIR, "heat_requirements.json")
+
+INDEX_FILE = os.path.join(ICE_VALIDATOR_DIR, "heat_requirements.index.json")
+
+# Bump whenever the structure of the index or INDEX_FIELDS change
+INDEX_FORMAT = "1"
+
+# Metadata of a requirement used by the reports
+INDEX_FIELDS = (
+    "id",
+    "description",
+    "docname",
+    "section_name",
+    "keyword",
+    "validation_mode",
+    "full_title",
+    "test_case",
+    "validated_by",
+)
+
+
+def hash_source(path):
+    """:return: SHA-256 of the contents of the file at ``path`` (hex)"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_index(source_path=HEAT_REQUIREMENTS_FILE):
+    """
+    Parses the requirements file and extracts the current version.
+
+    :param source_path: path to heat_requirements.json
+    :return: dict with the format, source hash, version, and the needs of
+             the current version (requirement ID -> metadata)
+    """
+    with open(source_path, "rb") as f:
+        contents = f.read()
+    data = json.loads(contents.decode("utf8"))
+    version = data["current_version"]
+    needs = data["versions"][version]["needs"]
+    return {
+        "format": INDEX_FORMAT,
+        "source_sha256": hashlib.sha256(contents).hexdigest(),
+        "version": version,
+        "needs": {
+            req_id: {k: meta[k] for k in INDEX_FIELDS if k in meta}
+            for req_id, meta in needs.items()
+        },
+    }
+
+
+def write_index(source_path=HEAT_REQUIREMENTS_FILE, index_path=INDEX_FILE):
+    """Regenerates the index of ``source_path`` (see update_reqs.py)"""
+    index = build_index(source_path)
+    with open(index_path, "w", encoding="utf8") as f:
+        json.dump(index, f, separators=(",", ":"))
+        f.write("\n")
+    return index
+
+
+def read_index(index_path, source_sha256):
+    """
+    :return: the index at ``index_path``, or None if it is missing or was
+             not built from the source file with the hash ``source_sha256``
+    """
+    try:
+        with open(index_path, "r", encoding="utf8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        index.get("format") != INDEX_FORMAT
+        or index.get("source_sha256") != source_sha256
+    ):
+        return None
+    return index
+
+
+class RequirementsStore(Mapping):
+    """
+    Read-only mapping of requirement ID to the metadata of the requirement in
+    the current version.  Nothing is read until the first access, and the
+    files are only read again when the source file is modified.
+
+    :param source_path: path to heat_requirements.json
+    :param index_path:  path to its index
+    """
+
+    def __init__(self, source_path=HEAT_REQUIREMENTS_FILE, index_path=INDEX_FILE):
+        self.source_path = source_path
+        self.index_path = index_path
+        self._mtime = None
+        self._index = None
+        self.from_index = False
+
+    def _load(self):
+        mtime = os.path.getmtime(self.source_path)
+        if mtime != self._mtime:
+            index = read_index(self.index_path, hash_source(self.source_path))
+            self.from_index = index is not None
+            self._index = index or build_index(self.source_path)
+            self._mtime = mtime
+        return self._index
+
+    @property
+    def version(self):
+        """:return: the current version of the requirements (ex: frankfurt)"""
+        return self._load()["version"]
+
+    @property
+    def needs(self):
+        """
+        :return: dict of requirement ID to metadata.  Shared by every caller,
+                 so it must not be modified.
+        """
+        return self._load()["needs"]
+
+    def __getitem__(self, req_id):
+        return self.needs[req_id]
+
+    def __iter__(self):
+        return iter(self.needs)
+
+    def __len__(self):
+        return len(self.needs)
+
+
+# Stores created so far (path to source file -> RequirementsStore)
+_STORES = {}
+
+
+def get_store(source_path=HEAT_REQUIREMENTS_FILE):
+    """:return: the RequirementsStore of ``source_path``, shared by the process"""
+    source_path = os.path.abspath(source_path)
+    if source_path not in _STORES:
+        index_path = os.path.splitext(source_path)[0] + ".index.json"
+        _STORES[source_path] = RequirementsStore(source_path, index_path)
+    return _STORES[source_path]
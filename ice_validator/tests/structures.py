@@ -44,13 +44,23 @@ import sys
 
 from tests import cached_yaml as yaml
 from tests.helpers import load_yaml, get_param
-from tests.utils import nested_dict
+from tests.utils import nested_dict, template_source
+from tests.utils.naming_rules import RuleSet
+
+# Heat instances shared across the session (see load_heat)
+HEAT_CACHE = {}
+
+# Nested template graphs shared across the session (see get_nested_graph)
+NESTED_GRAPHS = {}
 
 VERSION = "4.2.0"
 
 # key = pattern, value = regex compiled from pattern
 _REGEX_CACHE = {}
 
+# key = part, value = regex used by Heat.part_is_in_name
+_PART_REGEX_CACHE = {}
+
 
 def _get_regex(pattern):
     """Return a compiled version of pattern.
@@ -81,6 +91,12 @@ class HeatProcessor(object):
     re_rids = collections.OrderedDict()  # OrderedDict of name: regex
     # name is a string to name the regex.
     # regex parses the proper resource id format.
+    rid_rules = RuleSet(())  # re_rids compiled into one regex
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "re_rids" in cls.__dict__:
+            cls.rid_rules = RuleSet(cls.re_rids.items())
 
     @staticmethod
     def get_param_value(value, withIndex=False):
@@ -116,11 +132,7 @@ class HeatProcessor(object):
         (name, match object) or ('', None) if no match.
         """
         rid = "" if rid is None else rid
-        for name, regex in cls.re_rids.items():
-            match = regex.match(rid)
-            if match:
-                return name, match
-        return "", None
+        return cls.rid_rules.match(rid)
 
     @classmethod
     def get_rid_patterns(cls):
@@ -573,6 +585,8 @@ class Heat(object):
         self.resources = None
         self.outputs = None
         self.conditions = None
+        self._index = None
+        self._all_index = None
         if filepath:
             self.load(filepath)
         self.env = None
@@ -584,6 +598,22 @@ class Heat(object):
     def is_heat(self):
         return "heat_template_version" in self.yml
 
+    @property
+    def index(self):
+        """``ResourceIndex`` of ``resources``, built on first access.
+        """
+        if self._index is None:
+            self._index = ResourceIndex(self.resources)
+        return self._index
+
+    @property
+    def all_index(self):
+        """``ResourceIndex`` of ``get_all_resources()``, built on first access.
+        """
+        if self._all_index is None:
+            self._all_index = ResourceIndex(self.get_all_resources())
+        return self._all_index
+
     @property
     def contrail_resources(self):
         """This attribute is a dict of Contrail resources.
@@ -597,24 +627,26 @@ class Heat(object):
         Like ``resources``, but this returns all the resources definitions
         defined in the template, resource groups, and nested YAML files.
 
-        A special variable will be added to all resource properties (__count__).
+        The number of instances of each resource is returned by
+        ``get_resource_counts``.
+        """
+        graph = get_nested_graph(base_dir or self.dirname)
+        resources, _ = graph.expand(self, count)
+        return resources
+
+    def get_resource_counts(self, base_dir=None, count=1):
+        """
+        Return a dict, resource id: number of instances of the resource, for
+        the resources of ``get_all_resources`` with the same arguments.
+
         This will normally be 1, but if the resource is generated by a
         ResourceGroup **and** an env file is present, then the count will be
         the value from the env file (assuming this follows standard VNF Heat
         Guidelines)
         """
-        base_dir = base_dir or self.dirname
-        resources = {}
-        for r_id, r_data in self.resources.items():
-            r_data["__count__"] = count
-            resources[r_id] = r_data
-            resource = Resource(r_id, r_data)
-            if resource.is_nested():
-                nested_count = resource.get_count(self.env)
-                nested = Heat(os.path.join(base_dir, resource.get_nested_filename()))
-                nested_resources = nested.get_all_resources(count=nested_count)
-                resources.update(nested_resources)
-        return resources
+        graph = get_nested_graph(base_dir or self.dirname)
+        _, counts = graph.expand(self, count)
+        return counts
 
     @staticmethod
     def get_heat_processors():
@@ -627,12 +659,30 @@ class Heat(object):
         """Return dict of resources whose type is `resource_type`.
         key is resource_id, value is resource.
         """
-        resources = self.get_all_resources() if all_resources else self.resources
-        return {
-            rid: resource
-            for rid, resource in resources.items()
-            if self.nested_get(resource, "type") == resource_type
-        }
+        index = self.all_index if all_resources else self.index
+        return dict(index.by_type.get(resource_type, {}))
+
+    def get_resources_by_vm_type(self, vm_type):
+        """Return dict of resources whose resource id contains `vm_type`.
+        key is resource_id, value is resource.
+        """
+        return dict(self.index.by_vm_type.get(vm_type, {}))
+
+    def get_resources_by_network_role(self, network_role):
+        """Return dict of resources whose resource id contains `network_role`.
+        key is resource_id, value is resource.
+        """
+        return dict(self.index.by_network_role.get(network_role, {}))
+
+    def get_referencing_resources(self, rid):
+        """Return set of resource ids that refer to `rid` using get_resource.
+        """
+        return set(self.index.referenced_by.get(rid, ()))
+
+    def get_dependent_resources(self, rid):
+        """Return set of resource ids that list `rid` in depends_on.
+        """
+        return set(self.index.dependents.get(rid, ()))
 
     def get_rid_match_tuple(self, rid, resource_type):
         """return get_rid_match_tuple(rid) called on the class
@@ -657,8 +707,7 @@ class Heat(object):
         self.filepath = filepath
         self.basename = os.path.basename(self.filepath)
         self.dirname = os.path.dirname(self.filepath)
-        with open(self.filepath) as fi:
-            self.yml = yaml.load(fi)
+        self.yml = yaml.load_path(self.filepath)
         self.heat_template_version = self.yml.get("heat_template_version", None)
         self.description = self.yml.get("description", "")
         self.parameter_groups = self.yml.get("parameter_groups") or {}
@@ -703,28 +752,21 @@ class Heat(object):
         - name ends with '_' + part
         False otherwise
         """
-        return bool(
-            re.search("(^(%(x)s)_)|(_(%(x)s)_)|(_(%(x)s)$)" % dict(x=part), name)
-        )
+        regex = _PART_REGEX_CACHE.get(part)
+        if regex is None:
+            regex = re.compile("(^(%(x)s)_)|(_(%(x)s)_)|(_(%(x)s)$)" % dict(x=part))
+            _PART_REGEX_CACHE[part] = regex
+        return bool(regex.search(name))
 
     def iter_nested_heat(self):
         """
         Returns an iterable of tuples (int, heat) where the first parameter is the
         depth of the nested file and the second item is an instance of Heat
         """
-
-        def walk_nested(heat, level=1):
-            resources = [Resource(r_id, data) for r_id, data in heat.resources.items()]
-            for resource in resources:
-                if resource.is_nested():
-                    nested_path = os.path.join(
-                        self.dirname, resource.get_nested_filename()
-                    )
-                    nested_heat = Heat(nested_path)
-                    yield level, nested_heat
-                    yield from walk_nested(nested_heat, level + 1)
-
-        yield from walk_nested(self)
+        graph = get_nested_graph(self.dirname)
+        graph.add(self)
+        for level, nested_path in graph.get_descendants(self.filepath):
+            yield level, load_heat(nested_path)
 
     def __str__(self):
         return "Heat({})".format(self.filepath)
@@ -733,6 +775,56 @@ class Heat(object):
         return str(self)
 
 
+class ResourceIndex(object):
+    """Lookup tables for a dict of resources, built in a single pass.
+    by_type - resource_type: {resource_id: resource}
+    by_vm_type - vm_type: {resource_id: resource}
+    by_network_role - network_role: {resource_id: resource}
+    referenced_by - resource_id: set of resource ids using get_resource on it
+    dependents - resource_id: set of resource ids listing it in depends_on
+    vm_type and network_role are parsed from the resource id using the
+    regexes of the HeatProcessor for the resource type.
+    """
+
+    def __init__(self, resources):
+        self.by_type = collections.defaultdict(dict)
+        self.by_vm_type = collections.defaultdict(dict)
+        self.by_network_role = collections.defaultdict(dict)
+        self.referenced_by = collections.defaultdict(set)
+        self.dependents = collections.defaultdict(set)
+        for rid, resource in resources.items():
+            resource_type = nested_dict.get(resource, "type")
+            self.by_type[resource_type][rid] = resource
+            if not isinstance(resource, dict):
+                continue
+            processor = _HEAT_PROCESSORS.get(resource_type, HeatProcessor)
+            match = processor.get_rid_match_tuple(rid)[1]
+            groups = match.groupdict() if match else {}
+            if groups.get("vm_type"):
+                self.by_vm_type[groups["vm_type"]][rid] = resource
+            if groups.get("network_role"):
+                self.by_network_role[groups["network_role"]][rid] = resource
+            for ref in _iter_get_resource(resource):
+                self.referenced_by[ref].add(rid)
+            for parent in Resource(rid, resource).depends_on:
+                if isinstance(parent, str):
+                    self.dependents[parent].add(rid)
+
+
+def _iter_get_resource(value):
+    """Yield every resource id referenced with get_resource in `value`.
+    """
+    if isinstance(value, dict):
+        for k, v in value.items():
+            if k == "get_resource" and isinstance(v, str):
+                yield v
+            else:
+                yield from _iter_get_resource(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _iter_get_resource(v)
+
+
 class Env(Heat):
     """An Environment file
     """
@@ -828,7 +920,7 @@ class Resource(object):
         filename = self.get_nested_filename()
         if filename:
             file_path = os.path.join(base_dir, filename)
-            return load_yaml(file_path) if os.path.exists(file_path) else {}
+            return load_yaml(file_path) if template_source.exists(file_path) else {}
         else:
             return {}
 
@@ -839,13 +931,172 @@ class Resource(object):
         return str(self)
 
 
+class NestedTemplateGraph(object):
+    """Graph of the nested templates referenced by the templates in a
+    directory.  Each template is only loaded and expanded once no matter
+    how many templates nest it.
+    edges - template path: OrderedDict of resource id: nested template path
+    order - template paths, nested templates before the templates using them
+    cycles - list of cycles, each a list of template paths where the first
+    and last template are the same.
+    The edges that close a cycle are not followed when expanding templates.
+    """
+
+    _VISITING = 1
+    _VISITED = 2
+
+    def __init__(self, dirname):
+        self.dirname = dirname
+        self.edges = {}
+        self.order = []
+        self.cycles = []
+        self._back_edges = set()
+        self._state = {}
+        self._expanded = {}
+        self._descendants = {}
+
+    def _get_edges(self, path, resources=None):
+        if path not in self.edges:
+            if resources is None:
+                resources = load_heat(path).resources
+            edges = collections.OrderedDict()
+            for r_id, r_data in resources.items():
+                if not isinstance(r_data, dict):
+                    continue
+                nested_filename = Resource(r_id, r_data).get_nested_filename()
+                if nested_filename:
+                    edges[r_id] = os.path.join(self.dirname, nested_filename)
+            self.edges[path] = edges
+        return self.edges[path]
+
+    def add(self, heat):
+        """Add the template `heat` and all templates it nests to the graph.
+        """
+        if heat.filepath in self._state:
+            return
+        path = heat.filepath
+        stack = [(path, iter(self._get_edges(path, heat.resources).items()))]
+        self._state[path] = self._VISITING
+        try:
+            while stack:
+                node, children = stack[-1]
+                for r_id, child in children:
+                    state = self._state.get(child)
+                    if state == self._VISITING:
+                        self._back_edges.add((node, r_id))
+                        cycle = [n for n, _ in stack]
+                        self.cycles.append(cycle[cycle.index(child):] + [child])
+                    elif state is None:
+                        self._state[child] = self._VISITING
+                        stack.append((child, iter(self._get_edges(child).items())))
+                        break
+                else:
+                    stack.pop()
+                    self._state[node] = self._VISITED
+                    self.order.append(node)
+        except Exception:
+            # leave the graph as it was so the failure is raised again
+            for node, _ in stack:
+                del self._state[node]
+            raise
+
+    def _iter_edges(self, path):
+        for r_id, nested_path in self.edges[path].items():
+            if (path, r_id) not in self._back_edges:
+                yield r_id, nested_path
+
+    def get_cycles(self, heat):
+        """Return the cycles reachable from the template `heat`.
+        """
+        self.add(heat)
+        reachable = {heat.filepath}
+        pending = [heat.filepath]
+        while pending:
+            for _, nested_path in self.edges[pending.pop()].items():
+                if nested_path not in reachable:
+                    reachable.add(nested_path)
+                    pending.append(nested_path)
+        return [c for c in self.cycles if c[0] in reachable]
+
+    def get_descendants(self, path):
+        """Return list of (depth, path) of every nested template reference
+        below `path`, in depth-first order.
+        """
+        if path not in self._descendants:
+            descendants = []
+            for _, nested_path in self._iter_edges(path):
+                descendants.append((1, nested_path))
+                descendants.extend(
+                    (depth + 1, p) for depth, p in self.get_descendants(nested_path)
+                )
+            self._descendants[path] = descendants
+        return self._descendants[path]
+
+    def _expand(self, path, resources, count, env):
+        all_resources = {}
+        counts = {}
+        nested = dict(self._iter_edges(path))
+        for r_id, r_data in resources.items():
+            counts[r_id] = count
+            all_resources[r_id] = r_data
+            if r_id in nested:
+                nested_count = Resource(r_id, r_data).get_count(env)
+                nested_resources, nested_counts = self._expand_nested(
+                    nested[r_id], nested_count
+                )
+                all_resources.update(nested_resources)
+                counts.update(nested_counts)
+        return all_resources, counts
+
+    def _expand_nested(self, path, count):
+        key = (path, count)
+        if key not in self._expanded:
+            resources = load_heat(path).resources
+            self._expanded[key] = self._expand(path, resources, count, None)
+        return self._expanded[key]
+
+    def expand(self, heat, count=1):
+        """Return (resources, counts) for the template `heat`.
+        resources - resource id: resource for the template and all nested
+        templates
+        counts - resource id: number of instances of the resource.  The
+        ResourceGroup counts come from the env of `heat`.
+        """
+        self.add(heat)
+        resources, counts = self._expand(heat.filepath, heat.resources, count, heat.env)
+        return dict(resources), dict(counts)
+
+
+def get_nested_graph(dirname):
+    """Return the NestedTemplateGraph of `dirname`, shared by the session.
+    """
+    graph = NESTED_GRAPHS.get(dirname)
+    if graph is None:
+        graph = NestedTemplateGraph(dirname)
+        NESTED_GRAPHS[dirname] = graph
+    return graph
+
+
+def load_heat(filepath, envpath=None):
+    """Return the Heat for `filepath` and `envpath`.
+    Each template is only loaded once per session, and the same instance
+    is shared by every caller so its indexes are only built once.
+    """
+    key = (filepath, envpath)
+    heat = HEAT_CACHE.get(key)
+    if heat is None:
+        heat = Heat(filepath=filepath, envpath=envpath)
+        HEAT_CACHE[key] = heat
+    return heat
+
+
 def get_all_resources(yaml_files):
     """Return a dict, resource id: resource
     of the union of resources across all files.
     """
     resources = {}
     for heat_template in yaml_files:
-        heat = Heat(filepath=heat_template)
+        heat = load_heat(heat_template)
         dirname = os.path.dirname(heat_template)
         resources.update(heat.get_all_resources(dirname))
     return resources
@@ -59,8 +59,7 @@ def test_availability_zone_naming(yaml_file):
     if nested_files.file_is_a_nested_template(yaml_file):
         pytest.skip("test does not apply to nested files")
 
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if resources are not defined
     if "resources" not in yml:
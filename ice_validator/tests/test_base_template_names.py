@@ -33,7 +33,6 @@
 #
 # ============LICENSE_END============================================
 
-from os import listdir
 from os import path
 import re
 from pathlib import Path
@@ -42,6 +41,7 @@ import pytest
 
 from .helpers import check_basename_ending
 from .helpers import validates
+from .utils.template_source import isfile, listdir
 
 
 RE_BASE = re.compile(r"(^base$)|(^base_)|(_base_)|(_base$)")
@@ -51,7 +51,7 @@ def list_filenames(template_dir):
     return [
         f
         for f in listdir(template_dir)
-        if path.isfile(path.join(template_dir, f))
+        if isfile(path.join(template_dir, f))
         and path.splitext(f)[-1] in [".yaml", ".yml"]
     ]
 
@@ -45,7 +45,7 @@ import re
 
 import pytest
 
-from .structures import Heat
+from .structures import load_heat
 from .helpers import validates
 
 VERSION = "1.1.0"
@@ -65,7 +65,7 @@ def get_network_role(rid):
 def run_test(heat_template, validate):
     """call validate for each fixed_ips
     """
-    heat = Heat(filepath=heat_template)
+    heat = load_heat(heat_template)
     if not heat.resources:
         pytest.skip("No resources found")
 
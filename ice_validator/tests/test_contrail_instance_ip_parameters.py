@@ -41,7 +41,7 @@ import re
 
 import pytest
 
-from tests.structures import ContrailV2InstanceIpProcessor, Heat
+from tests.structures import ContrailV2InstanceIpProcessor, load_heat
 from tests.helpers import validates, get_base_template_from_yaml_files, get_param
 from tests.utils.incrementals import get_incremental_modules
 from tests.utils.ports import check_parameter_format
@@ -161,11 +161,11 @@ def test_contrail_incremental_module_internal_subnet_usage(yaml_files):
     base_path = get_base_template_from_yaml_files(yaml_files)
     if not base_path:
         pytest.skip("No base module detected to check")
-    base_outputs = Heat(filepath=base_path).outputs
+    base_outputs = load_heat(base_path).outputs
     incremental_modules = get_incremental_modules(yaml_files)
     errors = []
     for module in incremental_modules:
-        heat = Heat(filepath=module)
+        heat = load_heat(module)
         ips = heat.get_resource_by_type(ContrailV2InstanceIpProcessor.resource_type)
         internal_ips = ((r_id, props) for r_id, props in ips.items() if "_int_" in r_id)
         for r_id, ip in internal_ips:
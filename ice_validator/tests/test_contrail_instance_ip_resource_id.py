@@ -38,7 +38,7 @@
 #
 import pytest
 
-from .structures import Heat
+from .structures import load_heat
 from .structures import ContrailV2InstanceIpProcessor
 from .helpers import validates
 
@@ -48,7 +48,7 @@ VERSION = "2.0.0"
 def run_test(heat_template, regex_names, network_flavor):
     """run test
     """
-    heat = Heat(filepath=heat_template)
+    heat = load_heat(heat_template)
     processor = ContrailV2InstanceIpProcessor
     resource_type = processor.resource_type
     resources = heat.get_resource_by_type(resource_type=resource_type)
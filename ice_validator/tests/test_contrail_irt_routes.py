@@ -63,7 +63,7 @@ import re
 
 import pytest
 
-from .structures import Heat
+from .structures import load_heat
 from .helpers import validates
 
 VERSION = "1.1.0"
@@ -76,7 +76,7 @@ RE_ROUTE_ROUTE_PARAM = re.compile(
 def run_test(heat_template, validate):
     """call validate for each routes route
     """
-    heat = Heat(filepath=heat_template)
+    heat = load_heat(heat_template)
     if not heat.resources:
         pytest.skip("No resources found")
 
@@ -49,7 +49,7 @@ from .structures import ContrailV2ServiceHealthCheckProcessor
 from .structures import ContrailV2ServiceTemplateProcessor
 from .utils.network_roles import get_network_roles
 from .utils.vm_types import get_vm_types
-from .structures import Heat
+from .structures import load_heat
 from .helpers import validates
 
 VERSION = "2.0.0"
@@ -59,7 +59,7 @@ def run_test(heat_template, contrail_class, get_parts, part_name):
     """
     run test
     """
-    heat = Heat(filepath=heat_template)
+    heat = load_heat(heat_template)
     if not heat.resources:
         pytest.skip("No resources found")
     parts = get_parts(heat.resources)
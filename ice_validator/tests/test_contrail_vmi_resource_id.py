@@ -43,7 +43,7 @@ resources:
 """
 import pytest
 
-from .structures import Heat
+from .structures import load_heat
 from .structures import ContrailV2VirtualMachineInterfaceProcessor
 from .helpers import validates
 
@@ -53,7 +53,7 @@ VERSION = "2.0.0"
 def run_test(heat_template, regex_name, network_flavor):
     """run test
     """
-    heat = Heat(filepath=heat_template)
+    heat = load_heat(heat_template)
     heat_object_class = ContrailV2VirtualMachineInterfaceProcessor
     resource_type = heat_object_class.resource_type
     resources = heat.get_resource_by_type(resource_type=resource_type)
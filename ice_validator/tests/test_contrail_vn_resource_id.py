@@ -44,7 +44,7 @@ neutron net resource id
 import pytest
 
 from .helpers import validates
-from .structures import Heat
+from .structures import load_heat
 from .structures import ContrailV2VirtualNetworkProcessor
 
 VERSION = "2.0.0"
@@ -63,7 +63,7 @@ def test_neutron_net_resource_id(yaml_file):
     or
     2) int_{network-role}_RVN`` where RVN represents Resource Virtual
     """
-    heat = Heat(filepath=yaml_file)
+    heat = load_heat(yaml_file)
     heat_object_class = ContrailV2VirtualNetworkProcessor
     resource_type = heat_object_class.resource_type
     resources = heat.get_resource_by_type(resource_type)
@@ -37,10 +37,10 @@
 #
 #
 from .helpers import validates
+from .utils.template_source import listdir
 
 """test_env_and_yaml_same_name
 """
-from os import listdir
 from os import path
 
 VERSION = "1.0.0"
@@ -54,8 +54,7 @@ def test_env_no_resource_registry(env_files):
     **MUST NOT** contain the "resource_registry:" section.
     """
     for filename in env_files:
-        with open(filename) as fi:
-            yml = yaml.load(fi)
+        yml = yaml.load_path(filename)
         assert "resource_registry" not in yml, (
             '%s contains "resource_registry"' % filename
         )
@@ -38,19 +38,15 @@
 #
 """ environment file structure
 """
-import os
-
 import re
 import pytest
-from tests.helpers import (
-    prop_iterator,
-    get_param,
-    get_environment_pair,
-    validates,
-    find_environment_file,
-    categories,
+from tests.helpers import validates, categories
+from tests.structures import load_heat
+from tests.utils.env_parameters import (
+    get_env_parameter_table,
+    get_environment_parameters,
+    is_enumerated,
 )
-from tests.structures import Heat
 from tests.utils.nested_files import file_is_a_nested_template
 
 
@@ -160,51 +156,27 @@ ENV_PARAMETER_SPEC = {
 
 
 def run_test_parameter(yaml_file, resource_type, *prop, **kwargs):
-    template_parameters = []
-    invalid_parameters = []
-    param_spec = {}
-    parameter_spec = ENV_PARAMETER_SPEC.get(
-        resource_type
-    )  # matching spec dict on resource type
-    for spec in parameter_spec:
-        # iterating through spec dict and trying to match on property
-        if spec.get("property") == prop:
-            yep = True
-            for (
-                k,
-                v,
-            ) in (
-                kwargs.items()
-            ):  # now matching on additional kwargs passed in from test (i.e. network_type)
-                if not spec.get(k) or spec.get(k) != v:
-                    yep = False
-            if yep:
-                param_spec = spec
-                if resource_type == "PLATFORM PROVIDED":
-                    if file_is_a_nested_template(yaml_file):
-                        pytest.skip(
-                            "Not checking nested files for PLATFORM PROVIDED params"
-                        )
-                    template_parameters.append(
-                        {"resource": "", "param": param_spec.get("property")[0]}
-                    )
-                else:
-                    all_resources = False
-                    if resource_type == "ALL":
-                        all_resources = True
-                    template_parameters = get_template_parameters(
-                        yaml_file,
-                        resource_type,
-                        param_spec,
-                        all_resources=all_resources,
-                    )  # found the correct spec, proceeding w/ test
-                break
+    table = get_env_parameter_table([ENV_PARAMETER_SPEC])
+    rule = table.find_rule(resource_type, prop, **kwargs)
+    if rule is None:
+        return
+    spec = table.rules[rule][1]
+    if resource_type == "PLATFORM PROVIDED":
+        if file_is_a_nested_template(yaml_file):
+            pytest.skip("Not checking nested files for PLATFORM PROVIDED params")
+        template_parameters = [{"resource": "", "param": prop[0]}]
+    else:
+        template_parameters = table.collect(yaml_file).for_rule(rule)
 
+    invalid_parameters = []
+    persistence = spec.get("persistent")
     for parameter in template_parameters:
         param = parameter.get("param")
-        persistence = param_spec.get("persistent")
+        env_parameters = get_environment_parameters(yaml_file)
+        if env_parameters is None:  # this is a nested file perhaps?
+            pytest.skip("unable to determine environment file for nested yaml file")
 
-        if env_violation(yaml_file, param, spec.get("persistent")):
+        if is_enumerated(param, env_parameters) != bool(persistence):
             human_text = "must" if persistence else "must not"
             human_text2 = "was not" if persistence else "was"
 
@@ -226,21 +198,14 @@ def get_preload_excluded_parameters(yaml_file, persistent_only=False, env_spec=N
     if persistent_only only parameters that are marked as persistent will
     be excluded
     """
-    env_spec = env_spec or ENV_PARAMETER_SPEC
-    results = []
-    for resource_type, specs in env_spec.items():
-        # apply to all resources if not in the format of an OpenStack resource
-        all_resources = "::" not in resource_type
-        for spec in specs:
-            if persistent_only and not spec.get("persistent"):
-                continue
-            results.extend(
-                get_template_parameters(
-                    yaml_file, resource_type, spec, all_resources, nested_resources=True
-                )
-            )
-    results = {item["param"] for item in results}
-    for param in Heat(yaml_file).parameters:
+    table = get_env_parameter_table([env_spec or ENV_PARAMETER_SPEC])
+    template_parameters = table.collect(yaml_file, nested_resources=True)
+    results = set()
+    for rule, (resource_type, spec) in enumerate(table.rules):
+        if persistent_only and not spec.get("persistent"):
+            continue
+        results.update(p["param"] for p in template_parameters.for_rule(rule))
+    for param in load_heat(yaml_file).parameters:
         # AZs often are manipulated and passed into nested templates making
         # them difficult to detect by looking for the assignment.  We'll
         # just extract them from the parameters if they are there to be safe
@@ -249,68 +214,6 @@ def get_preload_excluded_parameters(yaml_file, persistent_only=False, env_spec=N
     return results
 
 
-def get_template_parameters(
-    yaml_file, resource_type, spec, all_resources=False, nested_resources=False
-):
-    parameters = []
-
-    heat = Heat(yaml_file)
-    if all_resources:
-        resources = heat.resources if not nested_resources else heat.get_all_resources()
-    else:
-        resources = heat.get_resource_by_type(
-            resource_type, all_resources=nested_resources
-        )
-    for rid, resource_props in resources.items():
-        for param in prop_iterator(resource_props, *spec.get("property")):
-            if param and get_param(param) and param_helper(spec, get_param(param), rid):
-                # this is first getting the param
-                # then checking if its actually using get_param
-                # then checking a custom helper function (mostly for internal vs external networks)
-                parameters.append({"resource": rid, "param": get_param(param)})
-    return parameters
-
-
-def env_violation(yaml_file, parameter, persistent):
-    # Returns True IF there's a violation, False if everything looks good.
-
-    filepath, filename = os.path.split(yaml_file)
-    environment_pair = get_environment_pair(yaml_file)
-    if not environment_pair:  # this is a nested file perhaps?
-        environment_pair = find_environment_file(
-            yaml_file
-        )  # we want to check parent env
-        if not environment_pair:
-            pytest.skip("unable to determine environment file for nested yaml file")
-
-    env_yaml = environment_pair.get("eyml")
-    parameters = env_yaml.get("parameters", {})
-    in_env = False
-    if parameters:  # env file can be just parameters:
-        for param, value in parameters.items():
-            if re.match(parameter, param):
-                in_env = True
-                break
-
-    # confusing return. This function is looking for a violation.
-    return not persistent == in_env
-
-
-def param_helper(spec, param, rid):
-    # helper function that has some predefined additional
-    # checkers, mainly to figure out if internal/external network
-    keeper = True
-    for k, v in spec.get("kwargs").items():
-        if k == "exclude_resource" and re.match(v, rid):
-            keeper = False
-            break
-        elif k == "exclude_parameter" and re.match(v, param):
-            keeper = False
-            break
-
-    return keeper
-
-
 @validates("R-91125")
 def test_nova_server_image_parameter_exists_in_environment_file(yaml_file):
     run_test_parameter(yaml_file, "OS::Nova::Server", "image")
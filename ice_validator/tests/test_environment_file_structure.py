@@ -56,7 +56,6 @@ def test_environment_file_contains_required_sections(env_file):
     """
     required_keys = ["parameters"]
 
-    with open(env_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(env_file)
     missing_keys = [v for v in required_keys if v not in yml]
     assert not missing_keys, "%s missing %s" % (env_file, missing_keys)
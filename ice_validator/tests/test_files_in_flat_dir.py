@@ -37,12 +37,14 @@
 import os
 
 from tests.helpers import validates
+from tests.utils import template_source
 
 
 @validates("R-511776", "R-99646")
 def test_files_in_flat_dir(template_dir):
-    paths = (os.path.join(template_dir, p) for p in os.listdir(template_dir))
-    nested_dirs = (p for p in paths if os.path.isdir(p))
+    names = template_source.listdir(template_dir)
+    paths = (os.path.join(template_dir, p) for p in names)
+    nested_dirs = (p for p in paths if template_source.isdir(p))
     nested_dirs = [os.path.relpath(p, template_dir) for p in nested_dirs]
     msg = (
         "Sub-directories are not allowed in a Heat package. The following "
@@ -41,7 +41,7 @@
 forbidden resources
 """
 
-from .structures import Heat
+from .structures import load_heat
 from .helpers import validates
 
 
@@ -51,7 +51,7 @@ VERSION = "1.1.1"
 def run_test(heat_template, forbidden):
     """run
     """
-    heat = Heat(filepath=heat_template)
+    heat = load_heat(heat_template)
     bad = set()
     for rid, resource in heat.resources.items():
         if heat.nested_get(resource, "type") == forbidden:
@@ -2,9 +2,12 @@ import os
 
 import pytest
 
-from tests.helpers import validates, traverse, load_yaml
+from tests.helpers import validates, load_yaml
 from tests.structures import Resource
 from tests.utils import nested_dict
+from tests.utils.template_visitor import register, visit
+
+register("get_attr")
 
 
 class GetAttrValidator:
@@ -82,5 +85,5 @@ def test_08_validate_get_attr_usage(yaml_file):
     yml = load_yaml(yaml_file)
     base_dir, _ = os.path.split(yaml_file)
     validator = GetAttrValidator(yml, base_dir)
-    traverse(yml, "get_attr", validator)
+    visit(yml).for_each("get_attr", validator)
     assert not validator.errors, validator.error_message
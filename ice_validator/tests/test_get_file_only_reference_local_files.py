@@ -39,7 +39,6 @@
 """test get_file
 """
 import re
-from os import listdir
 from os import path
 from os import sep
 
@@ -48,6 +47,7 @@ from tests import cached_yaml as yaml
 
 from .helpers import validates
 from .utils.nested_iterables import find_all_get_file_in_yml
+from .utils.template_source import listdir
 
 VERSION = "1.0.0"
 
@@ -63,14 +63,13 @@ def test_get_file_no_url_retrieval(yaml_file):
     """
     is_url = re.compile(r"(?:http|https|file|ftp|ftps)://.+")
 
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if parameters are not defined
     if "resources" not in yml:
         pytest.skip("No resources specified in the heat template")
 
-    get_files = find_all_get_file_in_yml(yml["resources"])
+    get_files = find_all_get_file_in_yml(yml, section="resources")
 
     invalid_files = []
     for get_file in get_files:
@@ -96,14 +95,13 @@ def test_get_file_only_reference_local_files(yaml_file):
     is_url = re.compile(r"(?:http|https|file|ftp|ftps)://.+")
     base_dir, filename = path.split(yaml_file)
 
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if parameters are not defined
     if "resources" not in yml:
         pytest.skip("No resources specified in the heat template")
 
-    get_files = find_all_get_file_in_yml(yml["resources"])
+    get_files = find_all_get_file_in_yml(yml, section="resources")
 
     invalid_files = []
     for get_file in get_files:
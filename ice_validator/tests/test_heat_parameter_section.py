@@ -58,8 +58,7 @@ def test_default_values(yaml_file):
     """
     Make sure no default values are set for any parameter.
     """
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if parameters are not defined
     if "parameters" not in yml:
@@ -85,8 +84,7 @@ def test_parameter_names(yaml_file):
     (i.e., <param name>) **MUST** contain only alphanumeric
     characters and underscores ('_').
     """
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if parameters are not defined
     if "parameters" not in yml:
@@ -52,8 +52,7 @@ def test_heat_template_parameters_contain_required_fields(yaml_file):
     """
     required_keys = {"type", "description"}
 
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if parameters are not defined
     if "parameters" not in yml:
@@ -99,8 +99,7 @@ def test_parameter_type(yaml_file):
     be one of the following values:
     """
     types = ["string", "number", "json", "comma_delimited_list", "boolean"]
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
     for key, param in yml.get("parameters", {}).items():
         assert isinstance(param, dict), "%s parameter %s is not dict" % (yaml_file, key)
         if "type" not in param:
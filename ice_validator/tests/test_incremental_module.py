@@ -39,7 +39,7 @@ import os
 from tests.helpers import validates
 from tests.utils.incrementals import is_incremental_module
 
-from tests.structures import Heat
+from tests.structures import load_heat
 
 
 @validates("R-610030")
@@ -47,10 +47,10 @@ def test_incremental_module_has_server(yaml_files):
     modules = (f for f in yaml_files if is_incremental_module(f, yaml_files))
     errors = []
     for module in modules:
-        servers = Heat(filepath=module).get_resource_by_type(
+        servers = load_heat(module).get_resource_by_type(
             "OS::Nova::Server", all_resources=True
         )
-        volumes = Heat(filepath=module).get_resource_by_type(
+        volumes = load_heat(module).get_resource_by_type(
             "OS::Cinder::Volume", all_resources=True
         )
         if not (servers or volumes):
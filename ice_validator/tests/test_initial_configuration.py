@@ -42,9 +42,10 @@ from yaml import YAMLError
 from yaml.constructor import ConstructorError
 
 from tests import cached_yaml as yaml
-from tests.utils import yaml_custom_utils
+from tests.utils import template_source, yaml_custom_utils
 
 from tests.helpers import validates, load_yaml
+from tests.structures import get_nested_graph, load_heat
 from tests.utils.nested_files import check_for_invalid_nesting
 from tests.utils.nested_iterables import find_all_get_resource_in_yml
 from tests.utils.nested_iterables import find_all_get_param_in_yml
@@ -69,7 +70,7 @@ def check_duplicate_keys(yaml_path):
     import yaml as normal_yaml
 
     try:
-        with open(yaml_path) as fh:
+        with template_source.open_file(yaml_path) as fh:
             normal_yaml.load(fh, yaml_custom_utils.UniqueKeyLoader)  # nosec
     except ConstructorError as e:
         pytest.fail("{} {}".format(e.problem, e.problem_mark))
@@ -94,8 +95,7 @@ def test_03_all_referenced_resources_exists(yaml_file):
     Check that all resources referenced by get_resource
     actually exists in all yaml files
     """
-    with open(yaml_file) as fh:
-        yml = yaml.safe_load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if resources are not defined
     if "resources" not in yml:
@@ -129,9 +129,20 @@ def test_04_valid_nesting(yaml_file):
     """
     invalid_nesting = []
 
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
     if "resources" in yml:
+        try:
+            cycles = get_nested_graph(path.dirname(yaml_file)).get_cycles(
+                load_heat(yaml_file)
+            )
+        except Exception:
+            cycles = []  # missing or invalid nested files are reported below
+        assert not cycles, (
+            "Nested templates must not nest themselves directly or "
+            "indirectly: {}".format(
+                "; ".join(" -> ".join(path.basename(p) for p in c) for c in cycles)
+            )
+        )
         try:
             invalid_nesting.extend(
                 check_for_invalid_nesting(
@@ -154,8 +165,7 @@ def test_05_all_get_param_have_defined_parameter(yaml_file):
     as parameters
     """
     invalid_get_params = []
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     resource_params = find_all_get_param_in_yml(yml)
 
@@ -37,7 +37,7 @@
 import re
 
 from tests.helpers import validates, check_indices
-from tests.structures import Heat
+from tests.structures import load_heat
 from tests.utils import nested_dict
 
 
@@ -46,7 +46,7 @@ IP_PARAM_PATTERN = re.compile(r"^(.*_ip_)(\d+)$")
 
 @validates("R-71577", "R-40971")
 def test_ips_start_at_0(yaml_file):
-    heat = Heat(filepath=yaml_file)
+    heat = load_heat(yaml_file)
     ports = heat.get_resource_by_type("OS::Neutron::Port")
     ip_parameters = []
 
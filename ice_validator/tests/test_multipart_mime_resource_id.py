@@ -44,7 +44,7 @@ Resource ID **MUST** contain the ``{vm-type}``.
 
 import pytest
 
-from .structures import Heat
+from .structures import load_heat
 from .helpers import validates
 from .utils import vm_types
 
@@ -55,7 +55,7 @@ VERSION = "1.0.1"
 def test_multipart_mime(yaml_file):
     """validate resource ids
     """
-    h = Heat(filepath=yaml_file)
+    h = load_heat(yaml_file)
     if not h.resources:
         pytest.skip("No resources in this template")
 
@@ -38,7 +38,10 @@
 #
 import os
 
-from tests.helpers import validates, traverse, load_yaml
+from tests.helpers import validates, load_yaml
+from tests.utils.template_visitor import register, visit
+
+register("get_param")
 
 
 def is_get_param(arg):
@@ -78,5 +81,5 @@ class GetParamChecker:
 def test_nested_parameter_args(yaml_file):
     heat = load_yaml(yaml_file)
     checker = GetParamChecker(yaml_file)
-    traverse(heat, "get_param", checker)
+    visit(heat).for_each("get_param", checker)
     assert not checker.errors, ". ".join(checker.errors)
@@ -57,8 +57,7 @@ def check_nested_parameter_doesnt_change(yaml_file, nresource_type, *nprops):
     base_dir, _ = os.path.split(yaml_file)
     invalid_parameters = []
 
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if resources are not defined
     if "resources" not in yml:
@@ -43,7 +43,7 @@ import os.path
 
 import pytest
 
-from .structures import Heat
+from .structures import load_heat
 from .helpers import validates
 from .utils import nested_files
 
@@ -57,7 +57,7 @@ def validate_parms(dirname, basename, nested, nested_props, prop_type):
     bad = []
     for rid, nested_filename in nested.items():
         nested_filepath = os.path.join(dirname, nested_filename)
-        nested_heat = Heat(filepath=nested_filepath)
+        nested_heat = load_heat(nested_filepath)
         parms = set(nested_heat.parameters.keys())
         props = nested_props.get(rid, set())
         missing = parms - props
@@ -85,7 +85,7 @@ def test_nested_template_parameters(yaml_file):
     the nested yaml file.
     """
     dirname, basename = os.path.split(yaml_file)
-    heat = Heat(filepath=yaml_file)
+    heat = load_heat(yaml_file)
     if not heat.resources:
         pytest.skip("No resources found")
     nested_type = nested_files.get_type_nested_files(heat.yml, dirname)
@@ -35,7 +35,7 @@
 #
 # ============LICENSE_END============================================
 
-from .structures import Heat
+from .structures import load_heat
 from .utils import nested_files
 from .helpers import validates
 
@@ -46,7 +46,7 @@ def test_nesting_level(yaml_files):
     non_nested_files = [
         f for f in yaml_files if not nested_files.file_is_a_nested_template(f)
     ]
-    heats = [Heat(f) for f in non_nested_files]
+    heats = [load_heat(f) for f in non_nested_files]
     for heat in heats:
         for depth, nested_heat in heat.iter_nested_heat():
             if depth >= 3:
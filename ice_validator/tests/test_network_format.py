@@ -41,7 +41,7 @@ from itertools import chain
 import re
 
 from tests import cached_yaml as yaml
-from tests.structures import Heat
+from tests.structures import load_heat
 
 from tests.helpers import validates
 
@@ -51,7 +51,7 @@ NETWORK_RESOURCE_TYPES = ["OS::Neutron::Net", "OS::ContrailV2::VirtualNetwork"]
 
 @validates("R-16968")
 def test_network_resource_id_format(yaml_file):
-    heat = Heat(yaml_file)
+    heat = load_heat(yaml_file)
     network_ids = chain.from_iterable(
         heat.get_resource_by_type(t) for t in NETWORK_RESOURCE_TYPES
     )
@@ -74,8 +74,7 @@ def test_network_has_subnet(yaml_file):
     corresponding subnet that references it
     """
 
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     networks = []
 
@@ -44,7 +44,7 @@ neutron net resource id
 import pytest
 
 from .helpers import validates
-from .structures import Heat
+from .structures import load_heat
 from .structures import NeutronNetProcessor
 
 VERSION = "2.0.0"
@@ -60,7 +60,7 @@ def test_neutron_net_resource_id(yaml_file):
 
     * int_{network-role}_network
     """
-    heat = Heat(filepath=yaml_file)
+    heat = load_heat(yaml_file)
     neutron_nets = heat.get_resource_by_type(NeutronNetProcessor.resource_type)
     if not neutron_nets:
         pytest.skip("No neutron nets found")
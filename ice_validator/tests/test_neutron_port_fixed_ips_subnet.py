@@ -41,7 +41,7 @@ import re
 
 from tests.utils.network_roles import get_network_type_from_port
 
-from tests.structures import Heat
+from tests.structures import load_heat
 from tests.helpers import validates, load_yaml, get_base_template_from_yaml_files, get_param
 from tests.utils.nested_files import get_nested_files
 from .utils.ports import check_parameter_format
@@ -107,7 +107,7 @@ def test_neutron_port_internal_fixed_ips_subnet_in_base(yaml_files):
     for yaml_file in yaml_files:
         if yaml_file == base_path or yaml_file in nested_template_paths:
             continue  # Only applies to incremental modules
-        heat = Heat(filepath=yaml_file)
+        heat = load_heat(yaml_file)
         internal_ports = {
             r_id: p
             for r_id, p in heat.neutron_port_resources.items()
@@ -5,7 +5,7 @@ import pytest
 
 from tests.helpers import validates, get_base_template_from_yaml_files, get_param
 from tests.utils.nested_files import get_nested_files
-from tests.structures import Heat
+from tests.structures import load_heat
 
 
 INTERNAL_UUID_PATTERN = re.compile(r"^int_(?P<network_role>.+?)_net_id$")
@@ -35,14 +35,14 @@ def test_internal_network_parameters(yaml_files):
     base_path = get_base_template_from_yaml_files(yaml_files)
     if not base_path:
         pytest.skip("No base module found")
-    base_heat = Heat(filepath=base_path)
+    base_heat = load_heat(base_path)
     nested_paths = get_nested_files(yaml_files)
     incremental_modules = [
         f for f in yaml_files if is_incremental_module(f, base_path, nested_paths)
     ]
     errors = []
     for module in incremental_modules:
-        heat = Heat(filepath=module)
+        heat = load_heat(module)
         for rid, port in heat.neutron_port_resources.items():
             rid_match = INTERNAL_PORT.match(rid)
             if not rid_match:
@@ -125,7 +125,7 @@ def test_internal_network_parameters(yaml_files):
 
 @validates("R-62983")
 def test_external_network_parameter(heat_template):
-    heat = Heat(filepath=heat_template)
+    heat = load_heat(heat_template)
     errors = []
     for rid, port in heat.neutron_port_resources.items():
         rid_match = EXTERNAL_PORT.match(rid)
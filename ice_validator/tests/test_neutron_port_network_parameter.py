@@ -50,8 +50,7 @@ def test_neutron_port_network_param_is_string(yaml_file):
     Make sure all network properties use the allowed naming
     conventions
     """
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if resources are not defined
     if "resources" not in yml:
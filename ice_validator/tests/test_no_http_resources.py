@@ -54,8 +54,7 @@ def test_no_http_resources(yaml_file):
     yaml files"""
     is_url = re.compile(r"(?:http|https|file|ftp|ftps)://.+")
 
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if parameters are not defined
     if "resources" not in yml:
@@ -37,6 +37,7 @@
 import os
 
 from tests.helpers import validates
+from tests.utils.template_source import listdir
 
 
 INVALID_EXTS = {
@@ -59,7 +60,7 @@ INVALID_EXTS = {
 
 @validates("R-348813")
 def test_no_image_files_included(template_dir):
-    filenames = (f.lower() for f in os.listdir(template_dir))
+    filenames = (f.lower() for f in listdir(template_dir))
     exts = {os.path.splitext(f)[1] for f in filenames}
     bad_exts = exts.intersection(INVALID_EXTS)
     msg = (
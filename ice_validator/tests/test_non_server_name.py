@@ -43,7 +43,7 @@ resource property name
 import os
 import collections
 
-from .structures import Heat
+from .structures import load_heat
 from .structures import HeatProcessor
 from .helpers import validates
 from tests.utils import nested_files
@@ -72,7 +72,7 @@ def test_non_server_name(yaml_file):
     supplied metadata parameter ``vnf_name`` to generate a unique value.
 
     """
-    h = Heat(filepath=yaml_file)
+    h = load_heat(yaml_file)
     non_servers = get_non_servers(h)
 
     bad = []
@@ -151,7 +151,7 @@ def test_non_server_name_unique(heat_template):
     list_nest.append(heat_template)
     non_servers = {}
     for yaml_file in list_nest:
-        h = Heat(filepath=yaml_file)
+        h = load_heat(yaml_file)
         non_servers.update(get_non_servers(h))
     names = collections.defaultdict(set)
     for rid, resource in non_servers.items():
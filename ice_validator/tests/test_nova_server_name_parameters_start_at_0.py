@@ -37,7 +37,7 @@
 import re
 
 from tests.helpers import check_indices, validates
-from tests.structures import Heat
+from tests.structures import load_heat
 
 
 SERVER_NAME_PARAM = re.compile(r"(.*_name_)(\d+)")
@@ -45,7 +45,7 @@ SERVER_NAME_PARAM = re.compile(r"(.*_name_)(\d+)")
 
 @validates("R-54171")
 def test_nova_server_name_parameter_starts_at(yaml_file):
-    params = Heat(yaml_file).parameters
+    params = load_heat(yaml_file).parameters
     invalid_params = check_indices(
         SERVER_NAME_PARAM, params, "OS::Nova::Server Name Parameters"
     )
@@ -41,7 +41,7 @@ resources:
 {vm-type}_server_{vm-type_index}
 """
 import pytest
-from .structures import Heat
+from .structures import load_heat
 from .structures import NovaServerProcessor
 from .helpers import validates
 
@@ -60,7 +60,7 @@ def test_nova_server_resource_id(yaml_file):
     * ``{vm-type}_server_{index}``
 
     """
-    heat = Heat(filepath=yaml_file)
+    heat = load_heat(yaml_file)
     resources = heat.nova_server_resources
     if not resources:
         pytest.skip("No Nova Server resources found")
@@ -60,8 +60,7 @@ def test_environment_context(yaml_file):
     metadata map value parameter 'environment_context' **MUST**
     be declared as type: 'string'.
     """
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     if "parameters" not in yml:
         pytest.skip("No parameters specified in the heat template")
@@ -48,8 +48,7 @@ def test_nova_servers_valid_resource_ids(yaml_file):
     Make sure all nova servers have valid resource ids
     """
 
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if resources are not defined
     if "resources" not in yml:
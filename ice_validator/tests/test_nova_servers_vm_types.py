@@ -55,8 +55,7 @@ def test_vm_type_consistent_on_nova_servers(yaml_file):
     Make sure all nova servers have properly formatted properties
     for their name, image and flavor
     """
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if resources are not defined
     if "resources" not in yml:
@@ -79,8 +78,7 @@ def test_vm_type_consistent_on_nova_servers(yaml_file):
 
 @validates("R-48067", "R-00977")
 def test_vm_type_network_role_collision(yaml_file):
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if resources are not defined
     if "resources" not in yml:
@@ -136,8 +134,7 @@ def check_nova_parameter_format(prop, yaml_file):
         "comma_delimited_list": {"name": re.compile(r"(.+?)_names$")},
     }
 
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if resources are not defined
     if "resources" not in yml:
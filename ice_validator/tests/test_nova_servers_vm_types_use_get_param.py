@@ -48,8 +48,7 @@ def test_vm_type_assignments_on_nova_servers_only_use_get_param(yaml_file):
     """
     Make sure all nova servers only use get_param for their properties
     """
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if resources are not defined
     if "resources" not in yml:
@@ -38,7 +38,7 @@
 import os
 
 from tests.helpers import validates
-from tests.structures import Heat
+from tests.structures import load_heat
 
 MSG = (
     "OAM management address can be declared as output in at most 1 template. "
@@ -47,7 +47,7 @@ MSG = (
 
 
 def find_output_param(param, templates):
-    templates = (t for t in templates if param in Heat(t).outputs)
+    templates = (t for t in templates if param in load_heat(t).outputs)
     return [os.path.basename(t) for t in templates]
 
 
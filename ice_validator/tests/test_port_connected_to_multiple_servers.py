@@ -39,7 +39,7 @@ from collections import defaultdict
 import pytest
 
 from tests.helpers import validates
-from tests.structures import Heat, Resource
+from tests.structures import Resource, load_heat
 
 
 @validates("R-92635")
@@ -48,7 +48,7 @@ def test_port_connected_to_multiple_servers(yaml_file):
     SDC will throw an error if a single port is connected to more than
     one server.  This test detects that condition and logs a test failure.
     """
-    heat = Heat(yaml_file)
+    heat = load_heat(yaml_file)
     if not heat.resources:
         pytest.skip("No resources")
 
@@ -59,8 +59,7 @@ def test_port_resource_ids(yaml_file):
     nova server it is associated to and also contains the
     {network_role} of the network it is associated with
     """
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if resources are not defined
     if "resources" not in yml:
@@ -45,8 +45,7 @@ from .helpers import validates
 
 def check_parameters_no_constraints(yaml_file, parameter):
 
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     param = yml.get("parameters", {}).get(parameter)
     if not param:
@@ -49,8 +49,7 @@ from .helpers import validates
 def test_alphanumeric_resource_ids_only(yaml_file):
     valid_format = re.compile(r"^[\w-]+$")
 
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     if "resources" not in yml:
         pytest.skip("No resources specified in the heat template")
@@ -37,7 +37,7 @@
 #
 import collections
 from itertools import chain
-from .structures import Heat
+from .structures import load_heat
 from .helpers import validates
 
 
@@ -52,7 +52,7 @@ def has_next(seq, index):
 
 @validates("R-11690")
 def test_indices_start_at_0_increment(yaml_files):
-    resources_ids = chain.from_iterable(Heat(f).resources.keys() for f in yaml_files)
+    resources_ids = chain.from_iterable(load_heat(f).resources.keys() for f in yaml_files)
     prefix_indices = collections.defaultdict(set)
     for r_id in resources_ids:
         parts = r_id.split("_")
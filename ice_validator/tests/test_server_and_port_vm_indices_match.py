@@ -38,7 +38,7 @@
 import re
 
 from tests.helpers import validates
-from tests.structures import Heat
+from tests.structures import load_heat
 from tests.utils import nested_dict
 
 SERVER_ID_PATTERN = re.compile(r"\w+_server_(\d+)")
@@ -60,7 +60,7 @@ def test_server_and_port_vmtype_indices_match(yaml_file):
     # match between the between the ports and server names.  Other
     # tests already cover the other aspects of this requirement
 
-    heat = Heat(filepath=yaml_file)
+    heat = load_heat(yaml_file)
     servers = heat.get_resource_by_type("OS::Nova::Server")
     errors = []
     for r_id, server in servers.items():
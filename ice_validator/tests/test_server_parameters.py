@@ -53,8 +53,7 @@ def check_parameter_type(heat_template, parameter, parameter_type):
     the correct type
     """
 
-    with open(heat_template) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(heat_template)
 
     # skip if resources are not defined
     if "parameters" not in yml:
@@ -92,8 +91,7 @@ def check_server_parameter_name(heat_template, parameter, parameter_name):
     uses the same parameter name w/ get_param
     """
 
-    with open(heat_template) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(heat_template)
 
     # skip if resources are not defined
     if "resources" not in yml:
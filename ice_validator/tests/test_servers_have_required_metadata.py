@@ -48,8 +48,7 @@ def test_servers_have_required_metadata(yaml_file):
     Check all defined nova server instances have the required metadata:
     vnf_id, vf_module_id, and vnf_name
     """
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     if "resources" not in yml:
         pytest.skip("No resources specified in the heat template")
@@ -49,8 +49,7 @@ def check_servers_metadata_use_get_param(yaml_file, md):
     metadata via the get_param function
     """
 
-    with open(yaml_file) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(yaml_file)
 
     # skip if resources are not defined
     if "resources" not in yml:
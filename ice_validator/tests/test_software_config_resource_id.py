@@ -44,7 +44,7 @@ resources:
 
 import pytest
 
-from .structures import Heat
+from .structures import load_heat
 from .helpers import validates
 
 VERSION = "1.1.0"
@@ -58,7 +58,7 @@ def test_software_config_vm_type(yaml_file):
     A VNF's Heat Orchestration Template's Resource OS::Heat::SoftwareConfig
     Resource ID **MUST** contain the {vm-type}.
     """
-    heat = Heat(filepath=yaml_file)
+    heat = load_heat(yaml_file)
     software_configs = heat.get_resource_by_type("OS::Heat::SoftwareConfig")
     if not software_configs:
         pytest.skip("No SoftwareConfig resources found")
@@ -53,8 +53,7 @@ def test_unique_resources_across_all_yaml_files(yaml_files):
     """
     resources_ids = collections.defaultdict(set)
     for yaml_file in yaml_files:
-        with open(yaml_file) as fh:
-            yml = yaml.load(fh)
+        yml = yaml.load_path(yaml_file)
         if "resources" not in yml:
             continue
         for resource_id in yml["resources"]:
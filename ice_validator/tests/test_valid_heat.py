@@ -34,109 +34,33 @@
 # limitations under the License.
 #
 # ============LICENSE_END============================================
-import mock
 import os
 import pytest
 
-from heat.common import template_format
-from heat.engine import resources
-from heat.engine import service
-from heat.tests.openstack.nova import fakes as fakes_nova
-from heat.tests import utils
-
 from tests import cached_yaml as yaml
-from tests.utils.nested_files import get_list_of_nested_files
+from tests.heat_validation import HEAT_POOL, get_validator
 from tests.helpers import categories, validates
 
 
-def load_file(filename, file_cache):
-    basename = os.path.basename(filename)
-    if basename not in file_cache:
-        with open(filename, "r") as fh:
-            file_cache[basename] = fh.read()
-
-    return file_cache[basename]
-
-
-def generate_parameters(yml_data):
-    parameters = yml_data.get("parameters", {})
-    dummy_params = {}
-
-    for p, v in parameters.items():
-        param_type = v.get("type", "")
-        if param_type == "comma_delimited_list":
-            param = "1,2,3"
-        elif param_type == "string":
-            param = "123"
-        elif param_type == "json":
-            param = {"abc": "123"}
-        elif param_type == "number":
-            param = 123
-        elif param_type == "boolean":
-            param = True
-        else:
-            param = "123"
-        dummy_params[p] = param
-
-    return {"parameters": dummy_params}
-
-
-class HOTValidator:
-    def __init__(self, yaml_file, files, yml_data):
-        resources.initialise()
-        self.fc = fakes_nova.FakeClient()
-        self.gc = fakes_nova.FakeClient()
-        resources.initialise()
-        self.ctx = utils.dummy_context()
-        self.mock_isa = mock.patch(
-            "heat.engine.resource.Resource.is_service_available",
-            return_value=(True, None),
-        )
-        self.mock_is_service_available = self.mock_isa.start()
-        self.engine = service.EngineService("a", "t")
-
-        self.yaml_file = yaml_file
-        self.files = files
-        self.yml_data = yml_data
-
-    def validate_heat(self):
-        ymldata = load_file(self.yaml_file, self.files)
-        parameters = generate_parameters(self.yml_data)
-
-        t = template_format.parse(ymldata)
-
-        try:
-            res = dict(
-                self.engine.validate_template(
-                    self.ctx, t, files=self.files, params=parameters, show_nested=False
-                )
-            )
-        except Exception as e:
-            res = {"Error": e.__context__}
-
-        if isinstance(res, dict) and "Error" in res:
-            return res.get("Error")
-        else:
-            return None
+@pytest.fixture(scope="session")
+def heat_validator():
+    """
+    Validator shared by every test in the process.  Uses the pool of Heat
+    worker processes if one was requested with ``--heat-workers``.
+    """
+    return HEAT_POOL if HEAT_POOL.enabled else get_validator()
 
 
 @validates("R-92635")
 @categories("openstack")
-def test_heat(yaml_file):
-    with open(yaml_file, "r") as f:
-        yml = yaml.load(f)
+def test_heat(yaml_file, heat_validator):
+    yml = yaml.load_path(yaml_file)
 
     # skip if resources are not defined
     if "resources" not in yml:
         pytest.skip("No resources specified in the heat template")
 
-    files = {}
-    dirname = os.path.dirname(yaml_file)
-    for file in set(get_list_of_nested_files(yaml_file, dirname)):
-        load_file(file, files)
-
-    validator = HOTValidator(yaml_file, files, yml)
-    msg = validator.validate_heat()
+    msg = heat_validator.validate_file(yaml_file, yml)
 
     assert not msg, "Invalid OpenStack Heat detected in {}: {}".format(
         os.path.basename(yaml_file), msg
@@ -34,29 +34,18 @@
 # limitations under the License.
 #
 # ============LICENSE_END============================================
-from tests.helpers import validates, traverse
-from tests.structures import Heat
+from tests.helpers import validates
+from tests.structures import load_heat
+from tests.utils.template_visitor import register, visit
 
-
-class Finder:
-    """
-    If called sets found flag to True (used by traverse in uses_vf_module_index
-    """
-
-    def __init__(self):
-        self.found = False
-
-    def __call__(self, path, value):
-        self.found = True
+register("vf_module_index")
 
 
 def uses_vf_module_index(prop_value):
     """
     Returns True if prop_value uses vf_module_index, False otherwise
     """
-    finder = Finder()
-    traverse(prop_value, "vf_module_index", finder)
-    return finder.found
+    return bool(visit(prop_value).find("vf_module_index"))
 
 
 def check_vf_module_index_errors(yaml_file, resource_type, property):
@@ -64,7 +53,7 @@ def check_vf_module_index_errors(yaml_file, resource_type, property):
     Finds all resources of resource_type where the property uses vf_module_index and
     returns a set of all resource IDs that violate the condition.
     """
-    resources = Heat(yaml_file).get_resource_by_type(resource_type)
+    resources = load_heat(yaml_file).get_resource_by_type(resource_type)
     errors = set()
     for r_id, resource in resources.items():
         if (
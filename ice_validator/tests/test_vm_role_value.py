@@ -41,7 +41,7 @@ import pytest
 from six import string_types
 
 from tests.helpers import validates, get_environment_pair
-from tests.structures import Heat
+from tests.structures import load_heat
 
 
 @validates("R-86476")
@@ -49,7 +49,7 @@ def test_vm_role_hardcoded(yaml_file):
     """
     Validate vm_role value when hardcoded in the template
     """
-    heat = Heat(filepath=yaml_file)
+    heat = load_heat(yaml_file)
     servers = heat.get_resource_by_type("OS::Nova::Server")
     errors = []
     for r_id, server in servers.items():
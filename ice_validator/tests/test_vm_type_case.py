@@ -65,7 +65,7 @@ resources:
 import collections
 import re
 
-from .structures import Heat
+from .structures import load_heat
 from .helpers import validates
 
 VERSION = "1.2.0"
@@ -97,7 +97,7 @@ def test_vm_type_case(yaml_file):
     A VNF's Heat Orchestration Template's use of ``{vm-type}`` in all Resource
     property parameter names **MUST** be the same case.
     """
-    heat = Heat(filepath=yaml_file)
+    heat = load_heat(yaml_file)
     resources = heat.resources
     bad = collections.defaultdict(list)
     for rid, resource in resources.items():
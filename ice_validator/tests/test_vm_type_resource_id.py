@@ -42,7 +42,7 @@
 
 import pytest
 
-from .structures import Heat
+from .structures import load_heat
 from .helpers import validates
 from .utils import vm_types as utils_vm_types
 
@@ -56,7 +56,7 @@ def test_vm_type_resource_id(yaml_file):
     in all Resource IDs **MUST** be the same case.
     """
     bad = {}
-    h = Heat(filepath=yaml_file)
+    h = load_heat(yaml_file)
     if not h.resources:
         pytest.skip("No resources specified in the heat template")
     vm_types = {
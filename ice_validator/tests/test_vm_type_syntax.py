@@ -44,7 +44,7 @@ import re
 
 import pytest
 
-from .structures import Heat
+from .structures import load_heat
 from .helpers import validates
 from .utils import vm_types
 
@@ -63,7 +63,7 @@ def test_vm_type_syntax(yaml_file):
     contain any of the following strings:
     ``_int`` or ``int_`` or ``_int_``.
     """
-    v = Heat(filepath=yaml_file)
+    v = load_heat(yaml_file)
     if not v.resources:
         pytest.skip("No resources")
     t = set()
@@ -38,7 +38,8 @@ import os
 
 from tests.helpers import validates
 from tests.utils.nested_files import get_nested_files
-from tests.structures import Heat, Resource
+from tests.structures import Resource, load_heat
+from tests.utils.template_source import listdir
 
 
 def non_nested_files(filenames):
@@ -48,11 +49,11 @@ def non_nested_files(filenames):
 
 @validates("R-589037")
 def test_detected_volume_module_follows_naming_convention(template_dir):
-    all_files = [os.path.join(template_dir, f) for f in os.listdir(template_dir)]
+    all_files = [os.path.join(template_dir, f) for f in listdir(template_dir)]
     yaml_files = [f for f in all_files if f.endswith(".yaml") or f.endswith(".yml")]
     errors = []
     for yaml_file in non_nested_files(yaml_files):
-        heat = Heat(filepath=yaml_file)
+        heat = load_heat(yaml_file)
         if not heat.resources:
             continue
         base_dir, filename = os.path.split(yaml_file)
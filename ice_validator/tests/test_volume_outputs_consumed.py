@@ -37,10 +37,10 @@
 #
 #
 import glob
-import os
 
 import pytest
 from tests import cached_yaml as yaml
+from tests.utils import template_source
 
 from .helpers import validates
 
@@ -56,7 +56,7 @@ class VolumePairModule:
 
     @property
     def exists(self):
-        return any(os.path.exists(option) for option in self.path_options)
+        return any(template_source.exists(option) for option in self.path_options)
 
     def get_module_path(self):
         """
@@ -64,7 +64,7 @@ class VolumePairModule:
         otherwise None
         """
         for option in self.path_options:
-            if os.path.exists(option):
+            if template_source.exists(option):
                 return option
         return None
 
@@ -86,10 +86,8 @@ def test_volume_outputs_consumed(template_dir, volume_template):
     pair_module = VolumePairModule(volume_template)
     if not pair_module.exists:
         pytest.skip("No pair module found for volume template")
-    with open(volume_template, "r") as f:
-        volume = yaml.load(f)
-    with open(pair_module.get_module_path(), "r") as f:
-        pair = yaml.load(f)
+    volume = yaml.load_path(volume_template)
+    pair = yaml.load_path(pair_module.get_module_path())
     outputs = set(volume.get("outputs", {}).keys())
     parameters = set(pair.get("parameters", {}).keys())
     missing_output_parameters = outputs.difference(parameters)
@@ -107,8 +105,7 @@ def test_volume_outputs_consumed(template_dir, volume_template):
     for template_path in template_files:
         if template_path in (pair_module, volume_template):
             continue  # Skip these files since we already checked this pair
-        with open(template_path, "r") as f:
-            template = yaml.load(f)
+        template = yaml.load_path(template_path)
         parameters = set(template.get("parameters", {}).keys())
         misused_outputs = outputs.intersection(parameters)
         if misused_outputs:
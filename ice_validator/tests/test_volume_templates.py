@@ -58,8 +58,7 @@ def test_volume_templates_contains_cinder_or_resource_group(volume_template):
     list_of_files.append(volume_template)
 
     for file in list_of_files:
-        with open(file) as fh:
-            yml = yaml.load(fh)
+        yml = yaml.load_path(file)
         resources = yml.get("resources") or {}
         for k, v in resources.items():
             if not isinstance(v, dict):
@@ -81,8 +80,7 @@ def test_no_vf_module_index_in_cinder(volume_template):
     vf_module_index is prohibited in volume templates
     """
 
-    with open(volume_template) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(volume_template)
 
     if "parameters" not in yml:
         pytest.skip("No parameters specified in the heat template")
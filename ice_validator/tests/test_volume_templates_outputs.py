@@ -47,8 +47,7 @@ def test_volume_templates_contains_outputs(volume_template):
     """
     Check that all volume templates include outputs
     """
-    with open(volume_template) as fh:
-        yml = yaml.load(fh)
+    yml = yaml.load_path(volume_template)
 
     resources = yml.get("resources")
     volume_resources = []
@@ -0,0 +1,220 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Parameters of the templates that must, or must not, be enumerated in the
+environment files.
+
+The parameter specs (see test_environment_file_parameters.ENV_PARAMETER_SPEC)
+are compiled once into a dispatch table (``EnvParameterTable``).  The
+resources of a template are then walked once to collect the parameters
+assigned to the properties of every rule of the table, and the tests look up
+the parameters of their rule instead of walking the template themselves.
+"""
+
+import re
+from collections import defaultdict
+
+from tests.helpers import (
+    find_environment_file,
+    get_environment_pair,
+    get_param,
+    prop_iterator,
+)
+from tests.structures import load_heat
+from tests.utils import nested_dict
+
+# Compiled tables, keyed by the ids of their specs (see get_env_parameter_table)
+ENV_PARAMETER_TABLES = {}
+
+# Parameters collected from the templates for the session (see collect)
+TEMPLATE_PARAMETERS = {}
+
+# Parameters of the environment file of each template for the session
+ENVIRONMENT_PARAMETERS = {}
+
+
+def is_excluded(spec, param, rid):
+    """
+    Returns True if the parameter or the resource is excluded by the kwargs of
+    the spec (mainly to tell internal from external networks)
+    """
+    for k, v in spec.get("kwargs").items():
+        if k == "exclude_resource" and re.match(v, rid):
+            return True
+        elif k == "exclude_parameter" and re.match(v, param):
+            return True
+    return False
+
+
+class TemplateParameters:
+    """
+    Parameters assigned to the properties of each rule of a table in a
+    template (see EnvParameterTable.collect)
+    """
+
+    def __init__(self, num_rules):
+        self.parameters = [[] for _ in range(num_rules)]
+        self.errors = {}
+
+    def for_rule(self, rule):
+        """
+        :param rule: index of the rule in the table
+        :return: list of dicts with the resource ID and parameter name
+        :raises: the error raised while collecting the parameters of the rule
+        """
+        if rule in self.errors:
+            raise self.errors[rule]
+        return self.parameters[rule]
+
+
+class EnvParameterTable:
+    """
+    Parameter specs compiled into a dispatch table.
+
+    :param env_specs: list of mappings of a resource type to its parameter
+                      specs.  The specs of types without "::" (such as "ALL")
+                      apply to every resource.
+    """
+
+    def __init__(self, env_specs):
+        self.rules = []
+        self._by_property = defaultdict(list)
+        self._by_type = defaultdict(list)
+        self._any_type = []
+        for env_spec in env_specs:
+            for resource_type, specs in env_spec.items():
+                for spec in specs:
+                    rule = len(self.rules)
+                    self.rules.append((resource_type, spec))
+                    key = (resource_type, tuple(spec["property"]))
+                    self._by_property[key].append(rule)
+                    if "::" in resource_type:
+                        self._by_type[resource_type].append(rule)
+                    else:
+                        self._any_type.append(rule)
+
+    def find_rule(self, resource_type, prop, **kwargs):
+        """
+        Returns the index of the first rule for the property of the resource
+        type that has every one of ``kwargs`` (i.e. network_type), or None
+        """
+        for rule in self._by_property.get((resource_type, tuple(prop)), ()):
+            spec = self.rules[rule][1]
+            if all(spec.get(k) and spec.get(k) == v for k, v in kwargs.items()):
+                return rule
+        return None
+
+    def rules_of_type(self, resource_type):
+        """Returns the specs of the rules of the resource type"""
+        return [spec for t, spec in self.rules if t == resource_type]
+
+    def _rules_for(self, resource_type):
+        if isinstance(resource_type, str) and resource_type in self._by_type:
+            return self._by_type[resource_type] + self._any_type
+        return self._any_type
+
+    def collect(self, yaml_file, nested_resources=False):
+        """
+        Walks the resources of the template once and collects the parameters
+        assigned to the properties of every rule.  The result is cached for
+        the session.
+
+        :param yaml_file: path to the template
+        :param nested_resources: also walk the resources of nested templates
+        :return: TemplateParameters
+        """
+        key = (yaml_file, id(self), nested_resources)
+        if key in TEMPLATE_PARAMETERS:
+            return TEMPLATE_PARAMETERS[key]
+        result = TemplateParameters(len(self.rules))
+        heat = load_heat(yaml_file)
+        resources = heat.get_all_resources() if nested_resources else heat.resources
+        for rid, resource in resources.items():
+            for rule in self._rules_for(nested_dict.get(resource, "type")):
+                if rule in result.errors:
+                    continue
+                spec = self.rules[rule][1]
+                try:
+                    for value in prop_iterator(resource, *spec["property"]):
+                        param = get_param(value)
+                        if param and not is_excluded(spec, param, rid):
+                            result.parameters[rule].append(
+                                {"resource": rid, "param": param}
+                            )
+                except Exception as e:  # reported by the tests of the rule
+                    result.errors[rule] = e
+        TEMPLATE_PARAMETERS[key] = result
+        return result
+
+
+def get_env_parameter_table(env_specs):
+    """
+    Returns the table compiled from the list of parameter specs.  Each list of
+    specs is only compiled once.
+    """
+    key = tuple(id(s) for s in env_specs)
+    if key not in ENV_PARAMETER_TABLES:
+        # the specs are kept with the table so their ids are never reused
+        ENV_PARAMETER_TABLES[key] = (list(env_specs), EnvParameterTable(env_specs))
+    return ENV_PARAMETER_TABLES[key][1]
+
+
+def get_environment_parameters(yaml_file):
+    """
+    Returns the parameters of the environment file of the template, or of the
+    closest template nesting it.  Returns None if there is no environment
+    file.
+    """
+    if yaml_file not in ENVIRONMENT_PARAMETERS:
+        environment_pair = get_environment_pair(yaml_file) or find_environment_file(
+            yaml_file
+        )
+        ENVIRONMENT_PARAMETERS[yaml_file] = (
+            environment_pair.get("eyml").get("parameters", {}) or {}
+            if environment_pair
+            else None
+        )
+    return ENVIRONMENT_PARAMETERS[yaml_file]
+
+
+def is_enumerated(parameter, env_parameters):
+    """
+    Returns True if a parameter of the environment file matches
+    ``parameter``, which is treated as a regular expression
+    """
+    return any(re.match(parameter, param) for param in env_parameters)
@@ -39,7 +39,7 @@
 import os
 
 from tests.helpers import get_base_template_from_yaml_files
-from tests.utils.nested_files import get_nested_files
+from tests.utils.template_index import get_template_index
 
 
 def is_incremental_module(yaml_file, yaml_files):
@@ -47,13 +47,11 @@ def is_incremental_module(yaml_file, yaml_files):
     Returns true if the file is not a base module, volume module, or nested module.
     """
     base_template = get_base_template_from_yaml_files(yaml_files)
-    nested_templates = get_nested_files(yaml_files)
+    is_nested = yaml_file in yaml_files and get_template_index(
+        os.path.dirname(yaml_file)
+    ).is_nested(yaml_file)
     is_volume_module = os.path.splitext(yaml_file)[0].endswith("_volume")
-    return (
-        yaml_file != base_template
-        and yaml_file not in nested_templates
-        and not is_volume_module
-    )
+    return yaml_file != base_template and not is_nested and not is_volume_module
 
 
 def get_incremental_modules(yaml_files):
@@ -0,0 +1,161 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Naming rules compiled into a single regular expression.
+
+A family of rules, such as the resource ID formats of a resource type, is an
+ordered list of ``(name, pattern)``.  ``RuleSet`` merges the patterns of a
+family into one alternation where each rule and its named groups are renamed
+with a prefix that is unique to the rule, so a single match answers which
+rule matched and what its groups captured::
+
+    rules = RuleSet([("int", r"int_(?P<role>.+)$"), ("ext", r"(?P<role>.+)$")])
+    name, match = rules.match("int_oam")  # ("int", match)
+    match.group("role")  # "oam"
+
+``match`` returns the first rule that matches, the same as trying each
+pattern in turn with ``re.match``.  ``match_all`` returns every rule that
+matches, using a look-ahead per rule.
+"""
+
+import re
+
+# A named group in a rule pattern
+_NAMED_GROUP = re.compile(r"\(\?P<(\w+)>")
+
+
+class RuleMatch:
+    """
+    Match of one rule of a ``RuleSet``.  ``group`` and ``groupdict`` use the
+    names of the groups in the rule's pattern.
+    """
+
+    __slots__ = ("name", "_match", "_tag", "_groups")
+
+    def __init__(self, name, match, tag, groups):
+        self.name = name
+        self._match = match
+        self._tag = tag
+        self._groups = groups
+
+    def group(self, *names):
+        """Returns the text of the named groups, or of the match if none"""
+        if not names:
+            return self._match.group(self._tag)
+        if len(names) > 1:
+            return tuple(self.group(name) for name in names)
+        try:
+            tag = self._groups[names[0]]
+        except KeyError:
+            raise IndexError("no such group: {}".format(names[0]))
+        return self._match.group(tag)
+
+    def groupdict(self, default=None):
+        """Returns a dict of group name to captured text"""
+        match = self._match
+        result = {}
+        for name, tag in self._groups.items():
+            value = match.group(tag)
+            result[name] = default if value is None else value
+        return result
+
+    def __repr__(self):
+        return "<RuleMatch {!r}: {!r}>".format(self.name, self.group())
+
+
+class RuleSet:
+    """
+    An ordered family of naming rules compiled into a single regular
+    expression.  ``rules`` is an iterable of ``(name, pattern)`` where
+    pattern is a string or a compiled regular expression.  Names do not
+    need to be unique.
+    """
+
+    def __init__(self, rules):
+        self.rules = []
+        self._tags = {}
+        first = []
+        every = []
+        for index, (name, pattern) in enumerate(rules):
+            if not isinstance(pattern, str):
+                pattern = pattern.pattern
+            tag = "r{}".format(index)
+            groups = {g: "{}_{}".format(tag, g) for g in _NAMED_GROUP.findall(pattern)}
+            body = _NAMED_GROUP.sub(r"(?P<{}_\1>".format(tag), pattern)
+            self.rules.append((name, pattern))
+            self._tags[tag] = (name, groups)
+            first.append("(?P<{}>{})".format(tag, body))
+            every.append("(?:(?=(?P<{}>{})))?".format(tag, body))
+        self.regex = re.compile("|".join(first)) if first else None
+        self.regex_all = re.compile("".join(every)) if every else None
+        if self.regex:
+            # lastindex of a match is the rule's group as it is closed last
+            self._by_index = {
+                self.regex.groupindex[tag]: tag for tag in self._tags
+            }
+
+    def match(self, text):
+        """
+        Returns ``(name, match)`` for the first rule matching the start of
+        ``text``, or ``("", None)`` if no rule matches.
+        """
+        if self.regex is None:
+            return "", None
+        match = self.regex.match(text)
+        if match is None:
+            return "", None
+        tag = self._by_index[match.lastindex]
+        name, groups = self._tags[tag]
+        return name, RuleMatch(name, match, tag, groups)
+
+    def match_all(self, text):
+        """
+        Returns a list of ``(name, match)`` for every rule matching the start
+        of ``text``, in the order of the rules.
+        """
+        if self.regex_all is None:
+            return []
+        match = self.regex_all.match(text)
+        return [
+            (name, RuleMatch(name, match, tag, groups))
+            for tag, (name, groups) in self._tags.items()
+            if match.group(tag) is not None
+        ]
+
+    def __len__(self):
+        return len(self.rules)
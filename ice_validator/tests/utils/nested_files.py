@@ -36,11 +36,12 @@
 # ============LICENSE_END============================================
 
 from functools import lru_cache
-from os import path, listdir
+from os import path
 import re
 from tests import cached_yaml as yaml
 
-from tests.helpers import load_yaml
+from tests.utils import template_source
+from tests.utils.template_index import get_nested_children, get_template_index
 
 MAX_DEPTH = 2
 
@@ -73,8 +74,7 @@ def check_for_invalid_nesting(  # pylint: disable=too-many-branches
             else:
                 continue
             try:
-                with open(filepath) as fh:
-                    yml = yaml.load(fh)
+                yml = yaml.load_path(filepath)
             except yaml.YAMLError as e:
                 invalid_nesting.append(filepath)
                 print(e)  # pylint: disable=superfluous-parens
@@ -92,26 +92,21 @@ def get_list_of_nested_files(yml_path, dirpath):
     """
     return a list of all nested files
     """
+    return _get_list_of_nested_files(yml_path, dirpath, (yml_path,))
 
-    yml = load_yaml(yml_path)
-    nested_files = []
-    resources = yml.get("resources") or {}
 
-    for v in resources.values():
-        if isinstance(v, dict) and "type" in v:
-            t = v["type"]
-            if t.endswith(".yml") or t.endswith(".yaml"):
-                filepath = path.join(dirpath, t)
-                if path.exists(filepath):
-                    nested_files.append(filepath)
-                    nested_files.extend(get_list_of_nested_files(filepath, dirpath))
-            elif t == "OS::Heat::ResourceGroup":
-                rdt = v.get("properties", {}).get("resource_def", {}).get("type", None)
-                if rdt and (rdt.endswith(".yml") or rdt.endswith(".yaml")):
-                    filepath = path.join(dirpath, rdt)
-                    if path.exists(filepath):
-                        nested_files.append(filepath)
-                        nested_files.extend(get_list_of_nested_files(filepath, dirpath))
+def _get_list_of_nested_files(yml_path, dirpath, listing):
+    """
+    ``listing`` holds the files whose nested files are being listed, and is
+    used to stop at nesting cycles (reported by test_04_valid_nesting)
+    """
+    nested_files = []
+    for filepath in get_nested_children(yml_path, dirpath):
+        nested_files.append(filepath)
+        if filepath not in listing:
+            nested_files.extend(
+                _get_list_of_nested_files(filepath, dirpath, listing + (filepath,))
+            )
     return nested_files
 
 
@@ -141,7 +136,7 @@ def get_resourcegroup_nested_files(yml, dirpath):
                     nested_file = rdt
             if nested_file:
                 filepath = path.join(dirpath, nested_file)
-                if path.exists(filepath):
+                if template_source.exists(filepath):
                     nested_files[rid] = nested_file
     return nested_files
 
@@ -169,7 +164,7 @@ def get_type_nested_files(yml, dirpath):
                 nested_file = t
             if nested_file:
                 filepath = path.join(dirpath, nested_file)
-                if path.exists(filepath):
+                if template_source.exists(filepath):
                     nested_files[rid] = nested_file
     return nested_files
 
@@ -185,18 +180,5 @@ def get_nested_files(filenames):
     return nested_files
 
 
-@lru_cache(maxsize=None)
 def file_is_a_nested_template(file):
-    directory = path.dirname(file)
-    nested_files = []
-    for filename in listdir(directory):
-        if filename.endswith(".yaml") or filename.endswith(".yml"):
-            filename = "{}/{}".format(directory, filename)
-            try:
-                nested_files.extend(
-                    get_list_of_nested_files(filename, path.dirname(filename))
-                )
-            except yaml.YAMLError as e:
-                print(e)  # pylint: disable=superfluous-parens
-                continue
-    return file in nested_files
+    return get_template_index(path.dirname(file)).is_nested(file)
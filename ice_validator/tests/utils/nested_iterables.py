@@ -36,7 +36,9 @@
 # ============LICENSE_END============================================
 #
 #
-from tests.helpers import traverse
+from tests.utils.template_visitor import register, visit
+
+register("get_param", "get_resource", "get_file")
 
 
 def is_pseudo_param(parameter):
@@ -49,6 +51,9 @@ class ParameterCollector:
         self.params = set()
 
     def __call__(self, _, value):
+        self.add(value)
+
+    def add(self, value):
         if isinstance(value, str):
             self.params.add(value)
         elif isinstance(value, list) and len(value) >= 1 and isinstance(value[0], str):
@@ -61,7 +66,8 @@ def find_all_get_param_in_yml(yml):
     and return a list of parameters
     """
     collector = ParameterCollector()
-    traverse(yml, "get_param", collector)
+    for occurrence in visit(yml).find("get_param"):
+        collector.add(occurrence.value)
     return {p for p in collector.params if not is_pseudo_param(p)}
 
 
@@ -71,15 +77,19 @@ def find_all_get_resource_in_yml(yml):
     in a parsed yaml body and return a list of resource ids
     """
     collector = ParameterCollector()
-    traverse(yml, "get_resource", collector)
+    for occurrence in visit(yml).find("get_resource"):
+        collector.add(occurrence.value)
     return collector.params
 
 
-def find_all_get_file_in_yml(yml):
+def find_all_get_file_in_yml(yml, section=None):
     """
     Recursively find all get_file in a parsed yaml body
     and return the list of referenced files/urls
+
+    :param section: only look under this top level key (ex: resources)
     """
     collector = ParameterCollector()
-    traverse(yml, "get_file", collector)
+    for occurrence in visit(yml).find("get_file", section):
+        collector.add(occurrence.value)
     return collector.params
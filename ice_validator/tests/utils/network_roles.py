@@ -37,21 +37,27 @@
 #
 #
 
-import re
 import socket
 
-PARAM_FORMATS = [
-    ["network", "string", "internal", re.compile(r"int_(.+?)_net_id")],
-    ["network", "string", "internal", re.compile(r"int_(.+?)_net_name")],
-    ["network", "string", "external", re.compile(r"(.+?)_net_id")],
-    ["network", "string", "external", re.compile(r"(.+?)_net_name")],
-]
+from tests.utils.naming_rules import RuleSet
 
-RESOURCE_FORMATS = [
-    re.compile(r"int_(.+?)_network"),  # OS::ContrailV2::VirtualNetwork
-    re.compile(r"int_(.+?)_RVN"),  # OS::ContrailV2::VirtualNetwork
-    re.compile(r"int_(.+?)"),  # OS::Neutron::Net
-]
+# Rules of the network parameter of a port, named after the network type
+PARAM_FORMATS = RuleSet(
+    [
+        ("internal", r"int_(?P<network_role>.+?)_net_id"),
+        ("internal", r"int_(?P<network_role>.+?)_net_name"),
+        ("external", r"(?P<network_role>.+?)_net_id"),
+        ("external", r"(?P<network_role>.+?)_net_name"),
+    ]
+)
+
+RESOURCE_FORMATS = RuleSet(
+    [
+        ("internal", r"int_(?P<network_role>.+?)_network"),  # ContrailV2 network
+        ("internal", r"int_(?P<network_role>.+?)_RVN"),  # ContrailV2 network
+        ("internal", r"int_(?P<network_role>.+?)"),  # OS::Neutron::Net
+    ]
+)
 
 
 def get_network_role_and_type(resource):
@@ -76,16 +82,11 @@ def get_network_role_and_type(resource):
     else:
         network = network_props.get("get_param", "")
 
-    if is_resource:  # connecting to an network in the template
-        for format in RESOURCE_FORMATS:
-            m = format.match(network)
-            if m and m.group(1):
-                return m.group(1), "internal"
-    else:
-        for format in PARAM_FORMATS:
-            m = format[3].match(network)
-            if m and m.group(1):
-                return m.group(1), format[2]
+    # get_resource connects to a network in the template
+    formats = RESOURCE_FORMATS if is_resource else PARAM_FORMATS
+    network_type, m = formats.match(network)
+    if m and m.group("network_role"):
+        return m.group("network_role"), network_type
     return None, None
 
 
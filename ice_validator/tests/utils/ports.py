@@ -36,7 +36,7 @@
 # ============LICENSE_END============================================
 #
 #
-from tests.structures import Heat
+from tests.structures import load_heat
 from tests.helpers import parameter_type_to_heat_type, prop_iterator
 from tests.utils import nested_dict
 
@@ -75,7 +75,7 @@ def check_parameter_format(
     """
 
     invalid_parameters = []
-    heat = Heat(filepath=yaml_file)
+    heat = load_heat(yaml_file)
     resource_type = resource_processor.resource_type
     resources = heat.get_resource_by_type(resource_type)
     for rid, resource in resources.items():
@@ -0,0 +1,181 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Index of the templates in a template directory.
+
+Classifying a template (base, incremental, volume, or nested module) depends
+on every other template in its directory, so the index is computed once per
+directory (see ``get_template_index``) and shared by all tests.
+"""
+
+import os
+from collections import OrderedDict
+
+from tests import cached_yaml as yaml
+from tests.helpers import RE_BASE, load_yaml
+from tests.utils import template_source
+
+# Template directory indexes shared across the session (see get_template_index)
+TEMPLATE_INDEXES = {}
+
+
+def is_yaml_filename(filename):
+    return filename.endswith(".yaml") or filename.endswith(".yml")
+
+
+def get_nested_children(yml_path, dirpath):
+    """
+    Return the list of files nested directly by ``yml_path``, either by
+    type or by the resource_def of a ResourceGroup.  Files that do not exist
+    are ignored.
+    """
+    yml = load_yaml(yml_path)
+    children = []
+    resources = yml.get("resources") or {}
+    for v in resources.values():
+        if isinstance(v, dict) and "type" in v:
+            t = v["type"]
+            if t == "OS::Heat::ResourceGroup":
+                t = v.get("properties", {}).get("resource_def", {}).get("type", None)
+            if t and is_yaml_filename(t):
+                filepath = os.path.join(dirpath, t)
+                if template_source.exists(filepath):
+                    children.append(filepath)
+    return children
+
+
+class TemplateDirectoryIndex:
+    """
+    Classification of every template in a template directory.
+
+    - yaml_files: all YAML files in the directory
+    - base_module: path to the base module or None
+    - volume_modules: set of volume module paths
+    - nested_files: set of paths nested by another template
+    - incremental_modules: set of paths that are not base, volume, or nested
+    - env_pairs: template path -> path of its environment file
+    - children: template path -> list of files it nests directly
+    - parents: nested file path -> list of templates nesting it directly, in
+      directory order
+    """
+
+    def __init__(self, dirname):
+        self.dirname = dirname
+        filenames = template_source.listdir(dirname)
+        self.yaml_files = [
+            "{}/{}".format(dirname, f) for f in filenames if is_yaml_filename(f)
+        ]
+        self.base_module = self._find_base_module(filenames)
+        self.children = OrderedDict()
+        self.parents = OrderedDict()
+        self.nested_files = set()
+        for yaml_file in self.yaml_files:
+            try:
+                self.nested_files.update(self._get_descendants(yaml_file))
+            except yaml.YAMLError as e:
+                print(e)  # pylint: disable=superfluous-parens
+            except (AttributeError, TypeError):
+                pass  # invalid nesting is reported by test_04_valid_nesting
+        # list the templates nesting each file in directory order
+        position = {f: i for i, f in enumerate(self.yaml_files)}
+        for parents in self.parents.values():
+            parents.sort(key=lambda f: position.get(f, len(position)))
+        self.volume_modules = {
+            f for f in self.yaml_files if os.path.splitext(f)[0].endswith("_volume")
+        }
+        self.incremental_modules = {
+            f
+            for f in self.yaml_files
+            if f != self.base_module
+            and f not in self.nested_files
+            and f not in self.volume_modules
+        }
+        self.env_pairs = {}
+        for yaml_file in self.yaml_files:
+            env_file = "{}.env".format(os.path.splitext(yaml_file)[0])
+            if template_source.exists(env_file):
+                self.env_pairs[yaml_file] = env_file
+
+    def _find_base_module(self, filenames):
+        for filename in filenames:
+            basename, ext = os.path.splitext(filename)
+            if (
+                (ext == ".yaml" or ext == ".yml")
+                and RE_BASE.search(basename)
+                and basename.find("volume") == -1
+            ):
+                return os.path.join(self.dirname, filename)
+        return None
+
+    def _get_children(self, yml_path):
+        if yml_path not in self.children:
+            children = get_nested_children(yml_path, self.dirname)
+            self.children[yml_path] = children
+            for child in children:
+                parents = self.parents.setdefault(child, [])
+                if yml_path not in parents:
+                    parents.append(yml_path)
+        return self.children[yml_path]
+
+    def _get_descendants(self, yml_path):
+        """Return set of files nested by ``yml_path`` at any depth"""
+        descendants = set()
+        pending = [yml_path]
+        while pending:
+            for child in self._get_children(pending.pop()):
+                if child not in descendants:
+                    descendants.add(child)
+                    pending.append(child)
+        return descendants
+
+    def is_nested(self, yml_path):
+        return yml_path in self.nested_files
+
+    def is_incremental_module(self, yml_path):
+        return yml_path in self.incremental_modules
+
+
+def get_template_index(dirname):
+    """
+    Return the TemplateDirectoryIndex for ``dirname``, shared by the session
+    """
+    index = TEMPLATE_INDEXES.get(dirname)
+    if index is None:
+        index = TemplateDirectoryIndex(dirname)
+        TEMPLATE_INDEXES[dirname] = index
+    return index
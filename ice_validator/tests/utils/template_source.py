@@ -0,0 +1,396 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Access to the files of a template source, which is either a directory or a
+ZIP archive that is read in place without being extracted.
+
+Files inside an archive are addressed with virtual paths made of the path
+to the archive followed by the path of the member (ex:
+``/vnfs/package.zip/base.yaml``), so the paths used by the tests, and
+shown on the reports relative to the archive, have the same shape for
+both kinds of sources.  The module level functions (``open_file``,
+``exists``, ``listdir``, etc.) behave like their ``os`` equivalents for
+regular paths and resolve virtual paths to the members of the archive.
+"""
+
+import hashlib
+import io
+import mmap
+import os
+import stat
+import zipfile
+
+# Archives opened so far (absolute path -> ZipSource)
+ARCHIVES = {}
+
+# Map the archives into memory instead of reading them with file I/O
+_use_mmap = False
+
+
+def configure(use_mmap=False):
+    """
+    :param use_mmap: if True, archives opened from now on are memory mapped
+    """
+    global _use_mmap
+    _use_mmap = use_mmap
+
+
+def is_archive(path):
+    """:return: True if ``path`` is a regular file containing a ZIP archive"""
+    return os.path.isfile(path) and zipfile.is_zipfile(path)
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class _MemoryMap(mmap.mmap):
+    """Memory mapped file usable by ZipFile (mmap is only seekable on 3.13+)"""
+
+    def seekable(self):
+        return True
+
+
+class DirectorySource:
+    """
+    Template source backed by a directory.  Paths passed to the methods
+    are relative to the root of the source.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, name=""):
+        """:return: path of ``name`` as used by the tests"""
+        return os.path.join(self.root, name) if name else self.root
+
+    def listdir(self, name=""):
+        return os.listdir(self.path(name))
+
+    def exists(self, name):
+        return os.path.exists(self.path(name))
+
+    def isfile(self, name):
+        return os.path.isfile(self.path(name))
+
+    def isdir(self, name=""):
+        return os.path.isdir(self.path(name))
+
+    def open(self, name, mode="r", encoding=None):
+        return open(self.path(name), mode, encoding=encoding)
+
+    def read(self, name):
+        """:return: contents of the file as bytes"""
+        with open(self.path(name), "rb") as f:
+            return f.read()
+
+    def hash(self, name):
+        """:return: SHA-256 of the contents of the file (hex)"""
+        return _sha256(self.read(name))
+
+    def walk(self, name=""):
+        """Same as ``os.walk``"""
+        return os.walk(self.path(name))
+
+
+class ZipSource(DirectorySource):
+    """
+    Template source backed by a ZIP archive.  Members are read directly from
+    the archive.
+
+    :param root:     path to the archive
+    :param use_mmap: if True, the archive is memory mapped
+    """
+
+    def __init__(self, root, use_mmap=False):
+        super().__init__(root)
+        self.use_mmap = use_mmap
+        self._file = None
+        self._mmap = None
+        self._zip = None
+        self._pid = None
+        self.members = {}
+        self.children = {"": set()}
+        for info in self.zip.infolist():
+            name = info.filename.replace("\\", "/").strip("/")
+            if not name:
+                continue
+            parts = name.split("/")
+            for depth in range(1, len(parts) + 1):
+                parent = "/".join(parts[: depth - 1])
+                self.children.setdefault(parent, set()).add(parts[depth - 1])
+                if depth < len(parts) or info.is_dir():
+                    self.children.setdefault("/".join(parts[:depth]), set())
+            if not info.is_dir():
+                self.members[name] = info
+
+    @property
+    def zip(self):
+        """
+        The open archive.  Reopened in forked processes since a file offset
+        can't be shared between processes.
+        """
+        if self._pid != os.getpid():
+            self._file = open(self.root, "rb")
+            if self.use_mmap:
+                self._mmap = _MemoryMap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._zip = zipfile.ZipFile(self._mmap)
+            else:
+                self._zip = zipfile.ZipFile(self._file)
+            self._pid = os.getpid()
+        return self._zip
+
+    def close(self):
+        if self._pid == os.getpid():
+            self._zip.close()
+            if self._mmap is not None:
+                self._mmap.close()
+            self._file.close()
+        self._pid = None
+
+    @staticmethod
+    def _member(name):
+        return name.replace(os.sep, "/").strip("/")
+
+    def listdir(self, name=""):
+        member = self._member(name)
+        if member not in self.children:
+            error = NotADirectoryError if member in self.members else FileNotFoundError
+            raise error(2, "No such directory in archive", self.path(name))
+        return sorted(self.children[member])
+
+    def exists(self, name):
+        member = self._member(name)
+        return member in self.members or member in self.children
+
+    def isfile(self, name):
+        return self._member(name) in self.members
+
+    def isdir(self, name=""):
+        return self._member(name) in self.children
+
+    def read(self, name):
+        member = self._member(name)
+        if member not in self.members:
+            raise FileNotFoundError(2, "No such file in archive", self.path(name))
+        return self.zip.read(self.members[member])
+
+    def open(self, name, mode="r", encoding=None):
+        if any(c in mode for c in "wax+"):
+            raise PermissionError(13, "Archive members are read-only", self.path(name))
+        buffer = io.BytesIO(self.read(name))
+        buffer.name = self.path(name)
+        if "b" in mode:
+            return buffer
+        return io.TextIOWrapper(buffer, encoding=encoding)
+
+    def walk(self, name=""):
+        pending = [self._member(name)]
+        while pending:
+            member = pending.pop(0)
+            if member not in self.children:
+                continue
+            names = sorted(self.children[member])
+            dirs = [n for n in names if _join(member, n) in self.children]
+            files = [n for n in names if _join(member, n) in self.members]
+            yield self.path(member), dirs, files
+            pending[0:0] = [_join(member, d) for d in dirs]
+
+
+def _join(parent, name):
+    return "{}/{}".format(parent, name) if parent else name
+
+
+def open_archive(path):
+    """
+    :return: the ZipSource of the archive at ``path``, shared by the process
+    """
+    key = os.path.abspath(path)
+    if key not in ARCHIVES:
+        ARCHIVES[key] = ZipSource(key, use_mmap=_use_mmap)
+    return ARCHIVES[key]
+
+
+def close_archives():
+    """Closes every archive opened so far"""
+    for source in ARCHIVES.values():
+        source.close()
+    ARCHIVES.clear()
+
+
+def get_source(path):
+    """
+    :param path: directory or ZIP archive.  Virtual paths of the
+                 archive's members are resolved from then on
+    :return: DirectorySource or ZipSource for ``path``
+    """
+    if is_archive(path):
+        return open_archive(path)
+    source, member = resolve(path)
+    if source is None:
+        return DirectorySource(path)
+    return source if not member else _SubdirectorySource(source, member)
+
+
+class _SubdirectorySource(DirectorySource):
+    """Directory inside an archive"""
+
+    def __init__(self, source, member):
+        super().__init__(source.path(member))
+        self.source = source
+        self.member = member
+
+    def _name(self, name):
+        return _join(self.member, ZipSource._member(name))
+
+    def listdir(self, name=""):
+        return self.source.listdir(self._name(name))
+
+    def exists(self, name):
+        return self.source.exists(self._name(name))
+
+    def isfile(self, name):
+        return self.source.isfile(self._name(name))
+
+    def isdir(self, name=""):
+        return self.source.isdir(self._name(name))
+
+    def open(self, name, mode="r", encoding=None):
+        return self.source.open(self._name(name), mode, encoding)
+
+    def read(self, name):
+        return self.source.read(self._name(name))
+
+    def walk(self, name=""):
+        return self.source.walk(self._name(name))
+
+
+def resolve(path):
+    """
+    Determines whether ``path`` is a regular path or a virtual path to a
+    member of an archive.
+
+    :return: tuple of (ZipSource, member path) if ``path`` is an archive or
+             inside one, otherwise (None, path)
+    """
+    path = os.fspath(path)
+    if ARCHIVES:
+        abs_path = os.path.abspath(path)
+        for root, source in ARCHIVES.items():
+            if abs_path == root:
+                return source, ""
+            if abs_path.startswith(root + os.sep):
+                return source, abs_path[len(root) + 1 :]
+    try:
+        mode = os.stat(path).st_mode
+    except (FileNotFoundError, NotADirectoryError):
+        mode = None
+    except (OSError, ValueError):
+        return None, path
+    if mode is not None:
+        return None, path
+    # the path doesn't exist, so check if one of its parents is an archive
+    abs_path = os.path.abspath(path)
+    parent = os.path.dirname(abs_path)
+    while parent and parent != os.path.dirname(parent):
+        try:
+            mode = os.stat(parent).st_mode
+        except (FileNotFoundError, NotADirectoryError):
+            parent = os.path.dirname(parent)
+            continue
+        except (OSError, ValueError):
+            break
+        if stat.S_ISREG(mode) and zipfile.is_zipfile(parent):
+            return open_archive(parent), abs_path[len(parent) + 1 :]
+        break
+    return None, path
+
+
+def open_file(path, mode="r", encoding=None):
+    """Same as ``open``, but also opens members of archives (read-only)"""
+    source, member = resolve(path)
+    if source is None:
+        return open(path, mode, encoding=encoding)
+    return source.open(member, mode, encoding)
+
+
+def read_bytes(path):
+    """:return: contents of the file at ``path`` as bytes"""
+    with open_file(path, "rb") as f:
+        return f.read()
+
+
+def hash_file(path):
+    """:return: SHA-256 of the contents of the file at ``path`` (hex)"""
+    return _sha256(read_bytes(path))
+
+
+def exists(path):
+    source, member = resolve(path)
+    return source.exists(member) if source else os.path.exists(path)
+
+
+def isfile(path):
+    source, member = resolve(path)
+    return source.isfile(member) if source else os.path.isfile(path)
+
+
+def _resolve_directory(path):
+    """
+    Same as ``resolve``, but also opens ``path`` if it is an archive, as
+    it is used as a directory
+    """
+    source, member = resolve(path)
+    if source is None and is_archive(path):
+        return open_archive(path), ""
+    return source, member
+
+
+def isdir(path):
+    source, member = resolve(path)
+    return source.isdir(member) if source else os.path.isdir(path)
+
+
+def listdir(path):
+    source, member = _resolve_directory(path)
+    return source.listdir(member) if source else os.listdir(path)
+
+
+def walk(path):
+    source, member = _resolve_directory(path)
+    return source.walk(member) if source else os.walk(path)
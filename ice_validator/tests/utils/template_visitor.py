@@ -0,0 +1,165 @@
+# -*- coding: utf8 -*-
+# ============LICENSE_START====================================================
+# org.onap.vvp/validation-scripts
+# ===================================================================
+# Copyright © 2019 AT&T Intellectual Property. All rights reserved.
+# ===================================================================
+#
+# Unless otherwise specified, all software contained herein is licensed
+# under the Apache License, Version 2.0 (the "License");
+# you may not use this software except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+#
+# Unless otherwise specified, all documentation contained herein is licensed
+# under the Creative Commons License, Attribution 4.0 Intl. (the "License");
+# you may not use this documentation except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#             https://creativecommons.org/licenses/by/4.0/
+#
+# Unless required by applicable law or agreed to in writing, documentation
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ============LICENSE_END============================================
+
+"""
+Finds the intrinsic functions (``get_param``, ``get_attr``, ...) and other
+keys used in templates with a single walk of each template.
+
+Modules register the keys they look for when they are imported (see
+``register``).  The first lookup in a parsed template then walks the template
+once and records the occurrences of every registered key, and the result is
+shared by every test for the rest of the session.  The path of an occurrence
+is only built when it is used.
+
+The occurrences and their paths are the same as those passed to the callback
+of ``helpers.traverse``.
+"""
+
+from tests.cached_yaml import FrozenDict, FrozenList
+
+# Keys recorded when a template is walked
+REGISTERED_KEYS = set()
+
+# Visits of the parsed templates for the session, keyed by id (see visit)
+VISITS = {}
+
+
+def register(*keys):
+    """Registers keys to record when the templates are walked"""
+    REGISTERED_KEYS.update(keys)
+
+
+class Occurrence:
+    """
+    Occurrence of a key.  ``value`` is the value associated with the key, and
+    ``section`` is the top level key of the template it was found under.
+    """
+
+    __slots__ = ("_link", "section", "value")
+
+    def __init__(self, link, section, value):
+        self._link = link
+        self.section = section
+        self.value = value
+
+    @property
+    def path(self):
+        """List of the keys (or list items) leading to the key"""
+        path = []
+        link = self._link
+        while link is not None:
+            link, key = link
+            path.append(key)
+        path.reverse()
+        return path
+
+
+class Visit:
+    """
+    Occurrences of the keys in a data structure of dicts and lists
+
+    :param data: data structure to walk
+    :param keys: keys to record
+    """
+
+    def __init__(self, data, keys):
+        self.keys = frozenset(keys)
+        self.occurrences = {key: [] for key in self.keys}
+        self._walk(data, None, None)
+
+    def _walk(self, data, link, section):
+        # mirrors helpers.traverse, so the occurrences are found in the same
+        # order and with the same paths
+        if isinstance(data, dict):
+            for key, value in data.items():
+                curr_link = (link, key)
+                curr_section = key if link is None else section
+                if key in self.keys:
+                    self.occurrences[key].append(
+                        Occurrence(curr_link, curr_section, value)
+                    )
+                self._walk(value, curr_link, curr_section)
+        elif isinstance(data, list):
+            for value in data:
+                curr_link = (link, value)
+                if isinstance(value, (dict, list)):
+                    self._walk(value, curr_link, section)
+                elif isinstance(value, str) and value in self.keys:
+                    self.occurrences[value].append(
+                        Occurrence(curr_link, section, value)
+                    )
+        elif isinstance(data, str) and data in self.keys:
+            self.occurrences[data].append(Occurrence((link, data), section, data))
+
+    def find(self, key, section=None):
+        """
+        :param key: registered key
+        :param section: only return the occurrences under this top level key
+        :return: list of Occurrence in the order they appear in the data
+        """
+        found = self.occurrences[key]
+        if section is not None:
+            found = [o for o in found if o.section == section]
+        return found
+
+    def for_each(self, key, func, section=None):
+        """
+        Calls ``func(path, value)`` for every occurrence of ``key``, like
+        ``helpers.traverse``
+        """
+        for occurrence in self.find(key, section):
+            func(occurrence.path, occurrence.value)
+
+
+def visit(data, *keys):
+    """
+    Returns the Visit of the data with every registered key.  Parsed
+    templates are read-only (see cached_yaml), so their visits are cached for
+    the session.
+
+    :param data: data structure of dicts and lists
+    :param keys: keys to register in addition to the registered keys
+    """
+    register(*keys)
+    if not isinstance(data, (FrozenDict, FrozenList)):
+        return Visit(data, REGISTERED_KEYS)
+    cached = VISITS.get(id(data))
+    if cached is None or cached[0] is not data or cached[1].keys < REGISTERED_KEYS:
+        # the data is kept with the visit so its id is never reused
+        cached = (data, Visit(data, REGISTERED_KEYS))
+        VISITS[id(data)] = cached
+    return cached[1]
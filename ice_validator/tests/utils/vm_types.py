@@ -37,8 +37,21 @@
 #
 #
 
-import re
 from tests import cached_yaml as yaml
+from tests.utils.naming_rules import RuleSet
+
+# property: rules of the parameter names the vm_type is derived from, named
+# after the parameter type
+PROPERTY_FORMATS = {
+    "name": RuleSet(
+        [
+            ("string", r"(?P<vm_type>.+?)_name_\d+"),
+            ("comma_delimited_list", r"(?P<vm_type>.+?)_names"),
+        ]
+    ),
+    "flavor": RuleSet([("string", r"(?P<vm_type>.+?)_flavor_name")]),
+    "image": RuleSet([("string", r"(?P<vm_type>.+?)_image_name")]),
+}
 
 
 def get_vm_types_for_resource(resource):
@@ -53,28 +66,17 @@ def get_vm_types_for_resource(resource):
     if not is_nova_server(resource):
         return set()
 
-    key_values = ["name", "flavor", "image"]
-    key_value_formats = [
-        ["name", "string", re.compile(r"(.+?)_name_\d+")],
-        ["name", "comma_delimited_list", re.compile(r"(.+?)_names")],
-        ["flavor", "string", re.compile(r"(.+?)_flavor_name")],
-        ["image", "string", re.compile(r"(.+?)_image_name")],
-    ]
-
     vm_types = []
     for k2, v2 in resource["properties"].items():
-        if not isinstance(v2, dict) or any(
-            [k2 not in key_values, "get_param" not in v2]
-        ):
+        rules = PROPERTY_FORMATS.get(k2)
+        if rules is None or not isinstance(v2, dict) or "get_param" not in v2:
             continue
-        formats = [v for v in key_value_formats if v[0] == k2]
-        for v3 in formats:
-            param = v2["get_param"]
-            if isinstance(param, list):
-                param = param[0]
-            m = v3[2].match(param)
-            if m and m.group(1):
-                vm_types.append(m.group(1))
+        param = v2["get_param"]
+        if isinstance(param, list):
+            param = param[0]
+        for _, m in rules.match_all(param):
+            if m.group("vm_type"):
+                vm_types.append(m.group("vm_type"))
 
     return set(vm_types)
 
@@ -123,8 +125,7 @@ def get_all_vm_types(yaml_files):
     """
     vm_types = []
     for yaml_file in yaml_files:
-        with open(yaml_file, "r") as f:
-            yml = yaml.load(f)
+        yml = yaml.load_path(yaml_file)
 
         if "resources" not in yml:
             continue
@@ -42,6 +42,7 @@
 
 from os import path
 from tests import cached_yaml as yaml
+from tests.utils import template_source
 
 VERSION = "1.0.0"
 
@@ -56,14 +57,13 @@ def get_volume_resources(heat_template):
 
     for ext in [".yaml", ".yml"]:
         volume_template = basename + "_volume" + ext
-        if path.isfile(volume_template):
+        if template_source.isfile(volume_template):
             break
     else:
         return {}
 
     try:
-        with open(volume_template) as fh:
-            yml = yaml.load(fh)
+        yml = yaml.load_path(volume_template)
     except yaml.YAMLError as e:
         print(e)  # pylint: disable=superfluous-parens
         return {}
@@ -60,6 +60,7 @@ import webbrowser
 import zipfile
 import platform
 import subprocess  # nosec
+import sys
 
 from multiprocessing import Queue
 from pathlib import Path
@@ -105,6 +106,7 @@ from typing import Optional, TextIO, Callable
 
 from config import Config
 from preload.engine import PLUGIN_MGR
+from service import pytest_args
 
 VERSION = version.VERSION
 PATH = os.path.dirname(os.path.realpath(__file__))
@@ -255,27 +257,16 @@ def run_pytest(
         rmtree(out_path, ignore_errors=True)
     with contextlib.redirect_stderr(log), contextlib.redirect_stdout(log):
         try:
-            args = [
-                "--ignore=app_tests",
-                "--capture=sys",
-                "--template-directory={}".format(template_dir),
-                "--report-format={}".format(report_format),
-                "--template-source={}".format(template_source),
-            ]
-            if preload_config:
-                args.append("--preload-source={}".format(preload_config))
-                args.append(
-                    "--preload-source-type={}".format(
-                        PLUGIN_MGR.get_source_for_name(preload_source).get_identifier()
-                    )
-                )
-            if categories:
-                for category in categories:
-                    args.extend(("--category", category))
-            if not halt_on_failure:
-                args.append("--continue-on-failure")
-            if preload_format:
-                args.append("--preload-format={}".format(preload_format))
+            args = pytest_args(
+                template_dir,
+                categories,
+                report_format,
+                halt_on_failure,
+                template_source,
+                preload_config,
+                preload_format,
+                preload_source,
+            )
             print("args: ", " ".join(args))
             pytest.main(args=args)
             result_queue.put((True, None))
@@ -887,4 +878,12 @@ class ValidatorApp:
 
 if __name__ == "__main__":
     multiprocessing.freeze_support()  # needed for PyInstaller to work
+    if sys.argv[1:2] == ["serve"]:
+        import service
+
+        sys.exit(service.main(sys.argv[2:]))
+    if sys.argv[1:2] == ["batch"]:
+        import batch
+
+        sys.exit(batch.main(sys.argv[2:]))
     ValidatorApp().start()
@@ -37,12 +37,16 @@
 
 """
 This script will refresh the heat_requirements.json file by pulling the
-latest version from Nexus.
+latest version from Nexus, and regenerate its index (see
+ice_validator/tests/requirements_store.py).  Use ``--index-only`` to only
+regenerate the index of the current file.
 """
 import os
+import sys
 from urllib import request
 
 from ice_validator import version
+from ice_validator.tests import requirements_store
 
 REQS_URL = (
     f"https://nexus.onap.org/"
@@ -63,5 +67,7 @@ def write_file(contents, path):
 
 
 if __name__ == "__main__":
-    reqs = get_requirements().read()
-    write_file(reqs, os.path.join(THIS_DIR, "ice_validator/heat_requirements.json"))
+    if "--index-only" not in sys.argv[1:]:
+        reqs = get_requirements().read()
+        write_file(reqs, requirements_store.HEAT_REQUIREMENTS_FILE)
+    requirements_store.write_index()